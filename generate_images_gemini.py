@@ -1,5 +1,5 @@
 import os
-import re
+import sys
 import time
 import argparse
 import requests
@@ -9,6 +9,19 @@ from PIL import Image
 from io import BytesIO
 from tqdm import tqdm
 
+# 共享工具模块位于 scripts/ 目录
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from gen_cache import GenerationCache, cache_key, PLACEHOLDER_SOURCE
+from item_catalog import load_catalog
+from job_ledger import JobLedger, add_ledger_arguments, ledger_mode, DONE, FAILED, SKIPPED, CACHED
+from rate_limiter import get_limiter
+from retry_policy import RetryPolicy
+from safe_io import atomic_output
+from placeholder_renderer import render_batch
+from sharding import add_shard_argument, in_shard
+from job_scheduler import JobScheduler, add_schedule_arguments
+from gen_metrics import metrics, export_run_metrics
+
 # 配置
 # 请设置环境变量 GOOGLE_API_KEY，或在此处直接填入（不推荐）
 API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -20,6 +33,10 @@ API_BASE_URL = os.getenv("API_BASE_URL", DEFAULT_API_BASE).rstrip('/')
 # 目标分辨率
 TARGET_SIZE = (512, 512)
 
+# 图片接口的限速器 (每分钟请求数/并发可用 RATE_LIMIT_GEMINI_IMAGES 覆盖) 与重试策略
+limiter = get_limiter("gemini-images")
+retry = RetryPolicy("gemini-images")
+
 # 主提示词模板 (Master Prompt)
 MASTER_PROMPT_TEMPLATE = (
     "{subject}, children's educational illustration, cute 3D clay style, "
@@ -29,9 +46,11 @@ MASTER_PROMPT_TEMPLATE = (
 )
 
 # 项目路径配置
-INITIALIZER_PATH = "app/src/main/java/com/clouditemapp/data/initializer/DataInitializer.kt"
 OUTPUT_DIR = "app/src/main/res/drawable"
 
+# 缓存清单中记录的来源名
+CACHE_SOURCE = "generate_images_gemini"
+
 def setup_api():
     if not API_KEY:
         print("错误: 未找到 GOOGLE_API_KEY 环境变量。")
@@ -39,31 +58,27 @@ def setup_api():
         return False
     return True
 
-def parse_items(file_path):
-    """从 Kotlin 文件中解析物品列表"""
+def load_items(category=None):
+    """从物品目录 (DataInitializer.kt) 读取物品，附加英文主体描述"""
+    catalog = load_catalog()
+    if category:
+        # 支持分类标识 (animals) 或 App 中的分类名 (动物世界)
+        source = [item for item in catalog.items if category in (item['category_slug'], item['category'])]
+    else:
+        source = catalog.items
     items = []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # 匹配 Triple("中文", "英文", "资源名")
-            # 示例: Triple("猫", "Cat", "cat")
-            pattern = r'Triple\("([^"]+)",\s*"([^"]+)",\s*"([^"]+)"\)'
-            matches = re.findall(pattern, content)
-            
-            for cn, en, res_name in matches:
-                # 简单的英文描述构建
-                subject = f"A cute {en.lower()}"
-                items.append({
-                    "name_cn": cn,
-                    "name_en": en,
-                    "res_name": res_name,
-                    "subject": subject
-                })
-        print(f"成功解析 {len(items)} 个物品。")
-        return items
-    except Exception as e:
-        print(f"解析文件失败: {e}")
-        return []
+    for item in source:
+        # 简单的英文描述构建
+        items.append(dict(item, subject=f"A cute {item['name_en'].lower()}"))
+    print(f"共 {len(items)} 个物品。")
+    return items
+
+def post_json(url, headers, payload):
+    """发送一次 API 请求，HTTP 错误以异常抛出供重试策略判断"""
+    with limiter.slot(), metrics.stage("request"):
+        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response.raise_for_status()
+    return response
 
 def generate_image_openai_compatible(model_name, prompt, output_path):
     """使用 OpenAI 兼容格式 (v1/images/generations) 调用 API"""
@@ -81,8 +96,7 @@ def generate_image_openai_compatible(model_name, prompt, output_path):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
+        response = retry.call(post_json, url, headers, payload)
         result = response.json()
         
         # 解析返回的 Base64 图片
@@ -91,12 +105,15 @@ def generate_image_openai_compatible(model_name, prompt, output_path):
         
         image = Image.open(BytesIO(image_data))
         image = image.resize(TARGET_SIZE, Image.Resampling.LANCZOS)
-        image.save(output_path, "PNG")
+        # 先写临时文件再改名，中断时不会留下残缺的 PNG
+        with atomic_output(output_path) as f:
+            image.save(f, "PNG")
         return True
         
     except Exception as e:
         print(f"OpenAI 兼容模式调用失败: {e}")
-        if 'response' in locals():
+        response = getattr(e, 'response', None)
+        if response is not None:
             print(f"响应内容: {response.text}")
         return False
 
@@ -125,8 +142,7 @@ def generate_image_google_rest(model_name, prompt, output_path):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
+        response = retry.call(post_json, url, headers, payload)
         result = response.json()
         
         # 尝试从 Gemini 响应中提取图片
@@ -145,59 +161,6 @@ def generate_image_google_rest(model_name, prompt, output_path):
         print(f"Google REST 模式调用失败: {e}")
         return False
 
-def generate_text_placeholder(item, output_path):
-    """生成带有文字的占位图"""
-    try:
-        # 创建一个带有渐变背景的图片
-        img = Image.new('RGB', TARGET_SIZE, color=(240, 240, 240))
-        from PIL import ImageDraw, ImageFont
-        
-        draw = ImageDraw.Draw(img)
-        
-        # 尝试加载字体，如果失败则使用默认字体
-        # 在 Manjaro/Linux 系统上常见的字体路径
-        font_paths = [
-            "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Bold.ttc",
-            "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/liberation/LiberationSans-Bold.ttf"
-        ]
-        
-        font_large = None
-        font_small = None
-        for path in font_paths:
-            if os.path.exists(path):
-                try:
-                    font_large = ImageFont.truetype(path, 80)
-                    font_small = ImageFont.truetype(path, 40)
-                    break
-                except:
-                    continue
-        
-        if font_large is None:
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-
-        # 绘制背景装饰
-        draw.rectangle([20, 20, 492, 492], outline=(200, 200, 200), width=5)
-        
-        # 写入中文名称
-        text_cn = item['name_cn']
-        draw.text((256, 200), text_cn, fill=(50, 50, 50), anchor="mm", font=font_large)
-        
-        # 写入英文名称
-        text_en = item['name_en']
-        draw.text((256, 300), text_en, fill=(100, 100, 100), anchor="mm", font=font_small)
-        
-        # 写入资源ID (底部小字)
-        draw.text((256, 450), f"ID: {item['res_name']}", fill=(180, 180, 180), anchor="mm", font=font_small)
-
-        img.save(output_path, "PNG")
-        return True
-    except Exception as e:
-        print(f"生成占位图失败: {e}")
-        return False
-
 def main():
     parser = argparse.ArgumentParser(description="批量生成游戏资源图片")
     parser.add_argument("--model", type=str, default="dall-e-3", help="使用的模型名称 (例如 dall-e-3, gemini-pro-vision, etc)")
@@ -206,15 +169,25 @@ def main():
     parser.add_argument("--use-openai-format", action="store_true", default=True, help="使用 OpenAI 兼容 API 格式 (默认开启，适用于大多数代理)")
     parser.add_argument("--use-google-format", action="store_true", help="使用 Google 原生 REST API 格式")
     parser.add_argument("--placeholder-only", action="store_true", help="仅生成文字占位图，不调用API")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="占位图模式的并行进程数")
+    parser.add_argument("--vector", action="store_true", help="占位图输出为 VectorDrawable XML (几百字节，隐含 --placeholder-only)")
+    add_ledger_arguments(parser)
+    add_shard_argument(parser)
+    add_schedule_arguments(parser)
     
     args = parser.parse_args()
+    if args.vector:
+        args.placeholder_only = True
 
     # 只有在非占位模式下才检查 API
     if not args.placeholder_only:
         if not setup_api():
             return
 
-    items = parse_items(INITIALIZER_PATH)
+    items = load_items(args.category)
+    if args.shard:
+        items = [item for item in items if in_shard(item['res_name'], args.shard)]
+        print(f"分片 {args.shard[0]}/{args.shard[1]}: {len(items)} 个物品")
     if not items:
         return
 
@@ -234,40 +207,101 @@ def main():
     
     print(f"输出目录: {OUTPUT_DIR}")
 
+    cache = GenerationCache()
+    ledger = JobLedger(mode=ledger_mode(args))
+    cached_count = 0
+    source = PLACEHOLDER_SOURCE if args.placeholder_only else CACHE_SOURCE
+    placeholder_style = "vector" if args.vector else "card"
+    if args.placeholder_only:
+        provider, variant = "placeholder", "placeholder"
+    else:
+        provider = f"{'google' if args.use_google_format else 'openai'}:{args.model}"
+        variant = "image"
+
+    # 缺失的、只有占位图的、要发布的分类先处理，--limit 或中断时先拿到最要紧的
+    extension = '.xml' if args.vector else '.png'
+    scheduler = JobScheduler.from_args(args, cache, ledger, provider)
+    items = scheduler.order(items, asset=lambda item: item['res_name'],
+                            output_path=lambda item: os.path.join(OUTPUT_DIR, item['res_name'] + extension))
+    print(f"缺失: {scheduler.counts['missing']}, 占位图: {scheduler.counts['placeholder']}, "
+          f"已有成品: {scheduler.counts['generated']}")
+
+    placeholders = []
     for item in tqdm(items):
         if args.limit > 0 and count >= args.limit:
             break
 
-        file_name = f"{item['res_name']}.png"
+        file_name = f"{item['res_name']}{extension}"
         output_path = os.path.join(OUTPUT_DIR, file_name)
+        job_id = (item['res_name'], variant, provider)
+        if not ledger.should_run(*job_id):
+            continue
 
-        if os.path.exists(output_path):
-            # 在生成占位图时，我们可能想跳过已经存在的真实图片
-            # 这里默认跳过所有已存在的文件
+        full_prompt = MASTER_PROMPT_TEMPLATE.format(subject=item['subject'])
+        if args.placeholder_only:
+            key = cache_key(kind="vector_placeholder" if args.vector else "text_placeholder",
+                            name_cn=item['name_cn'], name_en=item['name_en'],
+                            res_name=item['res_name'], size=TARGET_SIZE)
+        else:
+            key = cache_key(prompt=full_prompt, model=args.model, size=TARGET_SIZE,
+                            api_format="google" if args.use_google_format else "openai")
+
+        # 已是当前输入的结果 (或是其他生成器的成品图) 则跳过；提示词改动过才重新生成
+        state = cache.check(output_path, key, source)
+        if state == cache.CURRENT:
+            ledger.finish(*job_id, SKIPPED)
+            count += 1
+            continue
+        if state == cache.HIT:
+            cache.restore(key, output_path, source)
+            ledger.finish(*job_id, CACHED, size_bytes=os.path.getsize(output_path))
+            cached_count += 1
             count += 1
             continue
 
+        ledger.start(*job_id)
         if args.placeholder_only:
-            success = generate_text_placeholder(item, output_path)
+            # 占位图在循环结束后用进程池一次渲染
+            placeholders.append((item, output_path, key, job_id))
+            count += 1
+            continue
+        started = time.monotonic()
+        success = False
+        if args.use_google_format:
+            success = generate_image_google_rest(args.model, full_prompt, output_path)
         else:
-            full_prompt = MASTER_PROMPT_TEMPLATE.format(subject=item['subject'])
-            
-            success = False
-            if args.use_google_format:
-                success = generate_image_google_rest(args.model, full_prompt, output_path)
-            else:
-                success = generate_image_openai_compatible(args.model, full_prompt, output_path)
+            success = generate_image_openai_compatible(args.model, full_prompt, output_path)
 
+        latency = time.monotonic() - started
         if success:
+            cache.store(key, output_path, source)
+            ledger.finish(*job_id, DONE, latency, os.path.getsize(output_path))
             success_count += 1
-            if not args.placeholder_only:
-                time.sleep(1) 
         else:
+            ledger.finish(*job_id, FAILED, latency, error="generation failed")
             print(f"生成失败: {file_name}")
             
         count += 1
 
-    print(f"完成! 成功生成: {success_count}/{count}")
+    if placeholders:
+        started = time.monotonic()
+        jobs = [(placeholder_style, item, TARGET_SIZE, output_path) for item, output_path, _, _ in placeholders]
+        with metrics.stage("render_placeholders"):
+            results = render_batch(jobs, args.workers)
+        latency = (time.monotonic() - started) / len(placeholders)
+        for (item, output_path, key, job_id), (_, error) in zip(placeholders, results):
+            if error is None:
+                cache.store(key, output_path, source)
+                ledger.finish(*job_id, DONE, latency, os.path.getsize(output_path))
+                success_count += 1
+            else:
+                ledger.finish(*job_id, FAILED, latency, error=error)
+                print(f"生成占位图失败: {os.path.basename(output_path)}: {error}")
+        print(f"渲染 {len(placeholders)} 个占位图用时 {time.monotonic() - started:.1f}s")
+
+    ledger.close()
+    export_run_metrics("generate_images_gemini")
+    print(f"完成! 成功生成: {success_count}/{count}, 缓存命中: {cached_count}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,558 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 资源检查 (取代 check_resources.sh 中逐个 [ -f ] 的循环)。
+
+按物品目录 (item_catalog) 一次性检查所有应有的资源:
+  - 图片: 每个物品的 res_name (res/drawable 或任一 drawable-* 密度目录，png/webp/jpg/xml)
+  - 语音: 每个物品的 _cn、_en、_desc_cn，以及 MANUAL_SOUNDS 中的系统音效 (mp3/ogg/wav)
+每个资源目录只列一次，存在性检查都在内存中的集合里完成。
+
+存在的文件用线程池并行检查文件头 (不需要 Pillow/ffmpeg):
+  PNG   签名、IHDR 尺寸、结尾的 IEND (截断的下载会缺少)
+  WebP  RIFF 长度与文件大小一致、VP8/VP8L/VP8X 尺寸
+  JPEG  SOI/EOI 标记和 SOF 尺寸
+  XML   格式正确
+  MP3   跳过 ID3 后能找到连续两帧帧同步，时长 (Xing/VBRI 帧数或按码率估算) 大于 0
+  Ogg   OggS 页头、Vorbis/Opus 头，最后一页的 granule 位置得到时长
+  WAV   fmt/data 块，时长大于 0
+--deep 时另外用 Pillow 完整解码图片。同名不同扩展名的资源 (aapt 会报错) 也会列出。
+
+检查结果按 (路径, 大小, 修改时间, SHA-256) 记录在 .gen_cache/audit_index.json，
+大小和修改时间都没变的文件直接使用记录；修改时间变了但内容相同 (例如重新检出) 的文件
+只重新计算哈希。其他工具可以用 load_metadata() 读取尺寸、时长、格式等信息:
+    from audit_resources import load_metadata
+    load_metadata()["raw/cat_cn.mp3"]["duration_ms"]
+
+运行 (仓库根目录):
+    python scripts/audit_resources.py
+    python scripts/audit_resources.py --json audit.json --strict   # CI: 有缺失或损坏时返回 1
+    python scripts/audit_resources.py --json -                     # JSON 输出到标准输出
+    python scripts/audit_resources.py --no-cache                   # 忽略记录，全部重新检查
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from gen_cache import REPO_ROOT, STATE_DIR
+from item_catalog import MANUAL_SOUNDS, load_catalog
+
+RES_DIR = REPO_ROOT / "app/src/main/res"
+INDEX_PATH = STATE_DIR / "audit_index.json"
+# 检查规则变化时递增，使旧的记录失效
+INDEX_VERSION = 1
+IMAGE_SUFFIXES = (".png", ".webp", ".jpg", ".jpeg", ".xml")
+AUDIO_SUFFIXES = (".mp3", ".ogg", ".wav")
+# 每个物品的语音片段后缀
+CLIP_SUFFIXES = ("_cn", "_en", "_desc_cn")
+# 检查文件头/文件尾时读取的字节数
+PROBE_BYTES = 64 * 1024
+
+
+class ProbeError(ValueError):
+    """文件内容与格式不符"""
+
+
+# ---------------------------------------------------------------- 图片
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_IEND = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+
+
+def probe_png(head: bytes, tail: bytes, size: int) -> dict:
+    if not head.startswith(PNG_SIGNATURE) or head[12:16] != b"IHDR":
+        raise ProbeError("不是 PNG 文件")
+    width, height = struct.unpack(">II", head[16:24])
+    if not tail.endswith(PNG_IEND):
+        raise ProbeError("缺少 IEND (文件被截断)")
+    return {"width": width, "height": height}
+
+
+def probe_webp(head: bytes, tail: bytes, size: int) -> dict:
+    if head[:4] != b"RIFF" or head[8:12] != b"WEBP":
+        raise ProbeError("不是 WebP 文件")
+    if struct.unpack("<I", head[4:8])[0] + 8 != size:
+        raise ProbeError("RIFF 长度与文件大小不符 (文件被截断)")
+    chunk = head[12:16]
+    if chunk == b"VP8 ":
+        if head[23:26] != b"\x9d\x01\x2a":
+            raise ProbeError("VP8 帧头无效")
+        width, height = struct.unpack("<HH", head[26:30])
+        return {"width": width & 0x3FFF, "height": height & 0x3FFF}
+    if chunk == b"VP8L":
+        if head[20] != 0x2F:
+            raise ProbeError("VP8L 签名无效")
+        bits = struct.unpack("<I", head[21:25])[0]
+        return {"width": (bits & 0x3FFF) + 1, "height": ((bits >> 14) & 0x3FFF) + 1}
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return {"width": width, "height": height}
+    raise ProbeError(f"未知的 WebP 块 {chunk!r}")
+
+
+# 带尺寸的 SOF 标记 (不含 DHT/JPG/DAC)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def probe_jpeg(head: bytes, tail: bytes, size: int) -> dict:
+    if head[:2] != b"\xff\xd8":
+        raise ProbeError("不是 JPEG 文件")
+    if b"\xff\xd9" not in tail[-16:]:
+        raise ProbeError("缺少 EOI (文件被截断)")
+    pos = 2
+    while pos + 9 <= len(head):
+        if head[pos] != 0xFF:
+            raise ProbeError("JPEG 段结构无效")
+        marker = head[pos + 1]
+        length = struct.unpack(">H", head[pos + 2:pos + 4])[0]
+        if marker in _JPEG_SOF:
+            height, width = struct.unpack(">HH", head[pos + 5:pos + 9])
+            return {"width": width, "height": height}
+        pos += 2 + length
+    raise ProbeError("找不到 SOF 段")
+
+
+def probe_xml(path: Path) -> dict:
+    try:
+        root = ET.parse(str(path)).getroot()
+    except ET.ParseError as e:
+        raise ProbeError(f"XML 格式错误: {e}")
+    return {"root": root.tag}
+
+
+# ---------------------------------------------------------------- 音频
+
+_MP3_BITRATES = {
+    # MPEG-1 Layer III
+    3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    # MPEG-2 / 2.5 Layer III
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_frame(header: bytes):
+    """解析 Layer III 帧头，返回 (版本, 码率 kbps, 采样率, 帧长, 声道数)；不是帧头时返回 None"""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES[3 if version == 3 else 2][bitrate_index]
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    samples = 1152 if version == 3 else 576
+    padding = (header[2] >> 1) & 0x01
+    length = samples // 8 * bitrate * 1000 // sample_rate + padding
+    channels = 1 if header[3] >> 6 == 3 else 2
+    return version, bitrate, sample_rate, length, channels
+
+
+def probe_mp3(head: bytes, tail: bytes, size: int) -> dict:
+    offset = 0
+    if head[:3] == b"ID3" and len(head) >= 10:
+        tag_size = ((head[6] & 0x7F) << 21) | ((head[7] & 0x7F) << 14) | ((head[8] & 0x7F) << 7) | (head[9] & 0x7F)
+        offset = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+    # 音频数据在 ID3v1 标签之前结束
+    end = size - (128 if tail[-128:-125] == b"TAG" else 0)
+    # 在 ID3 之后找第一个完整落在文件内的帧；之后还有数据时必须紧跟另一个帧同步
+    # (避免数据中偶然出现的 0xFFE，也能发现在第一帧中间被截断的文件)
+    frame = None
+    while offset + 4 <= len(head):
+        frame = _mp3_frame(head[offset:offset + 4])
+        if frame:
+            following = offset + frame[3]
+            if following <= end and (following + 4 > end or _mp3_frame(head[following:following + 4])):
+                break
+        frame = None
+        offset = head.find(b"\xff", offset + 1)
+        if offset < 0:
+            break
+    if frame is None:
+        raise ProbeError("找不到 MP3 帧同步")
+    version, bitrate, sample_rate, length, channels = frame
+    samples = 1152 if version == 3 else 576
+
+    # Xing/Info (VBR) 或 VBRI 头中的帧数
+    side_info = (32 if channels == 2 else 17) if version == 3 else (17 if channels == 2 else 9)
+    xing = offset + 4 + side_info
+    frames = None
+    if head[xing:xing + 4] in (b"Xing", b"Info") and struct.unpack(">I", head[xing + 4:xing + 8])[0] & 1:
+        frames = struct.unpack(">I", head[xing + 8:xing + 12])[0]
+    elif head[offset + 36:offset + 40] == b"VBRI":
+        frames = struct.unpack(">I", head[offset + 50:offset + 54])[0]
+    if frames is not None:
+        # 头中的帧数按最低码率计算也放不进文件剩余的字节时，文件被截断了
+        min_length = samples // 8 * _MP3_BITRATES[3 if version == 3 else 2][1] * 1000 // sample_rate
+        if frames * min_length > end - offset - length:
+            raise ProbeError(f"VBR 头记录 {frames} 帧，与文件大小不符 (文件被截断)")
+        duration_ms = frames * samples * 1000 // sample_rate
+    else:
+        duration_ms = (end - offset) * 8 // bitrate
+    if duration_ms <= 0:
+        raise ProbeError("时长为 0")
+    return {"sample_rate": sample_rate, "channels": channels, "bitrate_kbps": bitrate,
+            "duration_ms": duration_ms}
+
+
+def probe_ogg(head: bytes, tail: bytes, size: int) -> dict:
+    if head[:4] != b"OggS":
+        raise ProbeError("不是 Ogg 文件")
+    payload = head[27 + head[26]:]
+    if payload[:7] == b"\x01vorbis":
+        codec, sample_rate, pre_skip = "vorbis", struct.unpack("<I", payload[12:16])[0], 0
+        channels = payload[11]
+    elif payload[:8] == b"OpusHead":
+        # Opus 的 granule 位置总是以 48kHz 计
+        codec, sample_rate, pre_skip = "opus", 48000, struct.unpack("<H", payload[10:12])[0]
+        channels = payload[9]
+    else:
+        raise ProbeError("Ogg 中不是 Vorbis/Opus 流")
+    last = tail.rfind(b"OggS")
+    if last < 0 or last + 14 > len(tail):
+        raise ProbeError("找不到最后一页 (文件被截断)")
+    if not tail[last + 5] & 0x04:
+        raise ProbeError("最后一页没有流结束标记 (文件被截断)")
+    granule = struct.unpack("<q", tail[last + 6:last + 14])[0]
+    duration_ms = (granule - pre_skip) * 1000 // sample_rate
+    if duration_ms <= 0:
+        raise ProbeError("时长为 0")
+    return {"codec": codec, "sample_rate": sample_rate, "channels": channels, "duration_ms": duration_ms}
+
+
+def probe_wav(head: bytes, tail: bytes, size: int) -> dict:
+    if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        raise ProbeError("不是 WAV 文件")
+    pos, fmt, data_size = 12, None, None
+    while pos + 8 <= len(head):
+        chunk, length = head[pos:pos + 4], struct.unpack("<I", head[pos + 4:pos + 8])[0]
+        if chunk == b"fmt ":
+            fmt = struct.unpack("<HHII", head[pos + 8:pos + 20])
+        elif chunk == b"data":
+            data_size = min(length, size - pos - 8)
+            break
+        pos += 8 + length + (length & 1)
+    if fmt is None or data_size is None:
+        raise ProbeError("缺少 fmt/data 块")
+    _, channels, sample_rate, byte_rate = fmt
+    duration_ms = data_size * 1000 // byte_rate if byte_rate else 0
+    if duration_ms <= 0:
+        raise ProbeError("时长为 0")
+    return {"sample_rate": sample_rate, "channels": channels, "duration_ms": duration_ms}
+
+
+PROBES = {
+    ".png": probe_png,
+    ".webp": probe_webp,
+    ".jpg": probe_jpeg,
+    ".jpeg": probe_jpeg,
+    ".mp3": probe_mp3,
+    ".ogg": probe_ogg,
+    ".wav": probe_wav,
+}
+
+
+def _read_ends(path: Path, size: int):
+    with path.open("rb") as f:
+        head = f.read(PROBE_BYTES)
+        if size <= PROBE_BYTES:
+            return head, head
+        # 尾部可以与头部重叠: 64-128 KB 的文件最后一页可能落在前 64 KB 中
+        f.seek(max(0, size - PROBE_BYTES))
+        return head, f.read()
+
+
+def probe_file(path: Path, deep: bool = False) -> dict:
+    """检查单个文件，返回 {size, ok, error?, 尺寸或时长等元数据}"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    result = {"format": suffix.lstrip("."), "size": 0, "ok": True}
+    try:
+        size = path.stat().st_size
+        result["size"] = size
+        if size == 0:
+            raise ProbeError("空文件")
+        if suffix == ".xml":
+            result.update(probe_xml(path))
+        elif suffix in PROBES:
+            head, tail = _read_ends(path, size)
+            result.update(PROBES[suffix](head, tail, size))
+        if deep and PIL_AVAILABLE and suffix in (".png", ".webp", ".jpg", ".jpeg"):
+            with Image.open(path) as image:
+                image.load()
+    except (ProbeError, struct.error, IndexError, OSError) as e:
+        result["ok"] = False
+        result["error"] = str(e) or type(e).__name__
+    except Exception as e:
+        # Pillow 解码错误等
+        result["ok"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+# ---------------------------------------------------------------- 增量索引
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AuditIndex:
+    """已检查文件的记录: 相对路径 -> {size, mtime_ns, sha256, deep, probe}，线程安全"""
+
+    def __init__(self, res_dir: Path = RES_DIR, path: Path = INDEX_PATH):
+        self.res_dir = Path(res_dir).resolve()
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._files = self._load()
+        self._dirty = False
+        self.revalidated = 0
+
+    def _load(self):
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != INDEX_VERSION or index.get("res_dir") != str(self.res_dir):
+            return {}
+        return index.get("files", {})
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with self._lock:
+            index = {"version": INDEX_VERSION, "res_dir": str(self.res_dir), "files": self._files}
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        os.replace(str(tmp), str(self.path))
+        self._dirty = False
+
+    def metadata(self, rel: str):
+        """已记录的检查结果 (尺寸、时长、格式等)，没有记录时返回 None"""
+        with self._lock:
+            entry = self._files.get(rel)
+        return entry["probe"] if entry else None
+
+    def all_metadata(self) -> dict:
+        with self._lock:
+            return {rel: entry["probe"] for rel, entry in self._files.items()}
+
+    def validate(self, rel: str, stat, deep: bool = False) -> dict:
+        """返回文件的检查结果；大小和修改时间 (或内容哈希) 未变时使用记录"""
+        size, mtime_ns = stat
+        with self._lock:
+            entry = self._files.get(rel)
+        usable = entry is not None and (entry["deep"] or not deep)
+        if usable and entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+            return entry["probe"]
+
+        path = self.res_dir / rel
+        try:
+            sha256 = file_hash(path) if size else None
+        except OSError:
+            sha256 = None
+        if usable and sha256 is not None and entry["sha256"] == sha256:
+            probe, deep_checked = entry["probe"], entry["deep"]
+        else:
+            probe, deep_checked = probe_file(path, deep), deep and PIL_AVAILABLE
+            with self._lock:
+                self.revalidated += 1
+        with self._lock:
+            self._files[rel] = {"size": size, "mtime_ns": mtime_ns, "sha256": sha256,
+                                "deep": deep_checked, "probe": probe}
+            self._dirty = True
+        return probe
+
+    def prune(self, present):
+        """删除已不存在的文件的记录"""
+        with self._lock:
+            for rel in set(self._files) - set(present):
+                del self._files[rel]
+                self._dirty = True
+
+
+def load_metadata(res_dir: Path = RES_DIR, refresh: bool = True) -> dict:
+    """相对路径 (如 "raw/cat_cn.mp3") -> 检查结果；refresh 时先增量更新记录"""
+    index = AuditIndex(res_dir)
+    if refresh:
+        _, _, stats = list_resources(Path(res_dir))
+        for rel, stat in stats.items():
+            index.validate(rel, stat)
+        index.prune(stats)
+        index.save()
+    return index.all_metadata()
+
+
+# ---------------------------------------------------------------- 检查
+
+def list_resources(res_dir: Path):
+    """一次列出 drawable*/ 和 raw/：返回 ({资源名: [相对路径...]} 图片, 同样结构的音频,
+    {相对路径: (大小, 修改时间)})"""
+    images, audio, stats = {}, {}, {}
+    if not res_dir.is_dir():
+        return images, audio, stats
+    for directory in os.scandir(str(res_dir)):
+        if not directory.is_dir():
+            continue
+        if directory.name == "drawable" or directory.name.startswith("drawable-"):
+            target, suffixes = images, IMAGE_SUFFIXES
+        elif directory.name == "raw":
+            target, suffixes = audio, AUDIO_SUFFIXES
+        else:
+            continue
+        for entry in os.scandir(directory.path):
+            name, suffix = os.path.splitext(entry.name)
+            if suffix.lower() in suffixes and not entry.name.startswith("."):
+                if name.endswith(".9"):
+                    name = name[:-2]
+                rel = f"{directory.name}/{entry.name}"
+                target.setdefault(name, []).append(rel)
+                stat = entry.stat()
+                stats[rel] = (stat.st_size, stat.st_mtime_ns)
+    return images, audio, stats
+
+
+def expected_resources(catalog):
+    """应有的 (图片资源名集合, 音频资源名集合)"""
+    images, audio = set(), set()
+    for item in catalog:
+        images.add(item["res_name"])
+        audio.update(item["res_name"] + suffix for suffix in CLIP_SUFFIXES)
+    audio.update(Path(sound["file"]).stem for sound in MANUAL_SOUNDS)
+    return images, audio
+
+
+def find_duplicates(*listings):
+    """同一目录中同名不同扩展名的资源 (aapt 报 Duplicate resources)"""
+    duplicates = []
+    for listing in listings:
+        for name, files in listing.items():
+            by_dir = {}
+            for rel in files:
+                by_dir.setdefault(rel.split("/", 1)[0], []).append(rel)
+            duplicates.extend({"name": name, "files": sorted(group)}
+                              for group in by_dir.values() if len(group) > 1)
+    return sorted(duplicates, key=lambda d: d["files"][0])
+
+
+def audit(res_dir: Path = RES_DIR, catalog=None, deep: bool = False, workers=None,
+          use_index: bool = True) -> dict:
+    started = time.perf_counter()
+    catalog = catalog or load_catalog()
+    images, audio, stats = list_resources(res_dir)
+    expected_images, expected_audio = expected_resources(catalog)
+
+    # 只有新文件和变化过的文件需要重新检查
+    index = AuditIndex(res_dir)
+    if not use_index:
+        index.prune(())
+    files = sorted(stats)
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as executor:
+        probes = dict(zip(files, executor.map(lambda rel: index.validate(rel, stats[rel], deep), files)))
+    index.prune(stats)
+    index.save()
+
+    corrupt = [{"file": rel, "error": probe["error"]} for rel, probe in probes.items() if not probe["ok"]]
+    report = {
+        "missing": {
+            "images": sorted(expected_images - images.keys()),
+            "audio": sorted(expected_audio - audio.keys()),
+        },
+        "corrupt": corrupt,
+        "duplicates": find_duplicates(images, audio),
+        "unreferenced": {
+            "images": sorted(images.keys() - expected_images),
+            "audio": sorted(audio.keys() - expected_audio),
+        },
+        "files": probes,
+    }
+    report["summary"] = {
+        "expected_images": len(expected_images),
+        "expected_audio": len(expected_audio),
+        "files": len(files),
+        "missing_images": len(report["missing"]["images"]),
+        "missing_audio": len(report["missing"]["audio"]),
+        "corrupt": len(corrupt),
+        "duplicates": len(report["duplicates"]),
+        "revalidated": index.revalidated,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    return report
+
+
+def print_report(report):
+    for name in report["missing"]["images"]:
+        print(f"[缺失图片] {name}")
+    for name in report["missing"]["audio"]:
+        print(f"[缺失音频] {name}")
+    for entry in report["corrupt"]:
+        print(f"[文件损坏] {entry['file']}: {entry['error']}")
+    for entry in report["duplicates"]:
+        print(f"[资源重名] {', '.join(entry['files'])}")
+    summary = report["summary"]
+    print("--------------------------------")
+    print(f"检查完成! 共 {summary['files']} 个文件 (重新检查 {summary['revalidated']} 个)，"
+          f"用时 {summary['elapsed_ms']:.0f} ms")
+    print(f"缺失图片: {summary['missing_images']}/{summary['expected_images']}")
+    print(f"缺失音频: {summary['missing_audio']}/{summary['expected_audio']}")
+    print(f"损坏文件: {summary['corrupt']}")
+    print(f"资源重名: {summary['duplicates']}")
+    print(f"未被物品引用: 图片 {len(report['unreferenced']['images'])}, 音频 {len(report['unreferenced']['audio'])}")
+    print("--------------------------------")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查物品图片和语音资源是否齐全、文件是否完整")
+    parser.add_argument("--res-dir", type=Path, default=RES_DIR, help="res 目录")
+    parser.add_argument("--json", metavar="PATH", help="把完整结果写入 JSON 文件 (- 表示标准输出)")
+    parser.add_argument("--deep", action="store_true", help="另外用 Pillow 完整解码图片 (较慢)")
+    parser.add_argument("--workers", type=int, help="并行线程数")
+    parser.add_argument("--no-cache", action="store_true", help="忽略记录，全部重新检查")
+    parser.add_argument("--strict", action="store_true", help="有缺失资源时也返回非零退出码")
+    args = parser.parse_args()
+
+    if args.deep and not PIL_AVAILABLE:
+        print("警告: 未安装 Pillow，--deep 只检查文件头", file=sys.stderr)
+
+    report = audit(args.res_dir, deep=args.deep, workers=args.workers, use_index=not args.no_cache)
+    if args.json == "-":
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=1)
+        print()
+    else:
+        print_report(report)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=1)
+
+    summary = report["summary"]
+    failed = summary["corrupt"] or summary["duplicates"]
+    if args.strict:
+        failed = failed or summary["missing_images"] or summary["missing_audio"]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 生成脚本的离线压测。
+
+在进程内启动 fake_provider.py 的模拟服务，把每个生成脚本在临时工作副本中
+(只含 scripts/、根目录的生成脚本、物品目录和系统音效，不会改动仓库里的资源)
+指向它运行，按 --concurrency 中的每个并发数各跑一次，汇总:
+  吞吐      完成的任务数 / 墙钟时间
+  尾延迟    单个任务耗时的 p50 / p95 / p99 (读自生成脚本写出的 gen_metrics 摘要)
+  峰值内存  生成脚本进程的最大 RSS (os.wait4，仅 Unix)
+  重试、失败任务数，以及模拟服务端各结果的计数
+
+场景 (缺少依赖的场景自动跳过):
+  pollinations   scripts/generate_images_free.py (--engine async / threads，并发即 -w)
+  openai-images  scripts/generate_images.py (openai 客户端，顺序执行，只跑一次)
+  gemini         generate_images_gemini.py (OpenAI 兼容格式，顺序执行，只跑一次)
+  openai-tts     generate_audio_tts.py --engine openai (并发即 --concurrency)
+gTTS 和 Edge-TTS 无法指向本地服务，不在压测范围内；系统音效从仓库复制，视为已是最新。
+
+结果可保存为 JSON，再用 --baseline 与之前的结果比较: 吞吐下降或 p95 上升超过
+--tolerance 时列为回归并以退出码 1 结束，便于放进提交前检查。
+
+运行:
+    python scripts/benchmark_generators.py
+    python scripts/benchmark_generators.py --scenario pollinations --concurrency 4,16,64 \\
+        --latency lognormal:2000,0.6 --rate-429 0.05 --json bench.json
+    python scripts/benchmark_generators.py --baseline bench.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fake_provider import ProviderServer, add_provider_arguments, state_from_args
+from gen_cache import REPO_ROOT
+from item_catalog import INITIALIZER_PATH, MANUAL_SOUNDS
+
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+RAW_DIR = REPO_ROOT / "app/src/main/res/raw"
+ROOT_SCRIPTS = ("generate_images_gemini.py", "generate_audio_tts.py")
+DEFAULT_CONCURRENCY = "1,4,16"
+DEFAULT_TIMEOUT = 600
+
+
+class Scenario:
+    """一个生成脚本的压测方式"""
+
+    def __init__(self, name, script, requires, provider, args, cwd="", concurrent=True):
+        self.name = name
+        self.script = script
+        self.requires = requires
+        # rate_limiter 中的提供方名，压测时放开其速率限制
+        self.provider = provider
+        # args(concurrency, options) -> 命令行参数
+        self.args = args
+        # 相对工作副本根目录的运行目录 (脚本中的输出路径相对于它)
+        self.cwd = cwd
+        self.concurrent = concurrent
+
+    def missing(self):
+        return [module for module in self.requires if importlib.util.find_spec(module) is None]
+
+
+SCENARIOS = {
+    "pollinations": Scenario(
+        "pollinations", "scripts/generate_images_free.py", (), "pollinations",
+        lambda n, opts: ["-c", opts.category, "-w", str(n), "--engine", opts.engine],
+        cwd="scripts",
+    ),
+    "openai-images": Scenario(
+        "openai-images", "scripts/generate_images.py", ("openai", "requests"), "openai-images",
+        lambda n, opts: ["--category", opts.category], concurrent=False,
+    ),
+    "gemini": Scenario(
+        "gemini", "generate_images_gemini.py", ("requests", "PIL", "tqdm"), "gemini-images",
+        lambda n, opts: ["--category", opts.category], concurrent=False,
+    ),
+    "openai-tts": Scenario(
+        "openai-tts", "generate_audio_tts.py", ("aiohttp", "edge_tts", "tqdm"), "openai-tts",
+        lambda n, opts: ["--engine", "openai", "--limit", str(opts.tts_items), "--concurrency", str(n)],
+    ),
+}
+
+
+def make_workspace(parent: Path) -> Path:
+    """只包含生成脚本运行所需文件的临时工作副本"""
+    root = Path(tempfile.mkdtemp(prefix="bench_", dir=str(parent)))
+    shutil.copytree(str(SCRIPTS_DIR), str(root / "scripts"),
+                    ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+    for name in ROOT_SCRIPTS:
+        shutil.copy2(str(REPO_ROOT / name), str(root / name))
+    initializer = root / INITIALIZER_PATH.relative_to(REPO_ROOT)
+    initializer.parent.mkdir(parents=True)
+    shutil.copy2(str(INITIALIZER_PATH), str(initializer))
+    # 系统音效总是用 Edge-TTS 生成，预先放好让 TTS 场景跳过它们
+    raw = root / "app/src/main/res/raw"
+    raw.mkdir(parents=True)
+    for sound in MANUAL_SOUNDS:
+        source = RAW_DIR / sound["file"]
+        if source.exists():
+            shutil.copy2(str(source), str(raw / sound["file"]))
+    (root / "app/src/main/res/drawable").mkdir(parents=True)
+    return root
+
+
+def bench_env(workspace: Path, base_url: str, provider: str, concurrency: int) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "POLLINATIONS_BASE_URL": base_url,
+        "API_BASE_URL": base_url,
+        "OPENAI_BASE_URL": f"{base_url}/v1",
+        "OPENAI_API_KEY": "benchmark",
+        "GOOGLE_API_KEY": "benchmark",
+        "CLOUDITEM_STATE_DIR": str(workspace / ".gen_cache"),
+        "CLOUDITEM_METRICS_DIR": str(workspace / "metrics"),
+        "CLOUDITEM_SHARED_QUOTA": "0",
+        # 只让并发数成为瓶颈，速率限制放开
+        "RATE_LIMIT_" + provider.upper().replace("-", "_"): f"1000000,{concurrency}",
+        "PYTHONUNBUFFERED": "1",
+    })
+    return env
+
+
+def wait_with_rusage(proc, timeout: float):
+    """等待子进程结束，返回 (退出码, 峰值 RSS 字节数或 None)"""
+    if not hasattr(os, "wait4"):
+        return proc.wait(timeout=timeout), None
+    deadline = time.monotonic() + timeout
+    while True:
+        pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+        if pid:
+            proc.returncode = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") \
+                else (status >> 8)
+            # Linux 以 KB 为单位，macOS 以字节为单位
+            rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+            return proc.returncode, rss
+        if time.monotonic() > deadline:
+            proc.kill()
+            raise subprocess.TimeoutExpired(proc.args, timeout)
+        time.sleep(0.05)
+
+
+def read_metrics(workspace: Path, script: str):
+    path = workspace / "metrics" / f"{Path(script).stem}.json"
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def summarize(metrics: dict) -> dict:
+    """从 gen_metrics 摘要中取出压测关心的数字"""
+    result = {"done": 0, "failed": 0, "retries": 0, "bytes": 0}
+    if not metrics:
+        return result
+    counters = metrics["counters"]
+    for entry in counters.get("jobs_total", []):
+        if entry["status"] == "done":
+            result["done"] += entry["value"]
+        elif entry["status"] == "failed":
+            result["failed"] += entry["value"]
+    result["retries"] = sum(entry["value"] for entry in counters.get("retries_total", []))
+    result["bytes"] = sum(entry["value"] for entry in counters.get("bytes_total", []))
+    for entry in metrics["histograms"].get("job_seconds", []):
+        if entry["status"] == "done" and entry["count"]:
+            for key in ("p50", "p95", "p99", "max"):
+                result[key] = entry[key]
+    return result
+
+
+def run_case(scenario: Scenario, concurrency: int, options, server: ProviderServer, parent: Path) -> dict:
+    workspace = make_workspace(parent)
+    command = [sys.executable, str(workspace / scenario.script)] + scenario.args(concurrency, options)
+    log_path = workspace / "output.log"
+    result = {"scenario": scenario.name, "concurrency": concurrency}
+    stats_before = json.loads(json.dumps(server.state.stats))
+    try:
+        with log_path.open("wb") as log:
+            started = time.monotonic()
+            proc = subprocess.Popen(command, cwd=str(workspace / scenario.cwd), stdout=log,
+                                    stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                    env=bench_env(workspace, server.base_url, scenario.provider, concurrency))
+            result["exit_code"], result["peak_rss"] = wait_with_rusage(proc, options.timeout)
+            result["wall_s"] = round(time.monotonic() - started, 3)
+        result.update(summarize(read_metrics(workspace, scenario.script)))
+        result["jobs_per_s"] = round(result["done"] / result["wall_s"], 3) if result["wall_s"] else 0.0
+        result["server"] = _stats_delta(stats_before, server.state.stats)
+        if result["exit_code"] != 0 or not result["done"]:
+            result["log_tail"] = log_path.read_text(encoding="utf-8", errors="replace")[-800:]
+    except subprocess.TimeoutExpired:
+        result["error"] = f"超时 ({options.timeout}s)"
+    finally:
+        if options.keep:
+            result["workspace"] = str(workspace)
+        else:
+            shutil.rmtree(str(workspace), ignore_errors=True)
+    return result
+
+
+def _stats_delta(before: dict, after: dict) -> dict:
+    delta = {}
+    for endpoint, counts in after.items():
+        for outcome, value in counts.items():
+            diff = value - before.get(endpoint, {}).get(outcome, 0)
+            if diff:
+                delta[f"{endpoint}:{outcome}"] = diff
+    return delta
+
+
+def _fmt(value, spec=".2f"):
+    return "-" if value is None else format(value, spec)
+
+
+def print_table(results):
+    print(f"\n{'场景':<14}{'并发':>5}{'完成':>6}{'失败':>6}{'重试':>6}{'任务/秒':>9}"
+          f"{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'峰值内存':>10}{'用时 s':>8}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['scenario']:<14}{r['concurrency']:>5}  {r['error']}")
+            continue
+        rss = f"{r['peak_rss'] / 1048576:.0f} MB" if r.get("peak_rss") else "-"
+        print(f"{r['scenario']:<14}{r['concurrency']:>5}{r['done']:>6}{r['failed']:>6}{r['retries']:>6}"
+              f"{_fmt(r['jobs_per_s']):>9}{_fmt(r.get('p50')):>8}{_fmt(r.get('p95')):>8}"
+              f"{_fmt(r.get('p99')):>8}{rss:>10}{_fmt(r['wall_s'], '.1f'):>8}")
+        if r.get("log_tail"):
+            print(f"    退出码 {r['exit_code']}，输出末尾:\n    " + r["log_tail"].strip().replace("\n", "\n    "))
+
+
+def find_regressions(results, baseline, tolerance: float):
+    """与基线相同 (场景, 并发) 的结果比较，返回回归描述列表"""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = previous.get((r["scenario"], r["concurrency"]))
+        if old is None or "error" in r or "error" in old:
+            continue
+        name = f"{r['scenario']} x{r['concurrency']}"
+        if old.get("jobs_per_s") and r["jobs_per_s"] < old["jobs_per_s"] * (1 - tolerance):
+            regressions.append(f"{name}: 吞吐 {old['jobs_per_s']:.2f} -> {r['jobs_per_s']:.2f} 任务/秒")
+        if old.get("p95") and r.get("p95") and r["p95"] > old["p95"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {old['p95']:.2f}s -> {r['p95']:.2f}s")
+        if old.get("peak_rss") and r.get("peak_rss") and r["peak_rss"] > old["peak_rss"] * (1 + tolerance):
+            regressions.append(f"{name}: 峰值内存 {old['peak_rss'] / 1048576:.0f} -> {r['peak_rss'] / 1048576:.0f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="用本地模拟服务压测各生成脚本")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="只运行指定场景 (可重复，默认全部)")
+    parser.add_argument("--concurrency", default=DEFAULT_CONCURRENCY,
+                        help=f"逗号分隔的并发数 (默认 {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--category", default="fruits", help="图片场景使用的分类 (默认 fruits)")
+    parser.add_argument("--engine", choices=["async", "threads"], default="async",
+                        help="pollinations 场景的引擎 (默认 async)")
+    parser.add_argument("--tts-items", type=int, default=20, help="TTS 场景的物品数 (每个 3 段，默认 20)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="单次运行的超时秒数")
+    parser.add_argument("--json", type=Path, help="把结果写入 JSON 文件")
+    parser.add_argument("--baseline", type=Path, help="与之前保存的 JSON 结果比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="判定回归的相对变化 (默认 0.2)")
+    parser.add_argument("--keep", action="store_true", help="保留临时工作副本 (排查问题用)")
+    add_provider_arguments(parser)
+    args = parser.parse_args()
+
+    levels = sorted({int(n) for n in args.concurrency.split(",") if n.strip()})
+    if args.engine == "async" and importlib.util.find_spec("aiohttp") is None:
+        print("aiohttp 未安装，pollinations 场景改用 threads 引擎")
+        args.engine = "threads"
+    server = ProviderServer(state_from_args(args)).start()
+    print(f"模拟服务: {server.base_url}")
+
+    results = []
+    parent = Path(tempfile.mkdtemp(prefix="clouditem_bench_"))
+    try:
+        for name in args.scenario or sorted(SCENARIOS):
+            scenario = SCENARIOS[name]
+            missing = scenario.missing()
+            if missing:
+                print(f"跳过 {name}: 缺少 {', '.join(missing)}")
+                continue
+            for concurrency in (levels if scenario.concurrent else [1]):
+                print(f"运行 {name} (并发 {concurrency})...")
+                results.append(run_case(scenario, concurrency, args, server, parent))
+    finally:
+        server.shutdown()
+        server.server_close()
+        if not args.keep:
+            shutil.rmtree(str(parent), ignore_errors=True)
+
+    print_table(results)
+    report = {
+        "created_at": time.time(),
+        "python": sys.version.split()[0],
+        "server": {name: getattr(args, name) for name in
+                   ("latency", "image_kb", "audio_kb", "rate_429", "error_rate", "drop_rate", "retry_after")},
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=1), encoding="utf-8")
+        print(f"\n结果已保存: {args.json}")
+
+    if args.baseline:
+        with args.baseline.open("r", encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n发现回归 (超过 {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n与基线相比没有回归")
+
+
+if __name__ == "__main__":
+    main()
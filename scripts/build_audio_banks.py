@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 把 res/raw 中的语音片段按分类拼接成音频库 (audio sprite) 并生成偏移索引。
+
+res/raw 中每个物品有 _cn、_en、_desc_cn 三个片段，另有系统音效，共约 660 个小文件，
+App 每次点击都用 MediaPlayer.create 打开一个。本脚本用 ffmpeg 把每个片段解码为统一格式的
+PCM，按分类首尾相接 (片段之间留 --gap 毫秒静音)，每个分类只编码一次，写入
+app/src/main/assets/audio_banks/:
+  <分类>.ogg     音频库 (系统音效在 system.ogg)
+  index.json     {"version", "banks": {分类: 文件名},
+                  "clips": {资源名: [分类, 起始毫秒, 时长毫秒]}}
+App 可以为每个音频库保持一个解码器，按索引 seek 播放，不必每次新建播放器。
+
+偏移按 PCM 采样数计算，是精确值。片段内容的哈希记录在 .gen_cache/audio_banks.json，
+只有成员片段或参数变化的音频库才会重新构建。
+
+运行 (仓库根目录，需要 ffmpeg；建议先运行 postprocess_audio.py):
+    python scripts/build_audio_banks.py
+    python scripts/build_audio_banks.py --gap 200 --bitrate 32k --bank fruits
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from gen_cache import REPO_ROOT, STATE_DIR
+from item_catalog import DEFAULT_RES, MANUAL_SOUNDS, load_catalog
+from postprocess_audio import RAW_DIR, CODECS, DEFAULT_BITRATE, SAMPLE_RATE
+from safe_io import atomic_output, write_atomic
+
+BANKS_DIR = REPO_ROOT / "app/src/main/assets/audio_banks"
+INDEX_NAME = "index.json"
+STATE_PATH = STATE_DIR / "audio_banks.json"
+INDEX_VERSION = 1
+
+SYSTEM_BANK = "system"
+# 每个物品的语音片段后缀
+CLIP_SUFFIXES = ("_cn", "_en", "_desc_cn")
+# 同名片段按此顺序选用 (后处理过的 .ogg 优先)
+AUDIO_SUFFIXES = (".ogg", ".mp3", ".wav")
+DEFAULT_GAP_MS = 150
+# 16 位单声道 PCM
+BYTES_PER_SAMPLE = 2
+
+
+def find_clip(name: str):
+    for suffix in AUDIO_SUFFIXES:
+        path = RAW_DIR / f"{name}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def bank_members(catalog):
+    """音频库 -> {资源名: 片段路径}；每个片段只放进第一个引用它的音频库"""
+    banks, seen = {}, set()
+
+    def add(bank, name):
+        path = find_clip(name)
+        if path is not None and name not in seen:
+            seen.add(name)
+            banks.setdefault(bank, {})[name] = path
+
+    for slug, items in catalog.by_category.items():
+        for item in items:
+            if item["res_name"] == DEFAULT_RES:
+                continue
+            for suffix in CLIP_SUFFIXES:
+                add(slug, item["res_name"] + suffix)
+    for sound in MANUAL_SOUNDS:
+        add(SYSTEM_BANK, Path(sound["file"]).stem)
+    return banks
+
+
+def file_hash(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def decode_pcm(path: str) -> bytes:
+    """解码为 SAMPLE_RATE 单声道 16 位 PCM"""
+    proc = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-nostats", "-loglevel", "error", "-i", path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+        capture_output=True, check=True,
+    )
+    return proc.stdout
+
+
+def _ms(samples: int) -> int:
+    return round(samples * 1000 / SAMPLE_RATE)
+
+
+def build_bank(bank: str, members: dict, gap_ms: int, codec: str, bitrate: str) -> dict:
+    """在工作进程中构建一个音频库，返回 {bank, file, clips: {资源名: [起始毫秒, 时长毫秒]}}"""
+    result = {"bank": bank, "file": f"{bank}.ogg", "clips": {}, "status": "built"}
+    try:
+        gap = b"\0" * (round(SAMPLE_RATE * gap_ms / 1000) * BYTES_PER_SAMPLE)
+        chunks, position = [], 0
+        for name in sorted(members):
+            pcm = decode_pcm(members[name])
+            samples = len(pcm) // BYTES_PER_SAMPLE
+            result["clips"][name] = [_ms(position), _ms(samples)]
+            chunks.append(pcm[:samples * BYTES_PER_SAMPLE])
+            chunks.append(gap)
+            position += samples + len(gap) // BYTES_PER_SAMPLE
+
+        target = BANKS_DIR / result["file"]
+        with atomic_output(target) as f:
+            subprocess.run(
+                ["ffmpeg", "-hide_banner", "-nostats", "-loglevel", "error",
+                 "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-i", "-",
+                 "-c:a", CODECS[codec], "-b:a", bitrate, "-map_metadata", "-1", "-f", "ogg", "-"],
+                input=b"".join(chunks), stdout=f, stderr=subprocess.PIPE, check=True,
+            )
+        result["size"] = target.stat().st_size
+    except subprocess.CalledProcessError as e:
+        result["status"] = "failed"
+        result["error"] = (e.stderr or b"").decode("utf-8", "replace").strip()[-300:]
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    return result
+
+
+def load_state():
+    try:
+        with STATE_PATH.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(str(tmp), str(STATE_PATH))
+
+
+def write_index(state):
+    index = {"version": INDEX_VERSION, "banks": {}, "clips": {}}
+    for bank in sorted(state):
+        built = state[bank]
+        index["banks"][bank] = built["file"]
+        for name, (start, duration) in built["clips"].items():
+            index["clips"][name] = [bank, start, duration]
+    data = json.dumps(index, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    write_atomic(BANKS_DIR / INDEX_NAME, data.encode("utf-8"))
+    return index
+
+
+def remove_stale_banks(state):
+    if not BANKS_DIR.is_dir():
+        return
+    referenced = {built["file"] for built in state.values()}
+    for path in BANKS_DIR.glob("*.ogg"):
+        if path.name not in referenced:
+            path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按分类把 res/raw 语音拼接成音频库并生成偏移索引")
+    parser.add_argument("--bank", action="append", help=f"只构建指定音频库 (分类标识或 {SYSTEM_BANK}，可重复)")
+    parser.add_argument("--gap", type=int, default=DEFAULT_GAP_MS, help=f"片段间静音毫秒数 (默认 {DEFAULT_GAP_MS})")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="vorbis",
+                        help="vorbis (默认，所有版本) 或 opus (需要 Android 10+)")
+    parser.add_argument("--bitrate", default=DEFAULT_BITRATE, help=f"码率 (默认 {DEFAULT_BITRATE})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="并行进程数")
+    parser.add_argument("--force", action="store_true", help="忽略记录，全部重新构建")
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        print("错误: 需要 ffmpeg，请先安装并加入 PATH")
+        sys.exit(1)
+
+    params = {"gap_ms": args.gap, "codec": args.codec, "bitrate": args.bitrate, "sample_rate": SAMPLE_RATE}
+    state = {} if args.force else load_state()
+    banks = bank_members(load_catalog())
+    # 已经没有成员的音频库从索引中移除
+    state = {bank: built for bank, built in state.items() if bank in banks}
+
+    pending = {}
+    for bank, members in banks.items():
+        if args.bank and bank not in args.bank:
+            continue
+        signature = {"members": {name: file_hash(path) for name, path in members.items()}, "params": params}
+        built = state.get(bank)
+        if built is None or built.get("signature") != signature or not (BANKS_DIR / built["file"]).exists():
+            pending[bank] = (members, signature)
+    print(f"音频库 {len(banks)} 个，需要构建 {len(pending)} 个")
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(build_bank, bank, {n: str(p) for n, p in members.items()},
+                            args.gap, args.codec, args.bitrate)
+            for bank, (members, _) in pending.items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            bank = result["bank"]
+            if result["status"] == "failed":
+                failed.append(f"{bank}: {result['error']}")
+                continue
+            state[bank] = {"file": result["file"], "clips": result["clips"], "signature": pending[bank][1]}
+            print(f"  {bank}: {len(result['clips'])} 个片段, {result['size'] / 1024:.0f} KB")
+    save_state(state)
+
+    index = write_index(state)
+    remove_stale_banks(state)
+    print(f"完成! 音频库: {len(index['banks'])}, 片段: {len(index['clips'])}, 失败: {len(failed)}")
+    print(f"索引: {BANKS_DIR / INDEX_NAME}")
+    for line in failed:
+        print(f"  - {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 从母版图片导出各屏幕密度版本 (drawable-mdpi ... drawable-xxxhdpi)。
+
+所有图片原本只放在 res/drawable (按 mdpi 处理)，每台设备都要解码 1024px 的位图。
+本脚本以 --base-dp 为显示尺寸，按密度倍率 (1x/1.5x/2x/3x/4x) 用进程池并行导出 WebP，
+设备只加载与自身屏幕匹配的那一份。
+
+母版来源: res/drawable 中的位图 (刚生成的新图优先)，其次是 art_masters/ 中归档的原图。
+导出后 res/drawable 中的母版移到 art_masters/，避免在默认目录中再打包一份大图。
+母版和导出参数都没变的资源直接跳过 (记录在 .gen_cache/densities.json)。
+
+运行 (仓库根目录):
+    python scripts/export_densities.py                    # 基准 256dp (xxxhdpi 为 1024px)
+    python scripts/export_densities.py --base-dp 200 --lossless
+    python scripts/export_densities.py --force            # 忽略记录全部重新导出
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from gen_cache import STATE_DIR, DENSITY_QUALIFIERS
+from postprocess_images import (
+    DRAWABLE_DIR, MASTERS_DIR, DEFAULT_QUALITY, PIL_AVAILABLE,
+    open_image, webp_options, prefer_master, retire_master,
+)
+from safe_io import atomic_output
+
+if PIL_AVAILABLE:
+    from PIL import Image
+
+RES_DIR = DRAWABLE_DIR.parent
+STATE_PATH = STATE_DIR / "densities.json"
+
+# 各密度相对 mdpi 的倍率；密度列表与 gen_cache 共用，已安装判断和导出不会不一致
+DENSITY_SCALES = dict(zip(DENSITY_QUALIFIERS, (1.0, 1.5, 2.0, 3.0, 4.0)))
+# App 中最大的物品图约 250dp
+DEFAULT_BASE_DP = 256
+MASTER_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def _bitmaps(directory: Path):
+    if not directory.is_dir():
+        return {}
+    return {
+        path.stem: path for path in directory.iterdir()
+        if path.suffix.lower() in MASTER_SUFFIXES and not path.name.endswith(".9.png")
+    }
+
+
+def find_masters():
+    """资源名 -> (母版, res/drawable 中被取代的文件或 None)
+
+    res/drawable 中的图至少与归档一样大时 (重新生成的新图) 作为母版；
+    比归档小时 (postprocess_images.py 缩小过的) 使用 art_masters/ 中的原图。
+    """
+    archived = _bitmaps(MASTERS_DIR)
+    masters = {}
+    for name, path in _bitmaps(DRAWABLE_DIR).items():
+        original = archived.pop(name, None)
+        if original is not None and prefer_master(path, original):
+            masters[name] = (original, path)
+        else:
+            masters[name] = (path, None)
+    for name, path in archived.items():
+        masters[name] = (path, None)
+    return masters
+
+
+def output_path(name: str, qualifier: str) -> Path:
+    return RES_DIR / f"drawable-{qualifier}" / f"{name}.webp"
+
+
+def master_signature(path: Path, params: dict) -> dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "params": params}
+
+
+def export_master(name: str, master: str, base_dp: int, lossless: bool, quality: int) -> dict:
+    """在工作进程中导出一个母版的全部密度版本"""
+    result = {"name": name, "outputs": {}, "status": "exported"}
+    try:
+        image = open_image(Path(master))
+        options = webp_options(lossless, quality)
+        # 每一档都从母版直接缩放，不在缩小过的图上再缩放
+        for qualifier, scale in DENSITY_SCALES.items():
+            side = min(round(base_dp * scale), max(image.size))
+            variant = image.copy()
+            variant.thumbnail((side, side), Image.Resampling.LANCZOS)
+            target = output_path(name, qualifier)
+            with atomic_output(target) as f:
+                variant.save(f, "WEBP", **options)
+            result["outputs"][qualifier] = target.stat().st_size
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    return result
+
+
+def load_state():
+    try:
+        with STATE_PATH.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(str(tmp), str(STATE_PATH))
+
+
+def is_up_to_date(name: str, master: Path, params: dict, state: dict) -> bool:
+    if state.get(name) != master_signature(master, params):
+        return False
+    return all(output_path(name, q).exists() for q in DENSITY_SCALES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从母版图片导出 drawable-mdpi ... drawable-xxxhdpi")
+    parser.add_argument("--base-dp", type=int, default=DEFAULT_BASE_DP,
+                        help=f"图片显示尺寸 (dp，默认 {DEFAULT_BASE_DP})")
+    parser.add_argument("--lossless", action="store_true", help="无损 WebP")
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY, help=f"有损 WebP 质量 (默认 {DEFAULT_QUALITY})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="并行进程数")
+    parser.add_argument("--keep-default", action="store_true",
+                        help="导出后仍把母版留在 res/drawable (不推荐，会多打包一份大图)")
+    parser.add_argument("--force", action="store_true", help="忽略记录，全部重新导出")
+    args = parser.parse_args()
+
+    if not PIL_AVAILABLE:
+        print("错误: 需要 Pillow，请运行: pip install Pillow")
+        sys.exit(1)
+
+    params = {"base_dp": args.base_dp, "lossless": args.lossless,
+              "quality": None if args.lossless else args.quality}
+    state = {} if args.force else load_state()
+    masters = find_masters()
+    pending = {name: paths for name, paths in masters.items()
+               if (paths[1] is not None and not args.keep_default)
+               or not is_up_to_date(name, paths[0], params, state)}
+    print(f"母版 {len(masters)} 个，需要导出 {len(pending)} 个 (基准 {args.base_dp}dp)")
+
+    exported, failed = 0, []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(export_master, name, str(path), args.base_dp, args.lossless, args.quality)
+            for name, (path, _) in pending.items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            name = result["name"]
+            if result["status"] == "failed":
+                failed.append(f"{name}: {result['error']}")
+                continue
+            master, superseded = pending[name]
+            if not args.keep_default:
+                if master.parent == DRAWABLE_DIR:
+                    retire_master(master, discard=False)
+                    master = MASTERS_DIR / master.name
+                elif superseded is not None:
+                    superseded.unlink()
+            state[name] = master_signature(master, params)
+            exported += 1
+    save_state(state)
+
+    print(f"完成! 导出: {exported}, 跳过(已是最新): {len(masters) - len(pending)}, 失败: {len(failed)}")
+    for line in failed:
+        print(f"  - {line}")
+
+
+if __name__ == "__main__":
+    main()
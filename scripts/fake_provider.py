@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 本地模拟的生成服务，用于离线压测生成脚本，不消耗 API 额度。
+
+模拟的接口:
+  POST /v1/images/generations   OpenAI 图片接口 (generate_images.py、generate_images_gemini.py)
+                                response_format 为 b64_json 时内嵌图片，否则返回 /files/ 下载地址
+  POST /v1/audio/speech         OpenAI TTS 接口 (generate_audio_tts.py --engine openai)
+  GET  /prompt/<提示词>          Pollinations 图片接口 (generate_images_free.py)
+  GET  /files/<名称>             图片下载地址
+  GET  /stats                   各接口的请求数、429 数、错误数 (JSON)
+
+返回的是结构合法的 PNG (带填充块) 和 MP3 (静音帧)，大小可配置；延迟按分布抽样:
+  const:200            固定 200 毫秒
+  uniform:100,800      100-800 毫秒均匀分布
+  lognormal:500,0.6    中位数 500 毫秒、sigma 0.6 的对数正态分布 (长尾，接近真实服务)
+  exp:300              均值 300 毫秒的指数分布
+按 --rate-429 的概率返回 429 (带 Retry-After)，按 --error-rate 的概率返回 500/503，
+按 --drop-rate 的概率在发送一半响应体后断开连接 (Content-Length 不符)。
+
+运行:
+    python scripts/fake_provider.py --port 8089 --latency lognormal:800,0.5 --rate-429 0.05
+    POLLINATIONS_BASE_URL=http://127.0.0.1:8089 python scripts/generate_images_free.py -c fruits
+压测请用 benchmark_generators.py，它会在进程内启动本服务。
+"""
+
+import argparse
+import base64
+import json
+import math
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+DEFAULT_LATENCY = "lognormal:400,0.5"
+DEFAULT_IMAGE_KB = 300
+DEFAULT_AUDIO_KB = 12
+# 图片像素尺寸，其余大小由填充块补足
+IMAGE_SIDE = 64
+# MPEG-1 Layer III，128 kbps，44.1 kHz，无填充：每帧 417 字节
+MP3_FRAME_HEADER = b"\xff\xfb\x90\x64"
+MP3_FRAME_SIZE = 417
+WRITE_CHUNK = 64 * 1024
+
+
+def parse_latency(spec: str):
+    """解析延迟分布，返回每次调用抽样一个秒数的函数"""
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",")] if args else []
+        if kind == "const" and len(values) == 1:
+            return lambda: values[0] / 1000.0
+        if kind == "uniform" and len(values) == 2:
+            return lambda: random.uniform(values[0], values[1]) / 1000.0
+        if kind == "lognormal" and len(values) == 2:
+            mu = math.log(values[0])
+            return lambda: random.lognormvariate(mu, values[1]) / 1000.0
+        if kind == "exp" and len(values) == 1:
+            return lambda: random.expovariate(1000.0 / values[0])
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(
+        f"延迟分布格式: const:MS | uniform:LO,HI | lognormal:MEDIAN,SIGMA | exp:MEAN，收到 {spec!r}")
+
+
+def latency_spec(spec: str) -> str:
+    """argparse 类型: 校验延迟分布并保留原字符串 (便于写入压测报告)"""
+    parse_latency(spec)
+    return spec
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def make_png(size_bytes: int) -> bytes:
+    """IMAGE_SIDE 见方的纯色 PNG，用私有辅助块 (解码器会忽略) 填充到约 size_bytes"""
+    row = b"\0" + bytes((135, 206, 250)) * IMAGE_SIDE
+    ihdr = struct.pack(">IIBBBBB", IMAGE_SIDE, IMAGE_SIDE, 8, 2, 0, 0, 0)
+    head = b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", ihdr) + _png_chunk(b"IDAT", zlib.compress(row * IMAGE_SIDE))
+    tail = _png_chunk(b"IEND", b"")
+    padding = max(0, size_bytes - len(head) - len(tail) - 12)
+    return head + (_png_chunk(b"bnCh", bytes(padding)) if padding else b"") + tail
+
+
+def make_mp3(size_bytes: int) -> bytes:
+    frame = MP3_FRAME_HEADER + bytes(MP3_FRAME_SIZE - len(MP3_FRAME_HEADER))
+    return frame * max(2, size_bytes // MP3_FRAME_SIZE)
+
+
+class ProviderState:
+    """服务配置与请求统计"""
+
+    def __init__(self, latency=DEFAULT_LATENCY, image_kb=DEFAULT_IMAGE_KB, audio_kb=DEFAULT_AUDIO_KB,
+                 rate_429=0.0, error_rate=0.0, drop_rate=0.0, retry_after=1.0, seed=None):
+        self.latency = latency
+        self.sample_latency = parse_latency(latency)
+        self.image = make_png(int(image_kb * 1024))
+        self.audio = make_mp3(int(audio_kb * 1024))
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def count(self, endpoint: str, outcome: str):
+        with self._lock:
+            counts = self.stats.setdefault(endpoint, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def draw(self):
+        """本次请求的结果: ok / 429 / error / drop"""
+        with self._lock:
+            roll = self.random.random()
+        for outcome, rate in (("429", self.rate_429), ("error", self.error_rate), ("drop", self.drop_rate)):
+            if roll < rate:
+                return outcome
+            roll -= rate
+        return "ok"
+
+
+class ProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeProvider/1.0"
+
+    @property
+    def state(self) -> ProviderState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(body or b"{}")
+        except ValueError:
+            return {}
+
+    def _send(self, status: int, body: bytes, content_type: str, headers=None, drop=False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if drop:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        if drop:
+            # 只发一半就断开，客户端应检测到字节数不符
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        view = memoryview(body)
+        for offset in range(0, len(body), WRITE_CHUNK):
+            self.wfile.write(view[offset:offset + WRITE_CHUNK])
+
+    def _serve(self, endpoint: str, make_body):
+        """统一处理延迟与故障注入；make_body 返回 (响应体, Content-Type)"""
+        time.sleep(self.state.sample_latency())
+        outcome = self.state.draw()
+        self.state.count(endpoint, outcome)
+        if outcome == "429":
+            body = json.dumps({"error": {"message": "Rate limit exceeded", "type": "rate_limit"}}).encode()
+            self._send(429, body, "application/json", {"Retry-After": f"{self.state.retry_after:g}"})
+        elif outcome == "error":
+            status = self.state.random.choice((500, 503))
+            body = json.dumps({"error": {"message": "Simulated server error", "type": "server_error"}}).encode()
+            self._send(status, body, "application/json")
+        else:
+            body, content_type = make_body()
+            self._send(200, body, content_type, drop=outcome == "drop")
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/stats":
+            self._send(200, json.dumps(self.state.stats).encode(), "application/json")
+        elif path.startswith("/prompt/"):
+            self._serve("pollinations", lambda: (self.state.image, "image/png"))
+        elif path.startswith("/files/"):
+            self._send(200, self.state.image, "image/png")
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        payload = self._read_json()
+        if path == "/v1/images/generations":
+            count = max(1, int(payload.get("n") or 1))
+            if payload.get("response_format") == "b64_json":
+                entry = {"b64_json": base64.b64encode(self.state.image).decode("ascii")}
+            else:
+                entry = {"url": f"http://{self.headers.get('Host')}/files/image.png"}
+            body = json.dumps({"created": int(time.time()), "data": [entry] * count}).encode()
+            self._serve("images", lambda: (body, "application/json"))
+        elif path == "/v1/audio/speech":
+            self._serve("speech", lambda: (self.state.audio, "audio/mpeg"))
+        else:
+            self._send(404, b"not found", "text/plain")
+
+
+class ProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, state: ProviderState, host="127.0.0.1", port=0):
+        super().__init__((host, port), ProviderHandler)
+        self.state = state
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """在后台线程中运行，返回自身"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def add_provider_arguments(parser):
+    parser.add_argument("--latency", type=latency_spec, default=DEFAULT_LATENCY,
+                        help=f"响应延迟分布 (默认 {DEFAULT_LATENCY})")
+    parser.add_argument("--image-kb", type=float, default=DEFAULT_IMAGE_KB, help=f"图片大小 KB (默认 {DEFAULT_IMAGE_KB})")
+    parser.add_argument("--audio-kb", type=float, default=DEFAULT_AUDIO_KB, help=f"音频大小 KB (默认 {DEFAULT_AUDIO_KB})")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="返回 429 的概率")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 500/503 的概率")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="响应中途断开的概率")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 响应的 Retry-After 秒数 (默认 1)")
+    parser.add_argument("--seed", type=int, help="故障注入的随机种子")
+
+
+def state_from_args(args) -> ProviderState:
+    return ProviderState(args.latency, args.image_kb, args.audio_kb, args.rate_429,
+                         args.error_rate, args.drop_rate, args.retry_after, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟的 OpenAI / Pollinations 生成服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_provider_arguments(parser)
+    args = parser.parse_args()
+
+    server = ProviderServer(state_from_args(args), args.host, args.port)
+    print(f"模拟服务: {server.base_url} (Ctrl+C 退出)")
+    print(f"  POLLINATIONS_BASE_URL={server.base_url}")
+    print(f"  API_BASE_URL={server.base_url}  OPENAI_BASE_URL={server.base_url}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 资源生成缓存（按内容寻址）。
+
+缓存键是生成参数（提示词/文本、风格后缀、模型、音色、尺寸、种子等）的哈希。
+生成结果只在 .gen_cache/objects/ 中保存一份，再安装到 res/drawable 或 res/raw；
+.gen_cache/installed.sqlite3 记录每个资源当前安装的是哪个键、由哪个生成器产生
+（每次安装只写一行，多个进程可同时使用；旧版的 installed.json 会在首次打开时导入）。
+
+判断规则:
+  - 资源已安装且键一致              -> current，跳过
+  - 资源未安装或键已变化，缓存里有    -> hit，直接从缓存安装（改回旧提示词无需再调用 API）
+  - 缓存里也没有                    -> miss，需要调用生成接口
+  - 资源由其他生成器产生（非占位图）  -> current，不覆盖别的来源的成品
+  - 首次运行时已存在但没有记录的文件会被登记为当前输入的结果，之后修改输入才会触发重新生成
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from safe_io import copy_atomic
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# 生成脚本的状态目录，可用环境变量覆盖（例如基准测试时指向临时目录）
+STATE_DIR = Path(os.getenv("CLOUDITEM_STATE_DIR", str(REPO_ROOT / ".gen_cache")))
+
+# 同一资源可能以不同格式存在（后处理会转换格式、占位图可能是 VectorDrawable），
+# 同一组中的任一格式都视为已安装，从任一格式出发查到的都是整组
+_EQUIVALENT_GROUPS = (
+    (".png", ".webp", ".jpg", ".xml"),
+    (".mp3", ".ogg", ".wav"),
+)
+EQUIVALENT_SUFFIXES = {suffix: group for group in _EQUIVALENT_GROUPS for suffix in group}
+# drawable/ 中的图片导出为各密度版本 (drawable-mdpi ...) 后同样视为已安装
+DENSITY_QUALIFIERS = ("mdpi", "hdpi", "xhdpi", "xxhdpi", "xxxhdpi")
+
+# 占位图的来源名；真实生成器总会替换占位图
+PLACEHOLDER_SOURCE = "placeholder"
+# 生成占位图时遇到的无记录旧文件，由第一个真实生成器认领
+LEGACY_SOURCE = "legacy"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS installed (
+    asset   TEXT PRIMARY KEY,
+    key     TEXT,
+    source  TEXT NOT NULL,
+    file    TEXT NOT NULL
+)
+"""
+
+
+def cache_key(**params) -> str:
+    """对生成参数做规范化 JSON 序列化后取 SHA-256 作为缓存键"""
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _asset_id(path) -> str:
+    """资源标识: 去掉扩展名的路径，仓库内用相对路径"""
+    resolved = Path(path).resolve()
+    try:
+        resolved = resolved.relative_to(REPO_ROOT)
+    except ValueError:
+        pass
+    return resolved.with_suffix("").as_posix()
+
+
+def _sibling_files(path):
+    """同一资源的所有等价格式文件路径 (含各密度目录中的版本)"""
+    path = Path(path)
+    suffixes = EQUIVALENT_SUFFIXES.get(path.suffix.lower(), (path.suffix,))
+    siblings = [path.with_suffix(s) for s in suffixes]
+    if path.parent.name == "drawable":
+        res_dir = path.parent.parent
+        for qualifier in DENSITY_QUALIFIERS:
+            siblings.extend(res_dir / f"drawable-{qualifier}" / (path.stem + s) for s in suffixes)
+    return siblings
+
+
+class GenerationCache:
+    """内容寻址的生成缓存，线程安全"""
+
+    CURRENT = "current"
+    HIT = "hit"
+    MISS = "miss"
+
+    def __init__(self, state_dir=None):
+        state_dir = Path(state_dir) if state_dir else STATE_DIR
+        state_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir = state_dir / "objects"
+        self.db_path = state_dir / "installed.sqlite3"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._import_json_manifest(state_dir / "installed.json")
+
+    def _import_json_manifest(self, json_path):
+        """导入旧版 installed.json (已有的记录优先)，导入后改名为 installed.json.bak"""
+        if not json_path.exists():
+            return
+        try:
+            with json_path.open("r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            print(f"警告: 无法读取旧的缓存清单 {json_path}，已忽略")
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO installed (asset, key, source, file) VALUES (?, ?, ?, ?)",
+                [(asset, record.get("key"), record.get("source") or LEGACY_SOURCE, record.get("file") or "")
+                 for asset, record in manifest.items()],
+            )
+            self._conn.commit()
+        try:
+            os.replace(str(json_path), str(json_path) + ".bak")
+        except OSError:
+            pass  # 另一个进程已经导入并改名
+
+    def object_path(self, key: str, suffix: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}{suffix}"
+
+    def installed_file(self, output_path):
+        """返回已安装的等价文件（任意格式），不存在时返回 None"""
+        for candidate in _sibling_files(output_path):
+            if candidate.exists():
+                return candidate
+        return None
+
+    def record_of(self, output_path):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, source, file FROM installed WHERE asset = ?", (_asset_id(output_path),)
+            ).fetchone()
+        return {"key": row[0], "source": row[1], "file": row[2]} if row else None
+
+    def records(self):
+        """资源标识 -> 安装记录"""
+        with self._lock:
+            rows = self._conn.execute("SELECT asset, key, source, file FROM installed").fetchall()
+        return {asset: {"key": key, "source": source, "file": file} for asset, key, source, file in rows}
+
+    def check(self, output_path, key: str, source: str) -> str:
+        """判断资源需要跳过 (current)、从缓存安装 (hit) 还是重新生成 (miss)"""
+        output_path = Path(output_path)
+        installed = self.installed_file(output_path)
+        record = self.record_of(output_path)
+        if installed is not None:
+            if source == PLACEHOLDER_SOURCE and record is None:
+                # 占位图模式不认领旧文件，避免把真实图片误记为占位图
+                self._record(None, installed, LEGACY_SOURCE)
+                return self.CURRENT
+            if record is None or (record.get("source") == LEGACY_SOURCE and source != PLACEHOLDER_SOURCE):
+                # 旧文件没有记录：登记为当前输入的结果
+                self._record(key, installed, source)
+                return self.CURRENT
+            if record.get("key") == key:
+                return self.CURRENT
+            if record.get("source") != source and record.get("source") != PLACEHOLDER_SOURCE:
+                return self.CURRENT
+        if self.object_path(key, output_path.suffix).exists():
+            return self.HIT
+        return self.MISS
+
+    def _remove_stale_siblings(self, output_path):
+        """删除同名但格式不同的旧文件，避免 Android 资源重名"""
+        output_path = Path(output_path)
+        for candidate in _sibling_files(output_path):
+            if candidate != output_path and candidate.exists():
+                candidate.unlink()
+
+    def _record(self, key, output_path, source):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO installed (asset, key, source, file) VALUES (?, ?, ?, ?)",
+                (_asset_id(output_path), key, source, Path(output_path).name),
+            )
+            self._conn.commit()
+
+    def store(self, key: str, output_path, source: str):
+        """把刚生成的文件存入缓存并登记为已安装"""
+        output_path = Path(output_path)
+        obj = self.object_path(key, output_path.suffix)
+        if not obj.exists():
+            copy_atomic(output_path, obj)
+        self._remove_stale_siblings(output_path)
+        self._record(key, output_path, source)
+
+    def adopt(self, src_object, key: str, output_path, source: str):
+        """安装另一个缓存目录中的生成结果 (合并分片时使用)"""
+        output_path = Path(output_path)
+        obj = self.object_path(key, output_path.suffix)
+        if not obj.exists():
+            copy_atomic(src_object, obj)
+        self.restore(key, output_path, source)
+
+    def restore(self, key: str, output_path, source: str):
+        """从缓存安装资源（缓存命中时使用）"""
+        output_path = Path(output_path)
+        copy_atomic(self.object_path(key, output_path.suffix), output_path)
+        self._remove_stale_siblings(output_path)
+        self._record(key, output_path, source)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 生成任务的运行指标 (计数器与直方图)。
+
+所有生成脚本共用进程内的 metrics 实例，任务账本、重试策略和限速器在关键位置记录:
+  clouditem_jobs_total{provider, variant, status}      任务结果 (JobLedger.finish)
+  clouditem_job_seconds{provider, status}              单个任务耗时
+  clouditem_bytes_total{provider}                      写入的字节数
+  clouditem_retries_total{provider}                    重试次数 (RetryPolicy)
+  clouditem_request_errors_total{provider, reason}     请求失败 (HTTP 状态码或异常类型)
+  clouditem_circuit_open_total{provider}               熔断打开次数
+  clouditem_ratelimit_wait_seconds{provider}           取令牌的等待时间 (RateLimiter)
+  clouditem_throttled_total{provider}                  被限流次数
+  clouditem_stage_seconds{stage}                       各阶段耗时 (metrics.stage("download"))
+运行结束时 export_run_metrics() 写出两个文件 (目录可用 CLOUDITEM_METRICS_DIR 指定，
+例如 node_exporter 的 textfile 目录):
+  <脚本名>.prom   Prometheus 文本格式，所有序列带 script 标签，便于多个脚本共用目录
+  <脚本名>.json   摘要: 计数器、各直方图的 p50/p95/p99、吞吐 (任务/秒、字节/秒)
+
+用法:
+    from gen_metrics import metrics, export_run_metrics
+    with metrics.stage("download"):
+        ...
+    export_run_metrics("generate_images_free")
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from gen_cache import STATE_DIR
+from safe_io import write_atomic
+
+METRICS_DIR = Path(os.getenv("CLOUDITEM_METRICS_DIR", str(STATE_DIR / "metrics")))
+PREFIX = "clouditem_"
+
+# 直方图桶上限 (秒)；生成一张图通常 5-60 秒，语音 0.5-5 秒
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+PERCENTILES = (50, 95, 99)
+
+HELP = {
+    "jobs_total": "Finished generation jobs by provider, variant and status",
+    "job_seconds": "Wall time of a single generation job",
+    "bytes_total": "Bytes written by generation jobs",
+    "retries_total": "Requests retried after a transient error",
+    "request_errors_total": "Failed provider requests by HTTP status or exception type",
+    "circuit_open_total": "Times the provider circuit breaker opened",
+    "ratelimit_wait_seconds": "Time spent waiting for a rate limiter token",
+    "throttled_total": "Responses that made the rate limiter back off",
+    "stage_seconds": "Wall time spent in each pipeline stage",
+}
+
+
+def _label_key(labels: dict):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def percentile(sorted_values, p: float) -> float:
+    """线性插值的百分位数；sorted_values 需已排序且非空"""
+    rank = (len(sorted_values) - 1) * p / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+class Histogram:
+    """累计分桶计数，同时保留样本用于计算精确的百分位数 (一次运行最多几千个任务)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.counts = [0] * len(self.buckets)
+        self.samples = []
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.samples.append(value)
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def summary(self) -> dict:
+        values = sorted(self.samples)
+        result = {"count": len(values), "sum": round(self.sum, 4)}
+        if values:
+            result["mean"] = round(self.sum / len(values), 4)
+            result["max"] = round(values[-1], 4)
+            for p in PERCENTILES:
+                result[f"p{p}"] = round(percentile(values, p), 4)
+        return result
+
+
+class MetricsRegistry:
+    """进程内的计数器和直方图，线程安全"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def stage(self, stage: str, **labels):
+        """记录代码块的耗时 (异常退出也记录)"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.monotonic() - started, stage=stage, **labels)
+
+    def record_job(self, provider: str, variant: str, status: str, latency: float = None,
+                   size_bytes: int = None):
+        """任务账本每记录一个结果调用一次"""
+        self.inc("jobs_total", provider=provider, variant=variant, status=status)
+        if latency is not None:
+            self.observe("job_seconds", latency, provider=provider, status=status)
+        if size_bytes:
+            self.inc("bytes_total", size_bytes, provider=provider)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._counters and not self._histograms
+
+    def prometheus_text(self, extra_labels: dict = None) -> str:
+        extra = _label_key(extra_labels or {})
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                full = PREFIX + name
+                lines.append(f"# HELP {full} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{full}{_format_labels(extra + key)} {_format_value(value)}")
+            for name in sorted(self._histograms):
+                full = PREFIX + name
+                lines.append(f"# HELP {full} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        labels = extra + key + (("le", _format_value(bound)),)
+                        lines.append(f"{full}_bucket{_format_labels(labels)} {cumulative}")
+                    lines.append(f"{full}_sum{_format_labels(extra + key)} {_format_value(round(histogram.sum, 6))}")
+                    lines.append(f"{full}_count{_format_labels(extra + key)} {len(histogram.samples)}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        duration = max(time.time() - self.started, 1e-9)
+        with self._lock:
+            counters = {
+                name: [dict(key, value=value) for key, value in sorted(series.items())]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [dict(key, **histogram.summary()) for key, histogram in sorted(series.items())]
+                for name, series in self._histograms.items()
+            }
+        jobs = sum(entry["value"] for entry in counters.get("jobs_total", []))
+        written = sum(entry["value"] for entry in counters.get("bytes_total", []))
+        return {
+            "started_at": self.started,
+            "duration_s": round(duration, 3),
+            "throughput": {
+                "jobs_per_s": round(jobs / duration, 4),
+                "bytes_per_s": round(written / duration, 1),
+            },
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+
+metrics = MetricsRegistry()
+
+
+def print_summary(summary: dict):
+    """每个提供方一行: 任务数、p50/p95 耗时、重试和错误数"""
+    retries = {entry["provider"]: entry["value"] for entry in summary["counters"].get("retries_total", [])}
+    errors = {}
+    for entry in summary["counters"].get("request_errors_total", []):
+        errors[entry["provider"]] = errors.get(entry["provider"], 0) + entry["value"]
+    for entry in summary["histograms"].get("job_seconds", []):
+        if entry["count"] == 0:
+            continue
+        provider = entry["provider"]
+        print(f"  [指标] {provider} ({entry['status']}): {entry['count']} 个, "
+              f"p50 {entry['p50']:.2f}s, p95 {entry['p95']:.2f}s, "
+              f"重试 {retries.get(provider, 0)}, 请求错误 {errors.get(provider, 0)}")
+    throughput = summary["throughput"]
+    print(f"  [指标] 吞吐: {throughput['jobs_per_s']:.2f} 任务/秒, "
+          f"{throughput['bytes_per_s'] / 1024:.1f} KB/秒, 用时 {summary['duration_s']:.1f}s")
+
+
+def export_run_metrics(script: str, registry: MetricsRegistry = None, directory=None):
+    """写出 <script>.prom 和 <script>.json，返回摘要；没有记录任何指标时不写文件"""
+    registry = registry or metrics
+    if registry.is_empty():
+        return None
+    directory = Path(directory) if directory else METRICS_DIR
+    summary = dict(registry.summary(), script=script)
+    try:
+        write_atomic(directory / f"{script}.prom", registry.prometheus_text({"script": script}).encode("utf-8"))
+        write_atomic(directory / f"{script}.json",
+                     json.dumps(summary, ensure_ascii=False, indent=1, sort_keys=True).encode("utf-8"))
+    except OSError as e:
+        print(f"警告: 无法写出运行指标 ({e})")
+        return summary
+    print_summary(summary)
+    print(f"  [指标] 已写出 {directory / script}.prom / .json")
+    return summary
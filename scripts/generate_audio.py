@@ -4,8 +4,8 @@
 
 依赖: pip install gTTS
 用法:
-  python generate_audio.py                    # 生成全部 235*2 个文件到 generated_audio/
-  python generate_audio.py --limit 5          # 仅生成前 5 个物品（测试用）
+  python generate_audio.py                    # 为目录中全部物品生成中/英文读音到 generated_audio/
+  python generate_audio.py --limit 5          # 仅生成排序后的前 5 个物品（测试用）
   python generate_audio.py --out ../app/src/main/res/raw   # 直接输出到 res/raw
 
 生成完成后，将 generated_audio/*.mp3 复制到 app/src/main/res/raw/
@@ -15,6 +15,7 @@
 import argparse
 import os
 import sys
+import time
 
 try:
     from gtts import gTTS
@@ -23,8 +24,17 @@ except ImportError:
     sys.exit(1)
 
 from items_data import ITEMS
+from gen_cache import GenerationCache, cache_key
+from job_ledger import JobLedger, add_ledger_arguments, ledger_mode, DONE, FAILED, SKIPPED, CACHED
+from rate_limiter import get_limiter
+from safe_io import link_or_copy
+from sharding import add_shard_argument, in_shard
+from job_scheduler import JobScheduler, add_schedule_arguments, limit_assets
+from gen_metrics import metrics, export_run_metrics
 
 DEFAULT_OUT = "generated_audio"
+CACHE_SOURCE = "generate_audio"
+PROVIDER = "gtts"
 
 
 def safe_filename(res: str) -> str:
@@ -35,46 +45,105 @@ def safe_filename(res: str) -> str:
 def generate_one(text: str, lang: str, path: str) -> bool:
     try:
         tts = gTTS(text=text, lang=lang, slow=False)
-        tts.save(path)
+        with get_limiter(PROVIDER).slot(), metrics.stage("synthesize"):
+            tts.save(path)
         return True
     except Exception as e:
         print("  [FAIL] %s: %s" % (path, e))
         return False
 
 
+def clip_key(text: str, lang: str) -> str:
+    return cache_key(text=text, lang=lang, engine=PROVIDER, slow=False)
+
+
+def generate_cached(cache: GenerationCache, ledger: JobLedger, res: str, variant: str,
+                    text: str, lang: str, path: str, produced: dict = None) -> str:
+    """文本/语言未变的文件直接跳过，缓存中有的直接安装。返回 current/hit/shared/ok/fail/resumed。
+
+    produced 记录本次运行已合成的 缓存键 -> 文件，相同文本直接硬链接过去。
+    """
+    job_id = (res, variant, PROVIDER)
+    if not ledger.should_run(*job_id):
+        return "resumed"
+    key = clip_key(text, lang)
+    state = cache.check(path, key, CACHE_SOURCE)
+    if state == cache.CURRENT:
+        ledger.finish(*job_id, SKIPPED)
+        return "current"
+    if produced is not None and key in produced:
+        link_or_copy(produced[key], path)
+        cache.store(key, path, CACHE_SOURCE)
+        ledger.finish(*job_id, DONE, size_bytes=os.path.getsize(path))
+        return "shared"
+    if state == cache.HIT:
+        cache.restore(key, path, CACHE_SOURCE)
+        ledger.finish(*job_id, CACHED, size_bytes=os.path.getsize(path))
+        return "hit"
+    ledger.start(*job_id)
+    started = time.monotonic()
+    if generate_one(text, lang, path):
+        cache.store(key, path, CACHE_SOURCE)
+        if produced is not None:
+            produced[key] = path
+        ledger.finish(*job_id, DONE, time.monotonic() - started, os.path.getsize(path))
+        return "ok"
+    ledger.finish(*job_id, FAILED, time.monotonic() - started, error="gTTS synthesis failed")
+    return "fail"
+
+
 def main():
     parser = argparse.ArgumentParser(description="生成云朵识物乐园物品名称读音 MP3")
     parser.add_argument("--out", default=DEFAULT_OUT, help="输出目录（默认 generated_audio）")
-    parser.add_argument("--limit", type=int, default=None, help="仅生成前 N 个物品（测试用）")
+    parser.add_argument("--limit", type=int, default=None, help="仅生成排序后的前 N 个物品（测试用）")
     parser.add_argument("--cn-only", action="store_true", help="仅生成中文")
     parser.add_argument("--en-only", action="store_true", help="仅生成英文")
+    add_ledger_arguments(parser)
+    add_shard_argument(parser)
+    add_schedule_arguments(parser)
     args = parser.parse_args()
 
     os.makedirs(args.out, exist_ok=True)
-    items = ITEMS[: args.limit] if args.limit else ITEMS
+    items = [item for item in ITEMS if in_shard(safe_filename(item[2]), args.shard)]
     do_cn = not args.en_only
     do_en = not args.cn_only
 
-    ok, fail = 0, 0
-    for i, (name_cn, name_en, res) in enumerate(items):
+    cache = GenerationCache()
+    ledger = JobLedger(mode=ledger_mode(args))
+    entries = []
+    for name_cn, name_en, res in items:
         base = safe_filename(res)
         if do_cn:
-            path_cn = os.path.join(args.out, "%s_cn.mp3" % base)
-            if generate_one(name_cn, "zh-cn", path_cn):
-                ok += 1
-            else:
-                fail += 1
+            entries.append((base, "cn", name_cn, "zh-cn", os.path.join(args.out, "%s_cn.mp3" % base)))
         if do_en:
-            path_en = os.path.join(args.out, "%s_en.mp3" % base)
-            if generate_one(name_en, "en", path_en):
-                ok += 1
-            else:
-                fail += 1
-        if (i + 1) % 20 == 0:
-            print("已处理 %d / %d 个物品..." % (i + 1, len(items)))
-
-    total = len(items) * (2 if (do_cn and do_en) else 1)
-    print("完成: 成功 %d, 失败 %d (共 %d 个文件)" % (ok, fail, total))
+            entries.append((base, "en", name_en, "en", os.path.join(args.out, "%s_en.mp3" % base)))
+    # 缺失的和要发布的分类先合成，同等情况下短文本在前
+    scheduler = JobScheduler.from_args(args, cache, ledger, PROVIDER)
+    entries = scheduler.order(entries, asset=lambda clip: clip[0], output_path=lambda clip: clip[4],
+                              cost=lambda clip: len(clip[2]))
+    entries = limit_assets(entries, asset=lambda clip: clip[0], limit=args.limit)
+    # (文本, 语言) -> 需要这段读音的文件；相同文本只合成一次
+    clips = {}
+    for clip in entries:
+        clips.setdefault(clip_key(clip[2], clip[3]), []).append(clip)
+    total = sum(len(group) for group in clips.values())
+    print("共 %d 个文件，不同读音 %d 条，其中缺失 %d 个" % (total, len(clips), scheduler.counts["missing"]))
+
+    counts = {"ok": 0, "fail": 0, "hit": 0, "shared": 0, "current": 0, "resumed": 0}
+    produced = {}
+    done = 0
+    for group in clips.values():
+        for clip in group:
+            counts[generate_cached(cache, ledger, *clip, produced=produced)] += 1
+            done += 1
+            if done % 40 == 0:
+                print("已处理 %d / %d 个文件..." % (done, total))
+
+    ledger.close()
+    export_run_metrics("generate_audio")
+    ok = counts["ok"] + counts["hit"] + counts["shared"]
+    print("完成: 成功 %d (其中缓存 %d, 复用相同读音 %d), 失败 %d, 已是最新 %d (共 %d 个文件)"
+          % (ok, counts["hit"], counts["shared"], counts["fail"], counts["current"], total))
     if args.out == DEFAULT_OUT and ok > 0:
         print("请将 %s/*.mp3 复制到 app/src/main/res/raw/" % args.out)
 
@@ -7,6 +7,8 @@ import os
 import requests
 from pathlib import Path
 
+from safe_io import CHUNK_SIZE, content_length, stream_to_file
+
 # Configuration
 OUTPUT_DIR = Path("../app/src/main/res/drawable")
 IMAGE_NAME = "cat"
@@ -71,12 +73,11 @@ def generate_image(api_key):
         image_url = data["data"][0]["url"]
         print(f"Image generated successfully! URL: {image_url}")
         
-        # Download and save the image
-        img_response = requests.get(image_url)
-        img_response.raise_for_status()
-        
-        with open(output_path, 'wb') as f:
-            f.write(img_response.content)
+        # Stream the image to a temp file and rename it into place
+        with requests.get(image_url, stream=True, timeout=60) as img_response:
+            img_response.raise_for_status()
+            stream_to_file(img_response.iter_content(CHUNK_SIZE), output_path,
+                           content_length(img_response.headers))
         
         print(f"Image saved to: {output_path.absolute()}")
         return True
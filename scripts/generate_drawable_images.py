@@ -9,6 +9,7 @@ and saves the resulting PNGs into app/src/main/res/drawable.
 
 import os
 import re
+import argparse
 import json
 import time
 import logging
@@ -22,6 +23,13 @@ except Exception:
     Image = ImageDraw = ImageFont = None
     PIL_AVAILABLE = False
 
+from rate_limiter import get_limiter
+from retry_policy import RetryPolicy
+from safe_io import CHUNK_SIZE, content_length, stream_to_file
+from gen_cache import GenerationCache, cache_key, PLACEHOLDER_SOURCE
+from placeholder_renderer import render_batch
+from sharding import add_shard_argument, in_shard
+
 # Core style suffix to ensure consistent look across all assets
 CORE_SUFFIX = (
     ", children's educational illustration, cute 3D clay style, bright and vibrant colors, "
@@ -88,58 +96,33 @@ def openai_generate(prompt: str, api_key: str, size: str = "512x512") -> str:
     url = "https://api.openai.com/v1/images/generations"
     headers = {"Authorization": f"Bearer {api_key}"}
     payload = {"prompt": prompt, "n": 1, "size": size, "response_format": "url"}
-    resp = requests.post(url, headers=headers, json=payload, timeout=60)
-    resp.raise_for_status()
-    data = resp.json()
+
+    def post():
+        with get_limiter("openai-images").slot():
+            resp = requests.post(url, headers=headers, json=payload, timeout=60)
+            resp.raise_for_status()
+        return resp
+
+    data = RetryPolicy("openai-images").call(post).json()
+    if not data.get("data"):
+        raise RuntimeError("API response contained no images")
     return data["data"][0]["url"]
 
 def download_image(img_url: str, dest_path: Path):
-    resp = requests.get(img_url, stream=True, timeout=60)
-    resp.raise_for_status()
-    with dest_path.open("wb") as f:
-        for chunk in resp.iter_content(1024):
-            if chunk:
-                f.write(chunk)
-
-def generate_offline_image(text: str, dest_path: Path, width: int = 512, height: int = 512):
-    """Create a simple offline placeholder image with the given text.
-    Uses Pillow; will gracefully skip if Pillow isn't installed.
-    """
-    try:
-        from PIL import Image, ImageDraw, ImageFont
-    except Exception:
-        logging.error("Pillow is not installed. Cannot generate offline placeholder for: %s", text)
-        return
-    img = Image.new("RGB", (width, height), color=(220, 220, 220))
-    draw = ImageDraw.Draw(img)
-    try:
-        font = ImageFont.load_default()
-    except Exception:
-        font = None
-    # Simple vertical gradient feel
-    for y in range(height):
-        r = int(180 + (75 * y) // height)
-        g = int(210 - (40 * y) // height)
-        b = int(200 - (20 * y) // height)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
-    # Calculate text position
-    # For Pillow >= 9.0.0, use textlength instead of textsize
-    try:
-        # Try to use textbbox for more accurate measurement
-        bbox = draw.textbbox((0, 0), text, font=font)
-        w = bbox[2] - bbox[0]
-        h = bbox[3] - bbox[1]
-    except AttributeError:
-        # Fallback to older method
-        try:
-            w, h = draw.textsize(text, font=font)
-        except AttributeError:
-            # If all else fails, use a default size
-            w, h = 100, 20
-    draw.text(((width - w) // 2, (height - h) // 2), text, fill=(0, 0, 0), font=font)
-    img.save(dest_path)
+    with requests.get(img_url, stream=True, timeout=60) as resp:
+        resp.raise_for_status()
+        # Temp file + atomic rename: an interrupted download never leaves a truncated PNG
+        stream_to_file(resp.iter_content(CHUNK_SIZE), dest_path, content_length(resp.headers))
+
+def placeholder_key(text: str, width: int = 512, height: int = 512, style: str = "gradient") -> str:
+    if style == "vector":
+        return cache_key(kind="vector_placeholder", text=text, size=(width, height))
+    return cache_key(kind="offline_placeholder", text=text, size=(width, height))
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate drawable placeholders for the items in PROMPTS.md")
+    add_shard_argument(parser)
+    args = parser.parse_args()
     logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     cfg = load_config()
     provider = cfg.get("provider", "openai").lower()
@@ -151,25 +134,44 @@ def main():
     ensure_drawable_dir()
 
     offline_overwrite = bool(cfg.get("offline_overwrite", False))
+    # "png" (gradient bitmap, needs Pillow) or "vector" (VectorDrawable XML)
+    style = "vector" if cfg.get("placeholder_format", "png").lower() == "vector" else "gradient"
+    suffix = ".xml" if style == "vector" else ".png"
     # Always generate offline placeholders regardless of API key
     logging.warning("Generating offline placeholders to continue workflow.")
+    if style == "gradient" and not PIL_AVAILABLE:
+        logging.error("Pillow is not installed. Cannot generate offline placeholders.")
+        return
+    cache = GenerationCache()
+    jobs = []
     for idx, it in enumerate(items, start=1):
         slug = (it.get("slug") or it.get("name", "image")).strip()
         base = sanitize_filename(slug)
-        filename = f"{base}.png"
+        if not in_shard(base, args.shard):
+            continue
+        filename = f"{base}{suffix}"
         out_path = DRAWABLE_DIR / filename
-        # If file exists and we are not overwriting, skip creation
-        if out_path.exists() and not offline_overwrite:
-            logging.info(f"[{idx}] Skipping existing image: {out_path.name}")
+        # If the image exists in any format and we are not overwriting, skip creation
+        existing = cache.installed_file(out_path)
+        if existing is not None and not offline_overwrite:
+            logging.info(f"[{idx}] Skipping existing image: {existing.name}")
             continue
         # Ensure unique name if overwrite is disabled and multiple collisions exist
         counter = 1
-        while out_path.exists() and offline_overwrite:
+        while cache.installed_file(out_path) is not None and offline_overwrite:
             counter += 1
-            filename = f"{base}_{counter}.png"
+            filename = f"{base}_{counter}{suffix}"
             out_path = DRAWABLE_DIR / filename
         logging.info(f"[{idx}] Creating offline placeholder for '{slug}' as {filename}")
-        generate_offline_image(slug, out_path)
+        jobs.append((style, slug, (512, 512), out_path))
+
+    # Render all placeholders in a process pool, then record them as placeholders
+    # in the generation cache so any real generator replaces them later
+    for (_, slug, _, out_path), (_, error) in zip(jobs, render_batch(jobs)):
+        if error is None:
+            cache.store(placeholder_key(slug, style=style), out_path, PLACEHOLDER_SOURCE)
+        else:
+            logging.error(f"Failed to create placeholder {out_path.name}: {error}")
     logging.info("Offline placeholders generated in drawable directory.")
     return
 
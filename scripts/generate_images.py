@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 AI Image Generation Script for CloudItemApp
-Generates 235 item images using OpenAI API based on prompts from PROMPTS.md
+Generates an image for every item in DataInitializer.kt using OpenAI API based on prompts from PROMPTS.md
 """
 
 import os
@@ -11,11 +11,29 @@ import base64
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-# Import the items data to get names
-from items_data import ITEMS
+# Item catalog parsed from DataInitializer.kt
+from item_catalog import load_catalog
+from sharding import add_shard_argument, in_shard
+from job_scheduler import JobScheduler, add_schedule_arguments
+from gen_metrics import metrics, export_run_metrics
+from gen_cache import GenerationCache, cache_key
+from job_ledger import JobLedger, add_ledger_arguments, ledger_mode, DONE, FAILED, SKIPPED, CACHED
+from rate_limiter import get_limiter
+from safe_io import CHUNK_SIZE, content_length, copy_atomic, stream_to_file, write_atomic
 
 # Configuration
 OUTPUT_DIR = Path("app/src/main/res/drawable")
+CACHE_SOURCE = "generate_images"
+# Extra variants live outside res/ so aapt never packages them
+CANDIDATES_DIR = Path("generated_candidates")
+
+# Maximum images per request (n) for each model
+MAX_N_BY_MODEL = {
+    "dall-e-2": 10,
+    "dall-e-3": 1,
+    "gpt-image-1": 10,
+}
+
 STYLE_SUFFIX = ", children's educational illustration, cute 3D clay style, bright and vibrant colors, soft studio lighting, high resolution, isolated on white background, rounded edges, friendly appearance, masterpiece, high detail, --ar 1:1"
 
 # All prompts from PROMPTS.md organized by category
@@ -271,17 +289,8 @@ ALL_PROMPTS = {
     "tummy": "A round soft tummy"
 }
 
-# Category ranges (based on items_data.py order)
-CATEGORY_RANGES = {
-    "animals": (0, 40),
-    "fruits": (40, 70),
-    "vegetables": (70, 100),
-    "transportation": (100, 135),
-    "daily_items": (135, 175),
-    "nature": (175, 195),
-    "food_drink": (195, 220),
-    "body_parts": (220, 235)
-}
+# Categories in DataInitializer.kt order (animals, fruits, vegetables, ...)
+CATEGORIES = load_catalog().categories
 
 # Check if OpenAI library is available
 try:
@@ -320,15 +329,12 @@ def get_prompts_for_category(category: str) -> List[Tuple[str, str]]:
     """Get prompts for a specific category"""
     prompts = []
     
-    if category not in CATEGORY_RANGES:
+    if category not in CATEGORIES:
         print(f"Error: Unknown category '{category}'")
         return prompts
     
-    start, end = CATEGORY_RANGES[category]
-    category_items = ITEMS[start:end]
-    
-    for item in category_items:
-        image_name = item[2]  # imageRes is the third element
+    for item in load_catalog().by_category[category]:
+        image_name = item["res_name"]
         if image_name in ALL_PROMPTS:
             subject_prompt = ALL_PROMPTS[image_name]
             full_prompt = f"{subject_prompt}{STYLE_SUFFIX}"
@@ -341,64 +347,142 @@ def get_prompts_for_category(category: str) -> List[Tuple[str, str]]:
 def get_all_prompts() -> List[Tuple[str, str]]:
     """Get all prompts for all items"""
     all_prompts = []
-    for category in CATEGORY_RANGES.keys():
+    for category in CATEGORIES:
         category_prompts = get_prompts_for_category(category)
         all_prompts.extend(category_prompts)
     return all_prompts
 
-def generate_image(client, image_name: str, prompt: str, config: Dict) -> bool:
-    """Generate a single image using OpenAI API"""
+def image_cache_key(prompt: str, config: Dict) -> str:
+    """Cache key over every input that affects the generated image"""
+    return cache_key(prompt=prompt, model=config["model"], size=config["size"],
+                     quality=config["quality"], style=config["style"])
+
+def max_images_per_request(model: str) -> int:
+    """Largest n the model accepts in a single generations request"""
+    return MAX_N_BY_MODEL.get(model, 1)
+
+def request_params(config: Dict) -> Dict:
+    """Generation parameters for the configured model (quality/style are dall-e-3 only)"""
+    params = {"model": config["model"], "size": config["size"]}
+    if config["model"] == "dall-e-3":
+        params["quality"] = config["quality"]
+        params["style"] = config["style"]
+    return params
+
+def save_image(data, dest: Path) -> int:
+    """Write one response entry (base64 payload or download URL) atomically; returns bytes"""
+    if getattr(data, "b64_json", None):
+        content = base64.b64decode(data.b64_json)
+        write_atomic(dest, content)
+        return len(content)
+    import requests
+    with requests.get(data.url, stream=True, timeout=60) as img_response:
+        img_response.raise_for_status()
+        return stream_to_file(img_response.iter_content(CHUNK_SIZE), dest,
+                              content_length(img_response.headers))
+
+def request_images(client, prompt: str, config: Dict, count: int) -> List:
+    """Request `count` images of one prompt in as few round-trips as the model allows.
+
+    A short response is topped up, but never with more than twice the planned number of
+    requests, and a response without images ends the loop. Raises if nothing came back.
+    """
+    per_request = max_images_per_request(config["model"])
+    max_requests = 2 * -(-count // per_request)
+    images = []
+    for _ in range(max_requests):
+        with get_limiter("openai-images").slot(), metrics.stage("request"):
+            response = client.images.generate(
+                prompt=prompt,
+                n=min(per_request, count - len(images)),
+                **request_params(config)
+            )
+        if not response.data:
+            break
+        images.extend(response.data)
+        if len(images) >= count:
+            break
+    if not images:
+        raise RuntimeError("API response contained no images")
+    if len(images) < count:
+        print(f"Warning: got {len(images)} of {count} requested images")
+    return images[:count]
+
+def install_from_cache(image_name: str, key: str, cache: GenerationCache,
+                       ledger: JobLedger, job_id: Tuple[str, str, str]) -> bool:
+    """Skip or restore an image whose inputs are unchanged; False if it must be generated"""
     output_path = OUTPUT_DIR / f"{image_name}.png"
-    
-    # Skip if image already exists
-    if output_path.exists():
-        print(f"Skipping {image_name}.png (already exists)")
+    state = cache.check(output_path, key, CACHE_SOURCE)
+    if state == cache.CURRENT:
+        ledger.finish(*job_id, SKIPPED)
+        print(f"Skipping {image_name}.png (up to date)")
         return True
-    
+    if state == cache.HIT:
+        cache.restore(key, output_path, CACHE_SOURCE)
+        ledger.finish(*job_id, CACHED, size_bytes=output_path.stat().st_size)
+        print(f"Restored {image_name}.png from cache")
+        return True
+    return False
+
+def save_candidates(image_name: str, installed: Path, images: List):
+    """Keep every variant outside res/ so a better one can be picked by hand"""
+    copy_atomic(installed, CANDIDATES_DIR / f"{image_name}_1.png")
+    for index, data in enumerate(images[1:], 2):
+        save_image(data, CANDIDATES_DIR / f"{image_name}_{index}.png")
+    print(f"Saved {len(images)} candidates for {image_name} to {CANDIDATES_DIR}")
+
+def generate_image(client, image_name: str, prompt: str, config: Dict,
+                   cache: GenerationCache, ledger: JobLedger, variants: int = 1) -> bool:
+    """Generate a single image using OpenAI API, plus extra candidate variants.
+
+    The first image is installed; the rest are only saved as candidates.
+    """
+    key = image_cache_key(prompt, config)
+    job_id = (image_name, "image", f"openai:{config['model']}")
+    ledger.start(*job_id)
+    started = time.monotonic()
     try:
-        print(f"Generating {image_name}.png...")
-        
-        response = client.images.generate(
-            model=config["model"],
-            prompt=prompt,
-            size=config["size"],
-            quality=config["quality"],
-            style=config["style"],
-            n=1
-        )
+        print(f"Generating {image_name}.png"
+              + (f" ({variants} variants)" if variants > 1 else "") + "...")
+        images = request_images(client, prompt, config, variants)
         
-        image_url = response.data[0].url
-        
-        # Download the image
-        import requests
-        img_response = requests.get(image_url)
-        img_response.raise_for_status()
-        
-        # Save the image
-        with open(output_path, 'wb') as f:
-            f.write(img_response.content)
+        # Stream the image into place; a partial download never replaces the file
+        output_path = OUTPUT_DIR / f"{image_name}.png"
+        with metrics.stage("save"):
+            size = save_image(images[0], output_path)
+            cache.store(key, output_path, CACHE_SOURCE)
+            if len(images) > 1:
+                save_candidates(image_name, output_path, images)
         
+        ledger.finish(*job_id, DONE, time.monotonic() - started, size)
         print(f"Generated {image_name}.png")
         return True
         
     except Exception as e:
+        ledger.finish(*job_id, FAILED, time.monotonic() - started, error=str(e))
         print(f"Error generating {image_name}.png: {str(e)}")
         return False
 
-def generate_images(category: str = None, dry_run: bool = False):
+def generate_images(category: str = None, dry_run: bool = False, mode: str = "all",
+                    model: str = None, variants: int = 1, shard=None,
+                    release=None, catalog_order: bool = False):
     """Generate images for a specific category or all categories"""
     
     if category:
-        if category not in CATEGORY_RANGES:
+        if category not in CATEGORIES:
             print(f"Error: Unknown category '{category}'")
-            print(f"Available categories: {', '.join(CATEGORY_RANGES.keys())}")
+            print(f"Available categories: {', '.join(CATEGORIES)}")
             return
         
         items_to_generate = get_prompts_for_category(category)
         print(f"Starting {category.upper()} Image Generation...")
     else:
         items_to_generate = get_all_prompts()
-        print("Starting ALL Images Generation (235 items)...")
+        print(f"Starting ALL Images Generation ({len(items_to_generate)} items)...")
+    
+    if shard:
+        items_to_generate = [(name, prompt) for name, prompt in items_to_generate if in_shard(name, shard)]
+        print(f"Shard {shard[0]}/{shard[1]}")
     
     print("=" * 50)
     print(f"Found {len(items_to_generate)} items to generate")
@@ -412,6 +496,9 @@ def generate_images(category: str = None, dry_run: bool = False):
     
     # Load configuration
     config = load_config()
+    if model:
+        config["model"] = model
+    variants = max(1, variants)
     
     if not OPENAI_AVAILABLE:
         print("Error: OpenAI library is required for image generation.")
@@ -419,6 +506,22 @@ def generate_images(category: str = None, dry_run: bool = False):
         return
     
     client = OpenAI(api_key=config["api_key"])
+    cache = GenerationCache()
+    ledger = JobLedger(mode=mode)
+    
+    # --resume / --retry-failed: only keep jobs the ledger has not finished
+    provider = f"openai:{config['model']}"
+    items_to_generate = [
+        (image_name, prompt) for image_name, prompt in items_to_generate
+        if ledger.should_run(image_name, "image", provider)
+    ]
+    
+    # Missing images, placeholders and release categories go first so a short run gets what matters
+    scheduler = JobScheduler(cache, ledger, provider, release=release, enabled=not catalog_order)
+    items_to_generate = scheduler.order(items_to_generate, asset=lambda job: job[0],
+                                        output_path=lambda job: OUTPUT_DIR / f"{job[0]}.png")
+    print(f"Missing: {scheduler.counts['missing']}, placeholders: {scheduler.counts['placeholder']}, "
+          f"regenerations: {scheduler.counts['generated']}")
     
     # Ensure output directory exists
     ensure_output_dir()
@@ -426,32 +529,46 @@ def generate_images(category: str = None, dry_run: bool = False):
     success_count = 0
     total_count = len(items_to_generate)
     
-    for i, (image_name, prompt) in enumerate(items_to_generate, 1):
-        print(f"\n[{i}/{total_count}] Processing: {image_name}")
-        
-        if generate_image(client, image_name, prompt, config):
+    # Installed or cached images first; only the rest cost API requests
+    pending = []
+    for image_name, prompt in items_to_generate:
+        job_id = (image_name, "image", provider)
+        if install_from_cache(image_name, image_cache_key(prompt, config), cache, ledger, job_id):
             success_count += 1
-        
-        # Add delay to avoid rate limiting
-        if i < total_count:
-            time.sleep(2)
+        else:
+            pending.append((image_name, prompt))
+    
+    requests_per_item = -(-variants // max_images_per_request(config["model"]))
+    print(f"{len(pending)} images to generate in {len(pending) * requests_per_item} requests "
+          f"(model {config['model']}, {variants} variant(s) per item)")
     
+    for i, (image_name, prompt) in enumerate(pending, 1):
+        print(f"\n[{i}/{len(pending)}] Processing: {image_name}")
+        if generate_image(client, image_name, prompt, config, cache, ledger, variants):
+            success_count += 1
+    
+    ledger.close()
+    export_run_metrics("generate_images")
     print("\n" + "=" * 50)
     print(f"Image Generation Complete!")
     print(f"Successfully generated: {success_count}/{total_count} images")
     print(f"Images saved to: {OUTPUT_DIR.absolute()}")
 
 if __name__ == "__main__":
-    import sys
+    import argparse
     
-    # Parse arguments
-    dry_run = "--dry-run" in sys.argv or "--test" in sys.argv
-    
-    # Check for category argument
-    category = None
-    for i, arg in enumerate(sys.argv):
-        if arg == "--category" and i + 1 < len(sys.argv):
-            category = sys.argv[i + 1]
-            break
+    parser = argparse.ArgumentParser(description="Generate images for CloudItemApp using the OpenAI API")
+    parser.add_argument("--category", type=str, help="Generate specific category only")
+    parser.add_argument("--dry-run", "--test", dest="dry_run", action="store_true",
+                        help="Test mode (dry run, no images generated)")
+    parser.add_argument("--model", type=str, help="Image model (default dall-e-3; dall-e-2 and gpt-image-1 accept n>1)")
+    parser.add_argument("--variants", type=int, default=1,
+                        help=f"Candidate images per item, fetched in one request where the model allows (saved to {CANDIDATES_DIR})")
+    add_ledger_arguments(parser)
+    add_shard_argument(parser)
+    add_schedule_arguments(parser)
+    args = parser.parse_args()
     
-    generate_images(category=category, dry_run=dry_run)
+    generate_images(category=args.category, dry_run=args.dry_run, mode=ledger_mode(args),
+                    model=args.model, variants=args.variants, shard=args.shard,
+                    release=args.release, catalog_order=args.catalog_order)
@@ -2,17 +2,23 @@
 """
 AI Image Generation Script for CloudItemApp - FREE VERSION
 Uses Pollinations.ai (completely free, no API key needed!)
-Generates 235 item images based on prompts from PROMPTS.md
+Generates an image for every item in DataInitializer.kt based on prompts from PROMPTS.md
+
+Requests run on an asyncio engine that keeps pooled keep-alive connections to
+the API (needs aiohttp); without aiohttp it falls back to a thread pool.
 
 Usage:
     python generate_images_free.py                    # Generate all images
     python generate_images_free.py --category animals # Generate specific category
     python generate_images_free.py --test             # Test mode (dry run)
+    python generate_images_free.py -w 32              # Up to 32 requests in flight
 """
 
 import os
 import sys
 import time
+import asyncio
+import hashlib
 import urllib.request
 import urllib.parse
 from pathlib import Path
@@ -20,11 +26,41 @@ from typing import List, Tuple, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
-# Import the items data to get names
-from items_data import ITEMS
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Item catalog parsed from DataInitializer.kt
+from item_catalog import load_catalog
+from gen_cache import GenerationCache, cache_key
+from job_ledger import JobLedger, add_ledger_arguments, ledger_mode, DONE, FAILED, SKIPPED, CACHED
+from rate_limiter import get_limiter
+from retry_policy import RetryPolicy
+from sharding import add_shard_argument, in_shard
+from job_scheduler import JobScheduler, add_schedule_arguments
+from gen_metrics import metrics, export_run_metrics
+from safe_io import (
+    CHUNK_SIZE, IncompleteDownloadError, atomic_output, content_length, iter_response, stream_to_file,
+)
 
 # Configuration
 OUTPUT_DIR = Path("../app/src/main/res/drawable")
+CACHE_SOURCE = "generate_images_free"
+PROVIDER = "pollinations"
+IMAGE_SIZE = (1024, 1024)
+NEGATIVE_PROMPT = "blurry,low quality,text,watermark,signature"
+# Overridable so the generator can be pointed at a mirror or a local test server
+BASE_URL = os.getenv("POLLINATIONS_BASE_URL", "https://image.pollinations.ai").rstrip("/")
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+# Per-request timeouts in seconds (generation itself takes 10-30 s)
+REQUEST_TIMEOUT = 120
+CONNECT_TIMEOUT = 30
+# Default number of requests in flight for each engine
+DEFAULT_WORKERS = {"async": 16, "threads": 3}
+# Shared by all worker threads so the circuit breaker sees every failure
+retry = RetryPolicy(PROVIDER)
 STYLE_SUFFIX = ", children's educational illustration, cute 3D clay style, bright and vibrant colors, soft studio lighting, high resolution, isolated on white background, rounded edges, friendly appearance, masterpiece, high detail"
 
 # All prompts from PROMPTS.md organized by category
@@ -280,23 +316,15 @@ ALL_PROMPTS = {
     "tummy": "A round soft tummy"
 }
 
-# Category ranges (based on items_data.py order)
-CATEGORY_RANGES = {
-    "animals": (0, 40),
-    "fruits": (40, 70),
-    "vegetables": (70, 100),
-    "transportation": (100, 135),
-    "daily_items": (135, 175),
-    "nature": (175, 195),
-    "food_drink": (195, 220),
-    "body_parts": (220, 235)
-}
+# Categories in DataInitializer.kt order (animals, fruits, vegetables, ...)
+CATEGORIES = load_catalog().categories
 
 # Statistics
 stats = {
     "success": 0,
     "failed": 0,
     "skipped": 0,
+    "cached": 0,
     "total": 0
 }
 stats_lock = threading.Lock()
@@ -310,16 +338,13 @@ def get_prompts_for_category(category: str) -> List[Tuple[str, str]]:
     """Get prompts for a specific category"""
     prompts = []
     
-    if category not in CATEGORY_RANGES:
+    if category not in CATEGORIES:
         print(f"Error: Unknown category '{category}'")
-        print(f"Available categories: {', '.join(CATEGORY_RANGES.keys())}")
+        print(f"Available categories: {', '.join(CATEGORIES)}")
         return prompts
     
-    start, end = CATEGORY_RANGES[category]
-    category_items = ITEMS[start:end]
-    
-    for item in category_items:
-        image_name = item[2]  # imageRes is the third element
+    for item in load_catalog().by_category[category]:
+        image_name = item["res_name"]
         if image_name in ALL_PROMPTS:
             subject_prompt = ALL_PROMPTS[image_name]
             full_prompt = f"{subject_prompt}{STYLE_SUFFIX}"
@@ -332,65 +357,206 @@ def get_prompts_for_category(category: str) -> List[Tuple[str, str]]:
 def get_all_prompts() -> List[Tuple[str, str]]:
     """Get all prompts for all items"""
     all_prompts = []
-    for category in CATEGORY_RANGES.keys():
+    for category in CATEGORIES:
         category_prompts = get_prompts_for_category(category)
         all_prompts.extend(category_prompts)
     return all_prompts
 
-def generate_single_image(image_name: str, prompt: str) -> bool:
-    """Generate a single image using Pollinations.ai (FREE API)"""
+def stable_seed(image_name: str) -> int:
+    """Seed derived from the name; unlike hash() it is the same in every process"""
+    return int(hashlib.sha1(image_name.encode("utf-8")).hexdigest(), 16) % 100000
+
+def image_url(prompt: str, seed: int) -> str:
+    """Pollinations.ai API - Completely FREE, no API key needed! (Flux model)"""
+    width, height = IMAGE_SIZE
+    encoded_prompt = urllib.parse.quote(prompt)
+    encoded_negative = urllib.parse.quote(NEGATIVE_PROMPT, safe=",")
+    return (f"{BASE_URL}/prompt/{encoded_prompt}?width={width}&height={height}&seed={seed}"
+            f"&nologo=true&negative_prompt={encoded_negative}")
+
+def prepare_image(image_name: str, prompt: str, cache: GenerationCache, ledger: JobLedger):
+    """Resolve an image from the cache if possible.
+
+    Returns None when nothing needs generating, otherwise (output_path, key, job_id, url)
+    with the job already marked as started in the ledger.
+    """
     output_path = OUTPUT_DIR / f"{image_name}.png"
+    seed = stable_seed(image_name)  # Consistent seed for reproducibility
+    width, height = IMAGE_SIZE
+    key = cache_key(provider=PROVIDER, prompt=prompt, seed=seed,
+                    size=f"{width}x{height}", negative_prompt=NEGATIVE_PROMPT)
+    job_id = (image_name, "image", PROVIDER)
     
-    # Skip if image already exists
-    if output_path.exists():
+    # Skip if the installed image was generated from the same inputs
+    state = cache.check(output_path, key, CACHE_SOURCE)
+    if state == cache.CURRENT:
+        ledger.finish(*job_id, SKIPPED)
         with stats_lock:
             stats["skipped"] += 1
-        print(f"  [SKIP] {image_name}.png (already exists)")
-        return True
+        print(f"  [SKIP] {image_name}.png (up to date)")
+        return None
+    if state == cache.HIT:
+        cache.restore(key, output_path, CACHE_SOURCE)
+        ledger.finish(*job_id, CACHED, size_bytes=output_path.stat().st_size)
+        with stats_lock:
+            stats["cached"] += 1
+        print(f"  [CACHE] {image_name}.png")
+        return None
     
+    ledger.start(*job_id)
+    print(f"  [GEN] {image_name}.png...")
+    return output_path, key, job_id, image_url(prompt, seed)
+
+def record_success(image_name, output_path, key, job_id, started, size, cache, ledger):
+    with metrics.stage("store"):
+        cache.store(key, output_path, CACHE_SOURCE)
+    ledger.finish(*job_id, DONE, time.monotonic() - started, size)
+    with stats_lock:
+        stats["success"] += 1
+    print(f"  [OK] {image_name}.png ({size//1024}KB)")
+
+def record_failure(image_name, job_id, started, error, ledger):
+    ledger.finish(*job_id, FAILED, time.monotonic() - started, error=str(error))
+    with stats_lock:
+        stats["failed"] += 1
+    print(f"  [FAIL] {image_name}.png: {str(error)[:50]}")
+
+def generate_single_image(image_name: str, prompt: str, cache: GenerationCache, ledger: JobLedger) -> bool:
+    """Generate a single image using Pollinations.ai (FREE API), thread engine"""
+    with metrics.stage("check"):
+        job = prepare_image(image_name, prompt, cache, ledger)
+    if job is None:
+        return True
+    output_path, key, job_id, url = job
+    started = time.monotonic()
     try:
-        # Pollinations.ai API - Completely FREE, no API key needed!
-        # Using Flux model for best quality
-        encoded_prompt = urllib.parse.quote(prompt)
-        seed = hash(image_name) % 100000  # Consistent seed for reproducibility
-        
-        # Using Pollinations.ai with Flux model
-        url = f"https://image.pollinations.ai/prompt/{encoded_prompt}?width=1024&height=1024&seed={seed}&nologo=true&negative_prompt=blurry,low%20quality,text,watermark,signature"
-        
-        print(f"  [GEN] {image_name}.png...")
-        
-        # Download the image
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        request = urllib.request.Request(url, headers=headers)
-        
-        with urllib.request.urlopen(request, timeout=120) as response:
-            image_data = response.read()
-            
-            # Save the image
-            with open(output_path, 'wb') as f:
-                f.write(image_data)
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
         
-        with stats_lock:
-            stats["success"] += 1
+        def fetch():
+            # Stream to a temp file and rename, so a dropped connection never leaves a truncated PNG
+            with get_limiter(PROVIDER).slot(), metrics.stage("download"):
+                with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+                    return stream_to_file(iter_response(response), output_path,
+                                          content_length(response.headers))
         
-        print(f"  [OK] {image_name}.png ({len(image_data)//1024}KB)")
+        # Transient errors are retried with backoff; an outage trips the circuit breaker
+        size = retry.call(fetch)
+        record_success(image_name, output_path, key, job_id, started, size, cache, ledger)
         return True
         
     except Exception as e:
-        with stats_lock:
-            stats["failed"] += 1
-        print(f"  [FAIL] {image_name}.png: {str(e)[:50]}")
+        record_failure(image_name, job_id, started, e, ledger)
         return False
 
-def generate_images(category: str = None, max_workers: int = 3, dry_run: bool = False):
+def create_session(max_in_flight: int):
+    """One connection pool shared by every request (keep-alive, TLS handshake done once)"""
+    connector = aiohttp.TCPConnector(limit=max_in_flight, limit_per_host=max_in_flight,
+                                     keepalive_timeout=60, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=CONNECT_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                 headers={'User-Agent': USER_AGENT})
+
+async def download_async(session, url: str, output_path: Path) -> int:
+    async with get_limiter(PROVIDER).async_slot():
+        with metrics.stage("download"):
+            async with session.get(url) as response:
+                response.raise_for_status()
+                expected = content_length(response.headers)
+                written = 0
+                # Temp file + atomic rename; a cancelled task removes its temp file
+                with atomic_output(output_path) as f:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        f.write(chunk)
+                        written += len(chunk)
+                    if expected is not None and written != expected:
+                        raise IncompleteDownloadError(f"{output_path.name}: got {written} bytes, expected {expected}")
+                return written
+
+async def generate_single_image_async(session, semaphore, image_name: str, prompt: str,
+                                      cache: GenerationCache, ledger: JobLedger) -> bool:
+    """Generate a single image on the asyncio engine; the semaphore caps requests in flight"""
+    async with semaphore:
+        with metrics.stage("check"):
+            job = prepare_image(image_name, prompt, cache, ledger)
+        if job is None:
+            return True
+        output_path, key, job_id, url = job
+        started = time.monotonic()
+        try:
+            size = await retry.call_async(download_async, session, url, output_path)
+        except asyncio.CancelledError:
+            record_failure(image_name, job_id, started, "cancelled", ledger)
+            raise
+        except Exception as e:
+            record_failure(image_name, job_id, started, e, ledger)
+            return False
+        record_success(image_name, output_path, key, job_id, started, size, cache, ledger)
+        return True
+
+def print_progress(completed: int):
+    progress = (completed / stats["total"]) * 100
+    print(f"\r  Progress: {completed}/{stats['total']} ({progress:.1f}%) | "
+          f"Success: {stats['success']} | Cached: {stats['cached']} | Failed: {stats['failed']} | Skipped: {stats['skipped']}", 
+          end='', flush=True)
+
+def run_threads(items_to_generate, max_workers: int, cache: GenerationCache, ledger: JobLedger):
+    """Thread-pool engine (used when aiohttp is not installed)"""
+    completed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(generate_single_image, name, prompt, cache, ledger): name 
+            for name, prompt in items_to_generate
+        }
+        
+        for future in as_completed(futures):
+            completed += 1
+            image_name = futures[future]
+            
+            try:
+                future.result()
+            except Exception as e:
+                print(f"  [ERROR] {image_name}: {str(e)[:50]}")
+            
+            print_progress(completed)
+
+async def run_async(items_to_generate, max_in_flight: int, cache: GenerationCache, ledger: JobLedger):
+    """asyncio engine: pooled keep-alive connections, up to max_in_flight requests at once"""
+    semaphore = asyncio.Semaphore(max_in_flight)
+    async with create_session(max_in_flight) as session:
+        tasks = [
+            asyncio.ensure_future(generate_single_image_async(session, semaphore, name, prompt, cache, ledger))
+            for name, prompt in items_to_generate
+        ]
+        completed = 0
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    await task
+                except Exception as e:
+                    print(f"  [ERROR] {str(e)[:50]}")
+                completed += 1
+                print_progress(completed)
+        finally:
+            # Ctrl+C or an unexpected error: cancel whatever is still in flight
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+def generate_images(category: str = None, max_workers: int = None, dry_run: bool = False, mode: str = "all",
+                    engine: str = None, shard=None,
+                    release=None, catalog_order: bool = False):
     """Generate images for a specific category or all categories"""
+    engine = engine or ("async" if AIOHTTP_AVAILABLE else "threads")
+    if engine == "async" and not AIOHTTP_AVAILABLE:
+        print("  aiohttp is not installed (pip install aiohttp), using the thread engine")
+        engine = "threads"
+    max_workers = max_workers or DEFAULT_WORKERS[engine]
     
     # Reset stats
     stats["success"] = 0
     stats["failed"] = 0
     stats["skipped"] = 0
+    stats["cached"] = 0
     
     if category:
         items_to_generate = get_prompts_for_category(category)
@@ -401,14 +567,17 @@ def generate_images(category: str = None, max_workers: int = 3, dry_run: bool =
     else:
         items_to_generate = get_all_prompts()
         print(f"\n{'='*60}")
-        print(f"  CloudItemApp Image Generator - ALL 235 ITEMS")
+        print(f"  CloudItemApp Image Generator - ALL {len(items_to_generate)} ITEMS")
         print(f"  Using FREE Pollinations.ai API (No API key needed!)")
         print(f"{'='*60}")
     
+    if shard:
+        items_to_generate = [(name, prompt) for name, prompt in items_to_generate if in_shard(name, shard)]
+        print(f"  Shard {shard[0]}/{shard[1]}")
     stats["total"] = len(items_to_generate)
     print(f"\n  Items to generate: {stats['total']}")
     print(f"  Output directory: {OUTPUT_DIR.absolute()}")
-    print(f"  Max concurrent: {max_workers}")
+    print(f"  Max concurrent: {max_workers} ({engine} engine)")
     
     if dry_run:
         print("\n  DRY RUN MODE - Showing first 10 prompts:")
@@ -420,37 +589,41 @@ def generate_images(category: str = None, max_workers: int = 3, dry_run: bool =
     # Ensure output directory exists
     ensure_output_dir()
     
+    # --resume / --retry-failed: only keep jobs the ledger has not finished
+    ledger = JobLedger(mode=mode)
+    items_to_generate = [
+        (name, prompt) for name, prompt in items_to_generate
+        if ledger.should_run(name, "image", PROVIDER)
+    ]
+    stats["total"] = len(items_to_generate)
+    
+    # Missing images, placeholders and release categories go first so a short run gets what matters
+    cache = GenerationCache()
+    scheduler = JobScheduler(cache, ledger, PROVIDER, release=release, enabled=not catalog_order)
+    items_to_generate = scheduler.order(items_to_generate, asset=lambda job: job[0],
+                                        output_path=lambda job: OUTPUT_DIR / f"{job[0]}.png")
+    print(f"  Missing: {scheduler.counts['missing']} | Placeholders: {scheduler.counts['placeholder']} | "
+          f"Regenerations: {scheduler.counts['generated']}")
+    
     print(f"\n  Starting generation...\n")
     
-    # Generate images with thread pool for better speed
-    completed = 0
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(generate_single_image, name, prompt): name 
-            for name, prompt in items_to_generate
-        }
-        
-        for future in as_completed(futures):
-            completed += 1
-            image_name = futures[future]
-            
-            try:
-                future.result()
-            except Exception as e:
-                print(f"  [ERROR] {image_name}: {str(e)[:50]}")
-            
-            # Progress bar
-            progress = (completed / stats["total"]) * 100
-            print(f"\r  Progress: {completed}/{stats['total']} ({progress:.1f}%) | "
-                  f"Success: {stats['success']} | Failed: {stats['failed']} | Skipped: {stats['skipped']}", 
-                  end='', flush=True)
+    if engine == "async":
+        try:
+            asyncio.run(run_async(items_to_generate, max_workers, cache, ledger))
+        except KeyboardInterrupt:
+            print("\n  Interrupted, in-flight requests cancelled")
+    else:
+        run_threads(items_to_generate, max_workers, cache, ledger)
     
+    ledger.close()
+    export_run_metrics("generate_images_free")
     print(f"\n\n{'='*60}")
     print(f"  GENERATION COMPLETE!")
     print(f"{'='*60}")
     print(f"  Total:     {stats['total']}")
     print(f"  Success:   {stats['success']} ✓")
     print(f"  Failed:    {stats['failed']} ✗")
+    print(f"  Cached:    {stats['cached']}")
     print(f"  Skipped:   {stats['skipped']} ⏭")
     print(f"{'='*60}")
 
@@ -462,7 +635,7 @@ if __name__ == "__main__":
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  python generate_images_free.py                    # Generate all 235 images
+  python generate_images_free.py                    # Generate all item images
   python generate_images_free.py -c animals         # Generate only animals
   python generate_images_free.py -t                 # Test mode (dry run)
   python generate_images_free.py -c fruits -w 5     # Generate fruits with 5 workers
@@ -478,13 +651,24 @@ FREE API - No signup or API key required!
                         help='Generate specific category only')
     parser.add_argument('-t', '--test', action='store_true',
                         help='Test mode (dry run, no images generated)')
-    parser.add_argument('-w', '--workers', type=int, default=3,
-                        help='Number of concurrent workers (default: 3)')
+    parser.add_argument('-w', '--workers', type=int,
+                        help='Max requests in flight (default: 16 async, 3 threads)')
+    parser.add_argument('--engine', choices=['async', 'threads'],
+                        help='async (pooled keep-alive connections, needs aiohttp) or threads '
+                             '(default: async when aiohttp is installed)')
+    add_ledger_arguments(parser)
+    add_shard_argument(parser)
+    add_schedule_arguments(parser)
     
     args = parser.parse_args()
     
     generate_images(
         category=args.category,
         dry_run=args.test,
-        max_workers=args.workers
+        max_workers=args.workers,
+        mode=ledger_mode(args),
+        engine=args.engine,
+        shard=args.shard,
+        release=args.release,
+        catalog_order=args.catalog_order
     )
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 物品目录，所有生成/检查脚本共用的唯一数据来源。
+
+直接解析 DataInitializer.kt 中的物品列表 (Triple("中文", "英文", "谜语描述"))、
+分类以及 cnToRes 映射表，与 App 内的数据保持一致。解析结果编译成索引缓存在
+.gen_cache/catalog.json，以源文件的大小/修改时间/哈希为键，源文件不变时直接读取缓存。
+
+用法:
+    from item_catalog import load_catalog
+    catalog = load_catalog()
+    catalog.by_res["cat"]["name_cn"]        # -> "猫"
+    catalog.by_cn["猫"]["res_name"]         # -> "cat"
+    catalog.by_category["animals"]          # -> [item, ...]
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from gen_cache import REPO_ROOT, STATE_DIR
+
+INITIALIZER_PATH = REPO_ROOT / "app/src/main/java/com/clouditemapp/data/initializer/DataInitializer.kt"
+INDEX_PATH = STATE_DIR / "catalog.json"
+# 解析规则变化时递增，使旧的索引缓存失效
+INDEX_VERSION = 1
+
+# cnToRes 中找不到时 Kotlin 使用的资源名
+DEFAULT_RES = "ic_placeholder_default"
+
+# App 分类名 -> 脚本中使用的分类标识 (与 generate_images*.py 的 --category 取值一致)
+CATEGORY_SLUGS = {
+    "动物世界": "animals",
+    "美味水果": "fruits",
+    "新鲜蔬菜": "vegetables",
+    "交通工具": "transportation",
+    "日常用品": "daily_items",
+    "自然现象": "nature",
+    "食物与饮料": "food_drink",
+    "身体部位": "body_parts",
+}
+
+# 系统手动定义的音效及分类名称 (res/raw 中不属于任何物品的音频)
+MANUAL_SOUNDS = [
+    {"text": "答对了！", "file": "correct.mp3"},
+    {"text": "答错了，再试一次吧", "file": "wrong.mp3"},
+    {"text": "游戏结束", "file": "game_over.mp3"},
+    {"text": "获得新成就", "file": "achievement.mp3"},
+    {"text": "动物世界", "file": "cat_animals.mp3"},
+    {"text": "美味水果", "file": "cat_fruits.mp3"},
+    {"text": "新鲜蔬菜", "file": "cat_vegetables.mp3"},
+    {"text": "交通工具", "file": "cat_transport.mp3"},
+    {"text": "日常用品", "file": "cat_daily.mp3"},
+    {"text": "自然现象", "file": "cat_nature.mp3"},
+    {"text": "食物与饮料", "file": "cat_food.mp3"},
+    {"text": "身体部位", "file": "cat_body.mp3"},
+    {"text": "这是谁的影子呢？", "file": "shadow_prompt.mp3"},
+    {"text": "太棒了，你全都答对啦！你是识物小天才！", "file": "perfect_score.mp3"},
+    {"text": "背景音乐正在播放，换成你喜欢的儿歌吧！", "file": "bgm_main.mp3"}
+]
+
+_LIST_RE = re.compile(r'val\s+(\w+)\s*=\s*listOf\(')
+_TRIPLE_RE = re.compile(r'Triple\("([^"]+)",\s*"([^"]+)",\s*"([^"]+)"\)')
+_CATEGORY_RE = re.compile(r'category\s*=\s*"([^"]+)"')
+_ID_BASE_RE = re.compile(r'id\s*=\s*\(index\s*\+\s*(\d+)\)')
+_CN_TO_RES_RE = re.compile(r'fun\s+cnToRes\([^)]*\)[^{]*\{(.*?)\n    \}', re.S)
+_MAPPING_RE = re.compile(r'"([^"]+)"\s*->\s*"([^"]+)"')
+
+
+def parse_initializer(content: str):
+    """解析 DataInitializer.kt 源码，返回 (物品列表, cnToRes 映射)"""
+    cn_to_res = {}
+    m = _CN_TO_RES_RE.search(content)
+    if m:
+        cn_to_res = dict(_MAPPING_RE.findall(m.group(1)))
+
+    items = []
+    starts = list(_LIST_RE.finditer(content))
+    for i, start in enumerate(starts):
+        end = starts[i + 1].start() if i + 1 < len(starts) else len(content)
+        block = content[start.end():end]
+        triples = _TRIPLE_RE.findall(block)
+        if not triples:
+            continue
+        category_match = _CATEGORY_RE.search(block)
+        category = category_match.group(1) if category_match else ""
+        id_match = _ID_BASE_RE.search(block)
+        id_base = int(id_match.group(1)) if id_match else None
+        for index, (cn, en, desc) in enumerate(triples):
+            items.append({
+                "id": id_base + index if id_base is not None else None,
+                "name_cn": cn,
+                "name_en": en,
+                "description_cn": desc,
+                "res_name": cn_to_res.get(cn, DEFAULT_RES),
+                "category": category,
+                "category_slug": CATEGORY_SLUGS.get(category, start.group(1)),
+            })
+    return items, cn_to_res
+
+
+class ItemCatalog:
+    """物品目录及按资源名 / 中文名 / 分类的索引"""
+
+    def __init__(self, items, cn_to_res):
+        self.items = items
+        self.cn_to_res = cn_to_res
+        self.by_res = {item["res_name"]: item for item in items}
+        self.by_cn = {item["name_cn"]: item for item in items}
+        self.by_category = {}
+        for item in items:
+            self.by_category.setdefault(item["category_slug"], []).append(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def res_for_cn(self, cn: str) -> str:
+        """与 Kotlin 的 cnToRes 相同的映射"""
+        return self.cn_to_res.get(cn, DEFAULT_RES)
+
+    @property
+    def categories(self):
+        """分类标识，按 DataInitializer.kt 中的顺序"""
+        return list(self.by_category.keys())
+
+
+def _file_hash(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_index(source: Path, index_path: Path):
+    """源文件未变时返回缓存的索引数据，否则返回 None"""
+    try:
+        with index_path.open("r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != INDEX_VERSION or index.get("source") != str(source):
+        return None
+    stat = source.stat()
+    if index.get("size") == stat.st_size and index.get("mtime_ns") == stat.st_mtime_ns:
+        return index
+    # 修改时间变了 (例如重新检出) 但内容相同，仍可使用
+    if index.get("sha256") == _file_hash(source):
+        index["mtime_ns"] = stat.st_mtime_ns
+        _save_index(index, index_path)
+        return index
+    return None
+
+
+def _save_index(index, index_path: Path):
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = index_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(str(tmp), str(index_path))
+    except OSError as e:
+        print(f"警告: 无法写入物品目录缓存: {e}")
+
+
+def build_index(source: Path):
+    content = source.read_text(encoding="utf-8")
+    items, cn_to_res = parse_initializer(content)
+    stat = source.stat()
+    return {
+        "version": INDEX_VERSION,
+        "source": str(source),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        "items": items,
+        "cn_to_res": cn_to_res,
+    }
+
+
+_catalogs = {}
+
+
+def load_catalog(source=None, index_path=None) -> ItemCatalog:
+    """加载物品目录；同一进程内只解析一次，跨进程通过索引缓存复用"""
+    source = Path(source).resolve() if source else INITIALIZER_PATH
+    if source in _catalogs:
+        return _catalogs[source]
+    index_path = Path(index_path) if index_path else INDEX_PATH
+    index = _load_index(source, index_path)
+    if index is None:
+        index = build_index(source)
+        _save_index(index, index_path)
+    catalog = ItemCatalog(index["items"], index["cn_to_res"])
+    _catalogs[source] = catalog
+    return catalog
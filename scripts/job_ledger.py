@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 资源生成任务账本（SQLite）。
+
+每个 (资源, 变体, 提供方) 一行，记录状态、尝试次数、耗时、字节数和错误信息。
+所有生成脚本共用 .gen_cache/ledger.sqlite3，运行中断 (崩溃、Ctrl-C、服务故障) 后:
+  --resume        只处理账本中尚未完成的任务 (未记录、失败或中断的)
+  --retry-failed  只重试失败或中断的任务
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from gen_cache import STATE_DIR
+from gen_metrics import metrics
+
+LEDGER_PATH = STATE_DIR / "ledger.sqlite3"
+
+# 任务状态
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"   # 已是最新，无需生成
+CACHED = "cached"     # 从生成缓存安装
+
+FINISHED_STATES = (DONE, SKIPPED, CACHED)
+# 中断的任务停留在 running 状态，与失败一样需要重试
+UNFINISHED_STATES = (FAILED, RUNNING)
+
+MODE_ALL = "all"
+MODE_RESUME = "resume"
+MODE_RETRY_FAILED = "retry-failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    asset       TEXT NOT NULL,
+    variant     TEXT NOT NULL,
+    provider    TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    latency_ms  INTEGER,
+    bytes       INTEGER,
+    error       TEXT,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (asset, variant, provider)
+)
+"""
+
+
+def add_ledger_arguments(parser):
+    """为生成脚本添加 --resume / --retry-failed 参数"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--resume", action="store_true",
+                       help="只处理账本中尚未完成的任务")
+    group.add_argument("--retry-failed", action="store_true",
+                       help="只重试账本中失败或中断的任务")
+
+
+def ledger_mode(args) -> str:
+    if getattr(args, "resume", False):
+        return MODE_RESUME
+    if getattr(args, "retry_failed", False):
+        return MODE_RETRY_FAILED
+    return MODE_ALL
+
+
+class JobLedger:
+    """线程安全的任务账本；多个进程可同时写同一个数据库"""
+
+    def __init__(self, path=None, mode: str = MODE_ALL):
+        self.path = Path(path) if path else LEDGER_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def status(self, asset: str, variant: str, provider: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM jobs WHERE asset = ? AND variant = ? AND provider = ?",
+                (asset, variant, provider),
+            ).fetchone()
+        return row[0] if row else None
+
+    def should_run(self, asset: str, variant: str, provider: str) -> bool:
+        """按运行模式判断这个任务本次是否需要处理"""
+        if self.mode == MODE_ALL:
+            return True
+        status = self.status(asset, variant, provider)
+        if self.mode == MODE_RESUME:
+            return status not in FINISHED_STATES
+        return status in UNFINISHED_STATES
+
+    def start(self, asset: str, variant: str, provider: str):
+        """标记任务开始，尝试次数 +1"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (asset, variant, provider, status, attempts, updated_at) "
+                "VALUES (?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (asset, variant, provider) DO UPDATE SET "
+                "status = excluded.status, attempts = attempts + 1, error = NULL, "
+                "updated_at = excluded.updated_at",
+                (asset, variant, provider, RUNNING, time.time()),
+            )
+            self._conn.commit()
+
+    def finish(self, asset: str, variant: str, provider: str, status: str,
+               latency: float = None, size_bytes: int = None, error: str = None):
+        """记录任务结果；latency 单位为秒"""
+        metrics.record_job(provider, variant, status, latency, size_bytes)
+        latency_ms = int(latency * 1000) if latency is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (asset, variant, provider, status, attempts, latency_ms, bytes, error, updated_at) "
+                "VALUES (?, ?, ?, ?, 0, ?, ?, ?, ?) "
+                "ON CONFLICT (asset, variant, provider) DO UPDATE SET "
+                "status = excluded.status, latency_ms = excluded.latency_ms, bytes = excluded.bytes, "
+                "error = excluded.error, updated_at = excluded.updated_at",
+                (asset, variant, provider, status, latency_ms, size_bytes,
+                 error[:500] if error else None, time.time()),
+            )
+            self._conn.commit()
+
+    def merge_from(self, path) -> int:
+        """合并另一个账本 (例如其他机器上的分片)，同一任务保留更新时间较新的记录；返回写入的行数"""
+        with self._lock:
+            self._conn.execute("ATTACH DATABASE ? AS other", (str(path),))
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO jobs (asset, variant, provider, status, attempts, latency_ms, bytes, error, updated_at) "
+                    "SELECT asset, variant, provider, status, attempts, latency_ms, bytes, error, updated_at "
+                    "FROM other.jobs WHERE true "
+                    "ON CONFLICT (asset, variant, provider) DO UPDATE SET "
+                    "status = excluded.status, attempts = excluded.attempts, latency_ms = excluded.latency_ms, "
+                    "bytes = excluded.bytes, error = excluded.error, updated_at = excluded.updated_at "
+                    "WHERE excluded.updated_at > jobs.updated_at"
+                )
+                merged = cursor.rowcount
+                self._conn.commit()
+            finally:
+                self._conn.execute("DETACH DATABASE other")
+        return merged
+
+    def latencies(self, provider: str) -> dict:
+        """资源 -> 该提供方最近一次记录的耗时 (毫秒)，同一资源多个变体取最大值"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT asset, MAX(latency_ms) FROM jobs "
+                "WHERE provider = ? AND latency_ms IS NOT NULL GROUP BY asset",
+                (provider,),
+            ).fetchall()
+        return dict(rows)
+
+    def summary(self, provider: str = None):
+        """按状态统计任务数"""
+        query = "SELECT status, COUNT(*) FROM jobs"
+        params = ()
+        if provider:
+            query += " WHERE provider = ?"
+            params = (provider,)
+        with self._lock:
+            rows = self._conn.execute(query + " GROUP BY status", params).fetchall()
+        return dict(rows)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 按优先级排列生成任务。
+
+生成脚本原来按目录顺序处理物品，运行被中断或额度用完时，排在最后的分类什么都拿不到。
+调度器给每个任务一个排序键，按 order 中的顺序逐项比较:
+  state    资源状态: 缺失 < 只有占位图 < 已有成品图 (重新生成)
+  release  下一个版本要发布的分类优先，按 release 列表中的顺序
+  cost     预计成本低的优先: 生成脚本给出的估计 (例如语音的文本长度)，
+           否则用账本中该资源上次的耗时，没有记录的按中位数
+全部相同时保持原来的目录顺序。默认值在 scripts/schedule.json 中配置:
+  {"order": ["state", "release", "cost"], "release": ["animals", "fruits"]}
+命令行的 --release 覆盖配置中的发布分类，--catalog-order 恢复目录顺序。
+--limit 要在排序之后用 limit_assets() 截取，才能拿到最要紧的资源。
+
+用法:
+    from job_scheduler import JobScheduler, add_schedule_arguments
+    add_schedule_arguments(parser)
+    scheduler = JobScheduler.from_args(args, cache, ledger, provider)
+    items = scheduler.order(items, asset=lambda item: item["res_name"],
+                            output_path=lambda item: OUTPUT_DIR / f"{item['res_name']}.png")
+"""
+
+import json
+import statistics
+from pathlib import Path
+
+from gen_cache import PLACEHOLDER_SOURCE
+from item_catalog import load_catalog
+
+SCHEDULE_PATH = Path(__file__).resolve().parent / "schedule.json"
+
+# 资源状态，数值越小越先处理
+MISSING = 0
+PLACEHOLDER = 1
+GENERATED = 2
+STATE_NAMES = {MISSING: "missing", PLACEHOLDER: "placeholder", GENERATED: "generated"}
+
+CRITERIA = ("state", "release", "cost")
+DEFAULT_SCHEDULE = {"order": list(CRITERIA), "release": []}
+
+# 系统音效等不属于任何物品分类的资源
+SYSTEM_CATEGORY = "system"
+
+
+def load_schedule(path=None) -> dict:
+    """读取调度配置，缺少的项使用默认值"""
+    path = Path(path) if path else SCHEDULE_PATH
+    schedule = dict(DEFAULT_SCHEDULE)
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            schedule.update(json.load(f))
+    unknown = [name for name in schedule["order"] if name not in CRITERIA]
+    if unknown:
+        raise ValueError(f"{path}: 未知的排序依据 {unknown}，可选 {list(CRITERIA)}")
+    return schedule
+
+
+def add_schedule_arguments(parser):
+    """为生成脚本添加 --release / --catalog-order 参数"""
+    parser.add_argument("--release", action="append", metavar="CATEGORY",
+                        help="优先生成下一个版本要发布的分类 (分类标识或 system，可重复；覆盖 schedule.json)")
+    parser.add_argument("--catalog-order", action="store_true",
+                        help="按目录顺序处理，不做优先级排序")
+
+
+class JobScheduler:
+    """按 (资源状态, 发布分类, 成本) 排列任务；排序是稳定的"""
+
+    def __init__(self, cache, ledger=None, provider: str = None, release=None, order=None, enabled=True):
+        schedule = load_schedule()
+        self.cache = cache
+        self.ledger = ledger
+        self.provider = provider
+        self.release = list(release if release is not None else schedule["release"])
+        self.criteria = list(order if order is not None else schedule["order"])
+        self.enabled = enabled
+        self.categories = {item["res_name"]: item["category_slug"] for item in load_catalog().items}
+        # 最近一次 order() 中各状态的任务数
+        self.counts = {}
+
+    @classmethod
+    def from_args(cls, args, cache, ledger=None, provider: str = None):
+        return cls(cache, ledger, provider, release=args.release, enabled=not args.catalog_order)
+
+    def asset_state(self, output_path) -> int:
+        if self.cache.installed_file(output_path) is None:
+            return MISSING
+        record = self.cache.record_of(output_path)
+        if record is not None and record.get("source") == PLACEHOLDER_SOURCE:
+            return PLACEHOLDER
+        return GENERATED
+
+    def release_rank(self, asset: str) -> int:
+        """在发布列表中的位置；不在列表中的排在最后"""
+        category = self.categories.get(asset, SYSTEM_CATEGORY)
+        try:
+            return self.release.index(category)
+        except ValueError:
+            return len(self.release)
+
+    def _history_costs(self, assets):
+        """账本中各资源上次的耗时 (毫秒)，没有记录的取中位数"""
+        if self.ledger is None or self.provider is None:
+            return {asset: 0 for asset in assets}
+        latencies = self.ledger.latencies(self.provider)
+        default = statistics.median(latencies.values()) if latencies else 0
+        return {asset: latencies.get(asset, default) for asset in assets}
+
+    def order(self, jobs, asset, output_path, cost=None):
+        """返回排好序的新列表。asset / output_path / cost 是从任务取值的函数"""
+        jobs = list(jobs)
+        states = [self.asset_state(output_path(job)) for job in jobs]
+        self.counts = {name: states.count(state) for state, name in STATE_NAMES.items()}
+        if not self.enabled:
+            return jobs
+
+        assets = [asset(job) for job in jobs]
+        if cost is not None:
+            costs = [cost(job) for job in jobs]
+        else:
+            history = self._history_costs(set(assets))
+            costs = [history[name] for name in assets]
+        values = {
+            "state": states,
+            "release": [self.release_rank(name) for name in assets],
+            "cost": costs,
+        }
+        keys = [tuple(values[name][i] for name in self.criteria) for i in range(len(jobs))]
+        ranked = sorted(range(len(jobs)), key=keys.__getitem__)
+        return [jobs[i] for i in ranked]
+
+
+def limit_assets(jobs, asset, limit: int, counted=None):
+    """按当前顺序保留前 limit 个资源的全部任务 (同一资源的多个片段算一个)。
+
+    counted(job) 为假的任务 (例如系统音效) 不占名额，总是保留；limit 不大于 0 时不截取。
+    """
+    jobs = list(jobs)
+    if not limit or limit <= 0:
+        return jobs
+    kept = set()
+    result = []
+    for job in jobs:
+        if counted is not None and not counted(job):
+            result.append(job)
+            continue
+        name = asset(job)
+        if name not in kept:
+            if len(kept) >= limit:
+                continue
+            kept.add(name)
+        result.append(job)
+    return result
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 合并多台机器分片生成 (--shard i/N) 的结果。
+
+每台机器在自己的工作副本中运行生成脚本，完成后把整个工作副本 (至少 app/src/main/res、
+.gen_cache 和 generated_candidates) 拷回，再在主工作副本中运行本脚本:
+  - 按各分片 .gen_cache/installed.sqlite3 中的记录，从分片的缓存对象安装资源，并登记到本地缓存
+    (本地已有相同结果时跳过；分片中的占位图不会覆盖本地的成品图)
+  - 分片缓存中本地没有的对象全部复制过来 (未安装的变体以后可以直接从缓存安装)
+  - generated_candidates/ 中的候选图复制过来
+  - 合并任务账本，同一任务保留更新时间较新的记录
+
+运行 (主工作副本根目录):
+    python scripts/merge_shards.py /mnt/host1/CloudItemApp /mnt/host2/CloudItemApp
+    python scripts/merge_shards.py shard_*/ --dry-run
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+from gen_cache import GenerationCache, REPO_ROOT, STATE_DIR, PLACEHOLDER_SOURCE, LEGACY_SOURCE
+from job_ledger import JobLedger
+from safe_io import copy_atomic
+
+CANDIDATES_DIR = REPO_ROOT / "generated_candidates"
+
+
+def merge_assets(shard_cache: GenerationCache, local: GenerationCache, dry_run: bool) -> dict:
+    counts = {"installed": 0, "unchanged": 0, "kept_local": 0, "missing": 0}
+    for asset, record in sorted(shard_cache.records().items()):
+        key, source = record.get("key"), record.get("source")
+        if key is None or source == LEGACY_SOURCE or Path(asset).is_absolute():
+            # 分片机器上原有的文件或仓库外的输出，不是这次生成的结果
+            continue
+        suffix = Path(record["file"]).suffix
+        src_object = shard_cache.object_path(key, suffix)
+        if not src_object.exists():
+            counts["missing"] += 1
+            print(f"  警告: 分片缓存中没有 {asset}{suffix} 的对象，跳过")
+            continue
+
+        output_path = REPO_ROOT / f"{asset}{suffix}"
+        local_record = local.record_of(output_path)
+        installed = local.installed_file(output_path)
+        if installed is not None and local_record and local_record.get("key") == key:
+            counts["unchanged"] += 1
+            continue
+        if (source == PLACEHOLDER_SOURCE and installed is not None
+                and (local_record is None or local_record.get("source") != PLACEHOLDER_SOURCE)):
+            counts["kept_local"] += 1
+            continue
+        if not dry_run:
+            local.adopt(src_object, key, output_path, source)
+        counts["installed"] += 1
+    return counts
+
+
+def copy_missing(src_dir: Path, dest_dir: Path, dry_run: bool) -> int:
+    """把 src_dir 中 dest_dir 没有的文件复制过去 (保持相对路径)"""
+    if not src_dir.is_dir():
+        return 0
+    copied = 0
+    for root, _, files in os.walk(str(src_dir)):
+        for name in files:
+            if name.startswith("."):
+                continue
+            src = Path(root) / name
+            dest = dest_dir / src.relative_to(src_dir)
+            if not dest.exists():
+                if not dry_run:
+                    copy_atomic(src, dest)
+                copied += 1
+    return copied
+
+
+def merge_shard(shard_root: Path, state_dir_name: str, local: GenerationCache, dry_run: bool):
+    shard_state = shard_root / state_dir_name
+    if not shard_state.is_dir():
+        print(f"跳过 {shard_root}: 没有 {state_dir_name}/")
+        return
+    print(f"合并 {shard_root}")
+    shard_cache = GenerationCache(shard_state)
+    counts = merge_assets(shard_cache, local, dry_run)
+    objects = copy_missing(shard_cache.objects_dir, local.objects_dir, dry_run)
+    candidates = copy_missing(shard_root / CANDIDATES_DIR.name, CANDIDATES_DIR, dry_run)
+
+    ledger_rows = 0
+    shard_ledger = shard_state / "ledger.sqlite3"
+    if shard_ledger.exists() and not dry_run:
+        with JobLedger() as ledger:
+            ledger_rows = ledger.merge_from(shard_ledger)
+
+    print(f"  安装: {counts['installed']}, 已相同: {counts['unchanged']}, "
+          f"保留本地成品: {counts['kept_local']}, 缺少对象: {counts['missing']}")
+    print(f"  缓存对象: {objects}, 候选图: {candidates}, 账本记录: {ledger_rows}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合并多台机器分片生成的资源、缓存和任务账本")
+    parser.add_argument("shards", nargs="+", type=Path, help="各分片机器的工作副本根目录")
+    parser.add_argument("--state-dir-name", default=STATE_DIR.name,
+                        help=f"分片中状态目录的名称 (默认 {STATE_DIR.name})")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不修改文件")
+    args = parser.parse_args()
+
+    local = GenerationCache()
+    for shard_root in args.shards:
+        if shard_root.resolve() == REPO_ROOT:
+            continue
+        merge_shard(shard_root, args.state_dir_name, local, args.dry_run)
+    print("完成! 建议接着运行 audit_resources.py 检查合并结果")
+
+
+if __name__ == "__main__":
+    main()
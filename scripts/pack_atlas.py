@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 按分类把物品图片打包成图集 (texture atlas) 并生成索引。
+
+ResourceUtils.kt 对每个物品用 getIdentifier 单独解码一张图，约 240 个资源。本脚本把每个分类
+的物品图缩放到 --cell 像素以内后装箱到少量图集 (每张不超过 --sheet-size)，写入
+app/src/main/assets/atlas/:
+  <分类>_<序号>.webp   图集
+  index.json           {"version", "cell", "sheets": [文件名...],
+                        "categories": {分类: [图集序号...]},
+                        "rects": {资源名: [图集序号, x, y, w, h]}}
+游戏界面按分类加载一张图集，用 rects 中的矩形绘制子图即可。
+
+图片来源与 export_densities.py 一致: res/drawable 中的图与 art_masters/ 中的母版二选一
+(重新生成的新图优先，缩小过的用母版)，都没有时取最高密度的 drawable-* 版本；
+VectorDrawable 占位图和缺图的物品不打包 (继续走 ResourceUtils 的回退)。
+分类内的图片和参数都没变时跳过该分类 (记录在 .gen_cache/atlas.json)。
+
+运行 (仓库根目录):
+    python scripts/pack_atlas.py
+    python scripts/pack_atlas.py --cell 192 --sheet-size 1024 --category fruits
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from gen_cache import REPO_ROOT, STATE_DIR, DENSITY_QUALIFIERS
+from item_catalog import DEFAULT_RES, load_catalog
+from postprocess_images import (
+    DRAWABLE_DIR, MASTERS_DIR, DEFAULT_QUALITY, PIL_AVAILABLE,
+    open_image, webp_options, prefer_master,
+)
+from safe_io import atomic_output, write_atomic
+
+if PIL_AVAILABLE:
+    from PIL import Image
+
+RES_DIR = DRAWABLE_DIR.parent
+ATLAS_DIR = REPO_ROOT / "app/src/main/assets/atlas"
+INDEX_NAME = "index.json"
+STATE_PATH = STATE_DIR / "atlas.json"
+INDEX_VERSION = 1
+
+DEFAULT_CELL = 256
+# 2048 是所有 GPU 都支持的纹理尺寸
+DEFAULT_SHEET_SIZE = 2048
+# 子图之间留空，避免缩放采样时混入相邻图片的像素
+PADDING = 2
+IMAGE_SUFFIXES = (".webp", ".png", ".jpg", ".jpeg")
+
+
+def _find_image(directory: Path, name: str):
+    for suffix in IMAGE_SUFFIXES:
+        path = directory / f"{name}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def find_source(name: str):
+    """资源名对应的母版位图，没有时返回 None"""
+    drawable = _find_image(DRAWABLE_DIR, name)
+    archived = _find_image(MASTERS_DIR, name)
+    if drawable is not None and archived is not None:
+        return archived if prefer_master(drawable, archived) else drawable
+    if drawable is not None or archived is not None:
+        return drawable or archived
+    for directory in (RES_DIR / f"drawable-{q}" for q in reversed(DENSITY_QUALIFIERS)):
+        path = _find_image(directory, name)
+        if path is not None:
+            return path
+    return None
+
+
+def category_sources(catalog, categories=None):
+    """分类 -> {资源名: 图片路径}，同一资源名只打包一次"""
+    result = {}
+    for slug, items in catalog.by_category.items():
+        if categories and slug not in categories:
+            continue
+        sources = {}
+        for item in items:
+            name = item["res_name"]
+            if name == DEFAULT_RES or name in sources:
+                continue
+            path = find_source(name)
+            if path is not None:
+                sources[name] = path
+        result[slug] = sources
+    return result
+
+
+def pack_shelves(sizes, sheet_size: int):
+    """货架式装箱: 按高度从大到小逐行摆放，放不下时换下一张图集
+
+    sizes: {资源名: (w, h)}；返回 ({资源名: (图集序号, x, y)}, 每张图集实际使用的 (w, h))
+    """
+    placements, sheets = {}, []
+    sheet, x, y, shelf_height, used_width = 0, PADDING, PADDING, 0, 0
+    for name, (w, h) in sorted(sizes.items(), key=lambda kv: (-kv[1][1], -kv[1][0], kv[0])):
+        if x + w + PADDING > sheet_size:
+            # 换行
+            x, y, shelf_height = PADDING, y + shelf_height + PADDING, 0
+        if y + h + PADDING > sheet_size:
+            # 换图集
+            sheets.append((used_width, y))
+            sheet, x, y, shelf_height, used_width = sheet + 1, PADDING, PADDING, 0, 0
+        placements[name] = (sheet, x, y)
+        x += w + PADDING
+        shelf_height = max(shelf_height, h)
+        used_width = max(used_width, x)
+    if placements:
+        sheets.append((used_width, y + shelf_height + PADDING))
+    return placements, sheets
+
+
+def pack_category(slug: str, sources: dict, cell: int, sheet_size: int,
+                  lossless: bool, quality: int) -> dict:
+    """在工作进程中打包一个分类，返回 {slug, sheets: [文件名...], rects: {资源名: [序号, x, y, w, h]}}"""
+    result = {"slug": slug, "sheets": [], "rects": {}, "status": "packed"}
+    try:
+        images = {}
+        for name, path in sources.items():
+            image = open_image(Path(path))
+            image.thumbnail((cell, cell), Image.Resampling.LANCZOS)
+            images[name] = image.convert("RGBA")
+        placements, sheets = pack_shelves({n: img.size for n, img in images.items()}, sheet_size)
+
+        canvases = [Image.new("RGBA", size, (0, 0, 0, 0)) for size in sheets]
+        for name, (sheet, x, y) in placements.items():
+            canvases[sheet].paste(images[name], (x, y))
+            result["rects"][name] = [sheet, x, y, images[name].size[0], images[name].size[1]]
+
+        options = webp_options(lossless, quality)
+        for index, canvas in enumerate(canvases):
+            file_name = f"{slug}_{index}.webp"
+            with atomic_output(ATLAS_DIR / file_name) as f:
+                canvas.save(f, "WEBP", **options)
+            result["sheets"].append(file_name)
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    return result
+
+
+def sources_signature(sources: dict, params: dict) -> dict:
+    files = {}
+    for name, path in sorted(sources.items()):
+        stat = path.stat()
+        files[name] = [path.name, stat.st_size, stat.st_mtime_ns]
+    return {"files": files, "params": params}
+
+
+def load_state():
+    try:
+        with STATE_PATH.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(str(tmp), str(STATE_PATH))
+
+
+def write_index(state, cell: int):
+    """把各分类的打包结果合并成一个索引，图集序号为全局序号"""
+    index = {"version": INDEX_VERSION, "cell": cell, "sheets": [], "categories": {}, "rects": {}}
+    for slug in sorted(state):
+        packed = state[slug]
+        base = len(index["sheets"])
+        index["sheets"].extend(packed["sheets"])
+        index["categories"][slug] = list(range(base, base + len(packed["sheets"])))
+        for name, (sheet, x, y, w, h) in packed["rects"].items():
+            index["rects"][name] = [base + sheet, x, y, w, h]
+    data = json.dumps(index, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    write_atomic(ATLAS_DIR / INDEX_NAME, data.encode("utf-8"))
+    return index
+
+
+def remove_stale_sheets(state):
+    """删除不再被任何分类引用的旧图集 (分类图片变少后图集张数可能减少)"""
+    if not ATLAS_DIR.is_dir():
+        return
+    referenced = {name for packed in state.values() for name in packed["sheets"]}
+    for path in ATLAS_DIR.glob("*.webp"):
+        if path.name not in referenced:
+            path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按分类把物品图片打包成图集并生成索引")
+    parser.add_argument("--category", action="append", help="只打包指定分类 (可重复)")
+    parser.add_argument("--cell", type=int, default=DEFAULT_CELL, help=f"单个物品的最大边长 (默认 {DEFAULT_CELL})")
+    parser.add_argument("--sheet-size", type=int, default=DEFAULT_SHEET_SIZE,
+                        help=f"图集最大边长 (默认 {DEFAULT_SHEET_SIZE})")
+    parser.add_argument("--lossless", action="store_true", help="无损 WebP")
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY, help=f"有损 WebP 质量 (默认 {DEFAULT_QUALITY})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="并行进程数")
+    parser.add_argument("--force", action="store_true", help="忽略记录，全部重新打包")
+    args = parser.parse_args()
+
+    if not PIL_AVAILABLE:
+        print("错误: 需要 Pillow，请运行: pip install Pillow")
+        sys.exit(1)
+    if args.cell + 2 * PADDING > args.sheet_size:
+        print("错误: --cell 不能大于 --sheet-size")
+        sys.exit(1)
+
+    params = {"cell": args.cell, "sheet_size": args.sheet_size, "lossless": args.lossless,
+              "quality": None if args.lossless else args.quality}
+    state = {} if args.force else load_state()
+    # 参数变化后所有分类都要重新打包 (索引中的 cell 是全局的)
+    state = {slug: packed for slug, packed in state.items() if packed.get("signature", {}).get("params") == params}
+
+    by_category = category_sources(load_catalog(), set(args.category or ()))
+    pending = {}
+    for slug, sources in by_category.items():
+        signature = sources_signature(sources, params)
+        if not sources:
+            state.pop(slug, None)
+        elif state.get(slug, {}).get("signature") != signature:
+            pending[slug] = (sources, signature)
+    print(f"分类 {len(by_category)} 个，需要打包 {len(pending)} 个 (单图 {args.cell}px，图集 {args.sheet_size}px)")
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(pack_category, slug, {n: str(p) for n, p in sources.items()},
+                            args.cell, args.sheet_size, args.lossless, args.quality)
+            for slug, (sources, _) in pending.items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            slug = result["slug"]
+            if result["status"] == "failed":
+                failed.append(f"{slug}: {result['error']}")
+                state.pop(slug, None)
+                continue
+            state[slug] = {"sheets": result["sheets"], "rects": result["rects"],
+                           "signature": pending[slug][1]}
+            print(f"  {slug}: {len(result['rects'])} 张图 -> {len(result['sheets'])} 张图集")
+    save_state(state)
+
+    index = write_index(state, args.cell)
+    remove_stale_sheets(state)
+    print(f"完成! 图集: {len(index['sheets'])}, 物品: {len(index['rects'])}, 失败: {len(failed)}")
+    print(f"索引: {ATLAS_DIR / INDEX_NAME}")
+    for line in failed:
+        print(f"  - {line}")
+
+
+if __name__ == "__main__":
+    main()
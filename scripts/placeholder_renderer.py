@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 占位图渲染 (生成接口不可用时使用)。
+
+  - 渐变背景用 NumPy 一次算出整幅像素 (未安装 NumPy 时用 1 像素宽的渐变条拉伸)，
+    不再逐行 draw.line
+  - 字体路径只探测一次，每个字号在每个进程中只加载一次
+  - render_batch() 用进程池并行渲染整个目录的占位图
+
+三种样式:
+  card      浅灰底 + 边框 + 中文名/英文名/资源名 (generate_images_gemini.py --placeholder-only)
+  gradient  竖向渐变 + 居中文字 (generate_drawable_images.py 的离线占位图)
+  vector    Android VectorDrawable XML: 圆角边框 + 渐变 + 首字 (几百字节，任意密度都清晰，
+            不需要 Pillow)。VectorDrawable 不能显示文字，首字用 fontTools 取字形轮廓转成路径；
+            未安装 fontTools 或字体中没有该字时画一个通用图片图标
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from fontTools.pens.boundsPen import BoundsPen
+    from fontTools.pens.svgPathPen import SVGPathPen
+    from fontTools.pens.transformPen import TransformPen
+    from fontTools.ttLib import TTFont
+    FONTTOOLS_AVAILABLE = True
+except ImportError:
+    FONTTOOLS_AVAILABLE = False
+
+from safe_io import atomic_output, write_atomic
+
+# 常见的 CJK 字体路径 (Linux / macOS / Windows)，按顺序取第一个存在的
+FONT_PATHS = [
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "C:/Windows/Fonts/msyhbd.ttc",
+    "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/liberation/LiberationSans-Bold.ttf",
+]
+
+CARD_BACKGROUND = (240, 240, 240)
+# 与原离线占位图相同的渐变: 顶部 (180, 210, 200) -> 底部 (255, 170, 180)
+GRADIENT_TOP = (180, 210, 200)
+GRADIENT_BOTTOM = (255, 170, 180)
+
+# VectorDrawable 占位图: 视口固定为 512x512，android:width/height 取渲染尺寸 (dp)
+VECTOR_VIEWPORT = 512
+VECTOR_FRAME_INSET = 16
+VECTOR_FRAME_RADIUS = 64
+VECTOR_FRAME_STROKE = (200, 200, 200)
+VECTOR_TEXT_COLOR = (50, 50, 50)
+# 首字的字号 (占视口的比例)
+VECTOR_GLYPH_SCALE = 0.5
+# 没有可用字形时的图片图标 (山 + 太阳)
+VECTOR_FALLBACK_ICON = (
+    "M144,352L224,240L280,312L320,264L368,352Z"
+    "M312,184a24,24 0,1 0,48 0a24,24 0,1 0,-48 0Z"
+)
+
+
+@lru_cache(maxsize=None)
+def find_font_path():
+    for path in FONT_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@lru_cache(maxsize=None)
+def load_font(size: int):
+    """加载指定字号的字体；找不到可用字体时使用 Pillow 默认字体"""
+    path = find_font_path()
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=8)
+def _gradient(size, top, bottom):
+    width, height = size
+    if NUMPY_AVAILABLE:
+        t = np.linspace(0.0, 1.0, height, endpoint=False, dtype=np.float32)[:, None]
+        column = np.asarray(top, np.float32) + t * (np.asarray(bottom, np.float32) - np.asarray(top, np.float32))
+        pixels = np.broadcast_to(column[:, None, :], (height, width, 3)).astype(np.uint8)
+        return Image.fromarray(pixels, "RGB")
+    strip = Image.new("RGB", (1, height))
+    strip.putdata([
+        tuple(int(a + (b - a) * y / height) for a, b in zip(top, bottom))
+        for y in range(height)
+    ])
+    return strip.resize((width, height), Image.NEAREST)
+
+
+def gradient(size, top=GRADIENT_TOP, bottom=GRADIENT_BOTTOM):
+    """竖向线性渐变背景 (返回副本，可直接在上面绘制)"""
+    return _gradient(tuple(size), tuple(top), tuple(bottom)).copy()
+
+
+def draw_centered(draw, center, text, font, fill):
+    """以 center 为中心绘制文字 (用 textbbox 计算，默认位图字体也适用)"""
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    x = center[0] - (right - left) // 2 - left
+    y = center[1] - (bottom - top) // 2 - top
+    draw.text((x, y), text, fill=fill, font=font)
+
+
+def render_card(item, size=(512, 512)):
+    """浅灰底卡片: 中文名、英文名和资源名"""
+    width, height = size
+    img = Image.new("RGB", size, color=CARD_BACKGROUND)
+    draw = ImageDraw.Draw(img)
+    font_large = load_font(80 * width // 512)
+    font_small = load_font(40 * width // 512)
+    inset = 20 * width // 512
+    draw.rectangle([inset, inset, width - inset, height - inset],
+                   outline=(200, 200, 200), width=max(1, 5 * width // 512))
+    center = width // 2
+    draw_centered(draw, (center, height * 200 // 512), item["name_cn"], font_large, (50, 50, 50))
+    draw_centered(draw, (center, height * 300 // 512), item["name_en"], font_small, (100, 100, 100))
+    draw_centered(draw, (center, height * 450 // 512), f"ID: {item['res_name']}", font_small, (180, 180, 180))
+    return img
+
+
+def render_gradient(text: str, size=(512, 512)):
+    """竖向渐变背景 + 居中文字"""
+    img = gradient(size)
+    draw = ImageDraw.Draw(img)
+    draw_centered(draw, (size[0] // 2, size[1] // 2), text, load_font(32), (0, 0, 0))
+    return img
+
+
+def save_png(img, output_path):
+    with atomic_output(output_path) as f:
+        img.save(f, "PNG")
+
+
+@lru_cache(maxsize=None)
+def load_outline_font():
+    """用 fontTools 打开字体 (表按需读取)；没有 fontTools 或字体时返回 None"""
+    path = find_font_path()
+    if not FONTTOOLS_AVAILABLE or not path:
+        return None
+    try:
+        return TTFont(path, fontNumber=0, lazy=True)
+    except Exception:
+        return None
+
+
+def _number(value: float) -> str:
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def glyph_path(text: str, center: float, em_size: float):
+    """把文字的字形轮廓转换为以 center 为中心的 SVG 路径数据；字体缺字时返回 None"""
+    font = load_outline_font()
+    if font is None or not text:
+        return None
+    cmap = font.getBestCmap()
+    if any(ord(ch) not in cmap for ch in text):
+        return None
+    glyph_set = font.getGlyphSet()
+
+    # 先按字宽排版，求整体包围盒
+    placements, advance = [], 0
+    bounds = BoundsPen(glyph_set)
+    for ch in text:
+        name = cmap[ord(ch)]
+        glyph_set[name].draw(TransformPen(bounds, (1, 0, 0, 1, advance, 0)))
+        placements.append((name, advance))
+        advance += glyph_set[name].width
+    if bounds.bounds is None:
+        return None
+    x_min, y_min, x_max, y_max = bounds.bounds
+
+    # 字体坐标 y 向上，视口 y 向下；过宽的文字按宽度缩小
+    scale = em_size / font["head"].unitsPerEm
+    scale = min(scale, 1.6 * em_size / max(x_max - x_min, 1))
+    mid_x, mid_y = (x_min + x_max) / 2, (y_min + y_max) / 2
+    pen = SVGPathPen(glyph_set, ntos=_number)
+    for name, offset in placements:
+        transform = (scale, 0, 0, -scale, center + (offset - mid_x) * scale, center + mid_y * scale)
+        glyph_set[name].draw(TransformPen(pen, transform))
+    return pen.getCommands() or None
+
+
+def vector_initials(content):
+    """首字候选: 物品取中文名首字、英文名首字母；文字取首字符"""
+    if isinstance(content, dict):
+        return [content["name_cn"][:1], content["name_en"][:1].upper()]
+    return [str(content).strip()[:1].upper()]
+
+
+def _argb(rgb) -> str:
+    return "#FF" + "".join(f"{c:02X}" for c in rgb)
+
+
+def _rounded_rect(inset: float, radius: float, side: float) -> str:
+    far = side - inset
+    r = _number(radius)
+    return (
+        f"M{_number(inset + radius)},{_number(inset)}H{_number(far - radius)}"
+        f"A{r},{r} 0,0 1,{_number(far)},{_number(inset + radius)}V{_number(far - radius)}"
+        f"A{r},{r} 0,0 1,{_number(far - radius)},{_number(far)}H{_number(inset + radius)}"
+        f"A{r},{r} 0,0 1,{_number(inset)},{_number(far - radius)}V{_number(inset + radius)}"
+        f"A{r},{r} 0,0 1,{_number(inset + radius)},{_number(inset)}Z"
+    )
+
+
+def render_vector(candidates, size=(512, 512)) -> str:
+    """VectorDrawable XML: 渐变圆角卡片 + 首字轮廓 (依次尝试候选文字)"""
+    side = VECTOR_VIEWPORT
+    frame = _rounded_rect(VECTOR_FRAME_INSET, VECTOR_FRAME_RADIUS, side)
+    label = None
+    for text in candidates:
+        label = glyph_path(text, side / 2, side * VECTOR_GLYPH_SCALE)
+        if label:
+            break
+    label = label or VECTOR_FALLBACK_ICON
+    # 渐变填充需要 API 24+ (minSdk 26)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<vector xmlns:android="http://schemas.android.com/apk/res/android"\n'
+        '    xmlns:aapt="http://schemas.android.com/aapt"\n'
+        f'    android:width="{size[0]}dp" android:height="{size[1]}dp"\n'
+        f'    android:viewportWidth="{side}" android:viewportHeight="{side}">\n'
+        f'    <path android:pathData="{frame}"\n'
+        f'        android:strokeColor="{_argb(VECTOR_FRAME_STROKE)}" android:strokeWidth="8">\n'
+        '        <aapt:attr name="android:fillColor">\n'
+        f'            <gradient android:type="linear" android:startX="{side // 2}" android:startY="0"\n'
+        f'                android:endX="{side // 2}" android:endY="{side}"\n'
+        f'                android:startColor="{_argb(GRADIENT_TOP)}" android:endColor="{_argb(GRADIENT_BOTTOM)}"/>\n'
+        '        </aapt:attr>\n'
+        '    </path>\n'
+        f'    <path android:fillColor="{_argb(VECTOR_TEXT_COLOR)}" android:pathData="{label}"/>\n'
+        '</vector>\n'
+    )
+
+
+def save_vector(xml: str, output_path):
+    write_atomic(output_path, xml.encode("utf-8"))
+
+
+def render_job(job):
+    """渲染并保存一个占位图: job = (样式, 内容, 尺寸, 输出路径)；返回 (输出路径, 错误或 None)"""
+    style, content, size, output_path = job
+    try:
+        if style == "vector":
+            save_vector(render_vector(vector_initials(content), size), output_path)
+            return output_path, None
+        if style == "card":
+            img = render_card(content, size)
+        else:
+            img = render_gradient(content, size)
+        save_png(img, output_path)
+        return output_path, None
+    except Exception as e:
+        return output_path, str(e)
+
+
+def render_batch(jobs, workers=None):
+    """用进程池渲染一批占位图，按输入顺序返回 [(输出路径, 错误或 None), ...]
+
+    card / gradient 样式需要 Pillow，未安装时在提交任何任务前抛出 RuntimeError。
+    """
+    jobs = list(jobs)
+    if not PIL_AVAILABLE and any(job[0] != "vector" for job in jobs):
+        raise RuntimeError("渲染 card/gradient 占位图需要 Pillow，请运行: pip install Pillow (或改用 vector 样式)")
+    if len(jobs) <= 1:
+        return [render_job(job) for job in jobs]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # 分块提交，减少进程间通信次数
+        chunksize = max(1, len(jobs) // (workers * 4))
+        return list(executor.map(render_job, jobs, chunksize=chunksize))
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 音频后处理：去首尾静音 + 响度统一 + 单声道转码。
+
+res/raw 中的音频来自 Edge-TTS、gTTS 和 OpenAI，响度、首尾静音和码率各不相同；
+AudioManager.kt 用 MediaPlayer.create 直接播放，开头的静音就是点击后的等待时间。
+本脚本用进程池并行调用 ffmpeg 处理所有片段:
+  1. silenceremove 去掉开头和结尾的静音
+  2. 两遍 loudnorm，统一到 -16 LUFS / -1.5 dBTP
+  3. 转为单声道 Ogg，默认 Vorbis (所有 Android 版本可播放)；
+     --codec opus 体积更小，但 Ogg 封装的 Opus 需要 Android 10+ (当前 minSdk 为 26)
+
+Android 不允许同名不同扩展名的资源，转码成功后原文件移到仓库根目录的 audio_masters/。
+处理结果按 (源文件哈希, 参数) 缓存在 .gen_cache/audio_post/，源文件和参数都没变的片段
+直接跳过或从缓存安装；修改码率等参数后会从 audio_masters/ 中的原文件重新转码。
+
+运行 (仓库根目录，需要 ffmpeg):
+    python scripts/postprocess_audio.py
+    python scripts/postprocess_audio.py --bitrate 32k --workers 8
+    python scripts/postprocess_audio.py --codec opus      # 仅当 minSdk >= 29
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from gen_cache import REPO_ROOT, STATE_DIR, cache_key
+from safe_io import copy_atomic
+
+RAW_DIR = REPO_ROOT / "app/src/main/res/raw"
+MASTERS_DIR = REPO_ROOT / "audio_masters"
+OBJECTS_DIR = STATE_DIR / "audio_post"
+INDEX_PATH = STATE_DIR / "audio_post.json"
+
+SOURCE_SUFFIXES = (".mp3", ".wav")
+CODECS = {"vorbis": "libvorbis", "opus": "libopus"}
+DEFAULT_BITRATE = "48k"
+# Edge-TTS 输出 24kHz，Opus 也支持该采样率
+SAMPLE_RATE = 24000
+
+LOUDNESS_TARGET = {"I": -16.0, "TP": -1.5, "LRA": 11.0}
+# 低于 -50dB 视为静音，保留 20ms 避免切掉辅音起始
+TRIM_FILTER = (
+    "silenceremove=start_periods=1:start_threshold=-50dB:start_silence=0.02,"
+    "areverse,"
+    "silenceremove=start_periods=1:start_threshold=-50dB:start_silence=0.02,"
+    "areverse"
+)
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _loudnorm(extra: str = "") -> str:
+    target = ":".join(f"{k}={v}" for k, v in LOUDNESS_TARGET.items())
+    return f"loudnorm={target}{extra}"
+
+
+def measure_loudness(source: Path) -> dict:
+    """第一遍: 测量去静音后的响度"""
+    proc = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-nostats", "-i", str(source),
+         "-af", f"{TRIM_FILTER},{_loudnorm(':print_format=json')}", "-f", "null", "-"],
+        capture_output=True, text=True, check=True,
+    )
+    match = re.search(r"\{[^{}]*\"input_i\"[^{}]*\}", proc.stderr)
+    if not match:
+        raise RuntimeError("无法解析 loudnorm 测量结果")
+    return json.loads(match.group(0))
+
+
+def encode_clip(source: Path, target: Path, codec: str, bitrate: str):
+    """第二遍: 按测量值线性归一化并转码为单声道 Ogg"""
+    measured = measure_loudness(source)
+    extra = (
+        f":measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+        f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+        f":offset={measured['target_offset']}:linear=true"
+    )
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.part")
+    try:
+        subprocess.run(
+            ["ffmpeg", "-hide_banner", "-nostats", "-loglevel", "error", "-y", "-i", str(source),
+             "-af", f"{TRIM_FILTER},{_loudnorm(extra)}",
+             "-ac", "1", "-ar", str(SAMPLE_RATE), "-c:a", CODECS[codec], "-b:a", bitrate,
+             "-map_metadata", "-1", "-f", "ogg", str(tmp)],
+            capture_output=True, text=True, check=True,
+        )
+        os.replace(str(tmp), str(target))
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def process_clip(name: str, source: str, params: dict) -> dict:
+    """在工作进程中处理单个片段，返回 {name, key, source_sha256, status, before, after}"""
+    source = Path(source)
+    result = {"name": name, "status": "encoded", "before": source.stat().st_size}
+    try:
+        result["source_sha256"] = file_hash(source)
+        key = cache_key(source=result["source_sha256"], **params)
+        result["key"] = key
+        obj = OBJECTS_DIR / key[:2] / f"{key}.ogg"
+        if obj.exists():
+            result["status"] = "cached"
+        else:
+            encode_clip(source, obj, params["codec"], params["bitrate"])
+        copy_atomic(obj, RAW_DIR / f"{name}.ogg")
+        result["after"] = obj.stat().st_size
+    except subprocess.CalledProcessError as e:
+        result["status"] = "failed"
+        result["error"] = (e.stderr or "").strip()[-300:]
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    return result
+
+
+def load_index():
+    try:
+        with INDEX_PATH.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index(index):
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_PATH.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(str(tmp), str(INDEX_PATH))
+
+
+def _clips(directory: Path):
+    if not directory.is_dir():
+        return {}
+    return {p.stem: p for p in directory.iterdir() if p.suffix.lower() in SOURCE_SUFFIXES}
+
+
+def find_pending(params: dict, index: dict):
+    """需要处理的片段: res/raw 中新生成的原始音频，以及参数变化后需要重新转码的归档原文件"""
+    pending = {}
+    for name, path in _clips(MASTERS_DIR).items():
+        entry = index.get(name)
+        installed = RAW_DIR / f"{name}.ogg"
+        if not entry or entry.get("params") != params or not installed.exists():
+            pending[name] = path
+    # res/raw 中的原始音频总是最新的 (生成器重新生成后会删除旧的 .ogg)
+    pending.update(_clips(RAW_DIR))
+    return pending
+
+
+def retire_source(source: Path):
+    """把转码过的原文件移出 res/raw，避免与 .ogg 资源重名"""
+    if source.parent != RAW_DIR:
+        return
+    MASTERS_DIR.mkdir(parents=True, exist_ok=True)
+    for old in MASTERS_DIR.glob(f"{source.stem}.*"):
+        old.unlink()
+    shutil.move(str(source), str(MASTERS_DIR / source.name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="去静音、统一响度并把 res/raw 音频转为单声道 Ogg")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="vorbis",
+                        help="vorbis (默认，所有版本) 或 opus (需要 Android 10+)")
+    parser.add_argument("--bitrate", default=DEFAULT_BITRATE, help=f"码率 (默认 {DEFAULT_BITRATE})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="并行进程数")
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        print("错误: 需要 ffmpeg，请先安装并加入 PATH")
+        sys.exit(1)
+    if args.codec == "opus":
+        print("注意: Ogg 封装的 Opus 需要 Android 10+，请确认 minSdk >= 29")
+
+    params = {
+        "codec": args.codec, "bitrate": args.bitrate, "sample_rate": SAMPLE_RATE,
+        "loudness": LOUDNESS_TARGET, "trim": TRIM_FILTER,
+    }
+    index = load_index()
+    pending = find_pending(params, index)
+    print(f"待处理音频: {len(pending)} 个 ({RAW_DIR})")
+
+    counts = {"encoded": 0, "cached": 0, "failed": 0}
+    before = after = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(process_clip, name, str(path), params): path
+            for name, path in pending.items()
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            counts[result["status"]] += 1
+            if result["status"] == "failed":
+                print(f"  失败 {result['name']}: {result['error']}")
+                continue
+            retire_source(futures[future])
+            index[result["name"]] = {
+                "source_sha256": result["source_sha256"],
+                "key": result["key"],
+                "params": params,
+            }
+            before += result["before"]
+            after += result["after"]
+    save_index(index)
+
+    print(f"完成! 转码: {counts['encoded']}, 缓存命中: {counts['cached']}, 失败: {counts['failed']}")
+    if before:
+        print(f"总大小: {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB "
+              f"(减少 {100 * (before - after) / before:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
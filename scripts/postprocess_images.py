@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 图片后处理：缩放 + 去元数据 + WebP 编码。
+
+生成接口返回的是 1024x1024 PNG，而 App 中的物品卡片远小于此。本脚本用进程池并行处理
+res/drawable 下所有 PNG/JPG：缩小到目标尺寸、去掉 EXIF/ICC 等元数据、编码为无损或
+指定质量的有损 WebP (minSdk 26 完整支持带透明通道的 WebP)，最后报告处理前后的大小。
+
+Android 不允许同名不同扩展名的资源，所以 WebP 写入成功后会移走原文件：
+默认归档到仓库根目录的 art_masters/ (供以后重新导出)，--discard-masters 则直接删除。
+转换后体积反而变大且无需缩放的文件保持原样。
+
+运行 (仓库根目录):
+    python scripts/postprocess_images.py                 # 512px，有损 WebP 质量 85
+    python scripts/postprocess_images.py --lossless
+    python scripts/postprocess_images.py --size 384 --quality 80 --workers 4
+    python scripts/postprocess_images.py --dry-run       # 只统计，不写文件
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from gen_cache import REPO_ROOT
+from safe_io import atomic_output
+
+DRAWABLE_DIR = REPO_ROOT / "app/src/main/res/drawable"
+MASTERS_DIR = REPO_ROOT / "art_masters"
+
+# 与 generate_images_gemini.py 的 TARGET_SIZE 一致
+DEFAULT_SIZE = 512
+DEFAULT_QUALITY = 85
+SOURCE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+
+def find_sources(directory: Path):
+    """需要处理的位图；九宫格图 (.9.png) 的边框像素不能缩放，跳过"""
+    return sorted(
+        p for p in directory.iterdir()
+        if p.suffix.lower() in SOURCE_SUFFIXES and not p.name.endswith(".9.png")
+    )
+
+
+def open_image(path: Path):
+    """读入图片并转换为 RGB/RGBA，去掉 EXIF/ICC 等元数据"""
+    with Image.open(path) as image:
+        image.load()
+        mode = "RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB"
+        image = image.convert(mode)
+    # 不传 exif/icc_profile，清空 info 以免编码器带上原图的元数据
+    image.info.clear()
+    return image
+
+
+def webp_options(lossless: bool, quality: int) -> dict:
+    options = {"lossless": True, "quality": 100} if lossless else {"quality": quality}
+    options["method"] = 6
+    return options
+
+
+def convert_image(source: str, size: int, lossless: bool, quality: int, dry_run: bool) -> dict:
+    """在工作进程中处理单个文件，返回 {file, before, after, resized, status}"""
+    source = Path(source)
+    target = source.with_suffix(".webp")
+    result = {"file": source.name, "before": source.stat().st_size, "after": None,
+              "resized": False, "status": "converted"}
+    try:
+        image = open_image(source)
+        if max(image.size) > size:
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            result["resized"] = True
+        options = webp_options(lossless, quality)
+
+        if dry_run:
+            from io import BytesIO
+            buffer = BytesIO()
+            image.save(buffer, "WEBP", **options)
+            result["after"] = buffer.tell()
+        else:
+            with atomic_output(target) as f:
+                image.save(f, "WEBP", **options)
+            result["after"] = target.stat().st_size
+
+        if result["after"] >= result["before"] and not result["resized"]:
+            # 没有收益，保留原文件
+            if not dry_run:
+                target.unlink()
+            result["after"] = result["before"]
+            result["status"] = "kept"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    return result
+
+
+def _pixels(path: Path) -> int:
+    with Image.open(path) as image:
+        return image.size[0] * image.size[1]
+
+
+def prefer_master(drawable: Path, archived: Path) -> bool:
+    """是否用 art_masters/ 中的归档代替 res/drawable 中的同名图
+
+    res/drawable 中的图至少与归档一样大时 (重新生成的新图) 用它；
+    比归档小时 (本脚本缩小过的) 用归档的原图。
+    """
+    return _pixels(archived) > _pixels(drawable)
+
+
+def retire_master(source: Path, discard: bool):
+    """移走已转换的原图，避免与 WebP 资源重名"""
+    if discard:
+        source.unlink()
+        return
+    MASTERS_DIR.mkdir(parents=True, exist_ok=True)
+    # 同名旧母版 (可能是别的格式) 被新图取代
+    for old in MASTERS_DIR.glob(f"{source.stem}.*"):
+        old.unlink()
+    shutil.move(str(source), str(MASTERS_DIR / source.name))
+
+
+def print_report(results):
+    converted = [r for r in results if r["status"] == "converted"]
+    kept = [r for r in results if r["status"] == "kept"]
+    failed = [r for r in results if r["status"] == "failed"]
+    before = sum(r["before"] for r in results if r["status"] != "failed")
+    after = sum(r["after"] for r in results if r["status"] != "failed")
+
+    for r in sorted(converted, key=lambda r: r["before"] - r["after"], reverse=True)[:10]:
+        print(f"  {r['file']:<32} {r['before'] // 1024:>6} KB -> {r['after'] // 1024:>5} KB")
+    print(f"转换: {len(converted)}, 保持原样: {len(kept)}, 失败: {len(failed)}")
+    if before:
+        print(f"总大小: {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB "
+              f"(减少 {100 * (before - after) / before:.0f}%)")
+    for r in failed:
+        print(f"  失败 {r['file']}: {r['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="缩放并转换 res/drawable 图片为 WebP")
+    parser.add_argument("--dir", type=Path, default=DRAWABLE_DIR, help="图片目录")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help=f"最长边像素 (默认 {DEFAULT_SIZE})")
+    parser.add_argument("--lossless", action="store_true", help="无损 WebP")
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY, help=f"有损 WebP 质量 (默认 {DEFAULT_QUALITY})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="并行进程数")
+    parser.add_argument("--discard-masters", action="store_true", help="删除原图而不是归档到 art_masters/")
+    parser.add_argument("--dry-run", action="store_true", help="只统计转换效果，不修改文件")
+    parser.add_argument("--report", type=Path, help="把逐个文件的结果写入 JSON")
+    args = parser.parse_args()
+
+    if not PIL_AVAILABLE:
+        print("错误: 需要 Pillow，请运行: pip install Pillow")
+        sys.exit(1)
+
+    sources = find_sources(args.dir)
+    print(f"待处理图片: {len(sources)} 个 ({args.dir})")
+    if not sources:
+        return
+
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(convert_image, str(path), args.size, args.lossless,
+                            args.quality, args.dry_run): path
+            for path in sources
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            if result["status"] == "converted" and not args.dry_run:
+                retire_master(futures[future], args.discard_masters)
+            results.append(result)
+
+    print_report(results)
+    if args.report:
+        with args.report.open("w", encoding="utf-8") as f:
+            json.dump(sorted(results, key=lambda r: r["file"]), f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
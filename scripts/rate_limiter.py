@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 按提供方配置的自适应限速器（令牌桶）。
+
+取代各脚本中固定的 time.sleep：每个提供方有 每分钟请求数 和 最大并发 两个上限，
+遇到 HTTP 429 / 5xx 时按 Retry-After 暂停并把速率减半，之后成功的请求逐步恢复到上限。
+同一进程内所有图片和 TTS 调用共用 get_limiter(provider) 返回的实例。
+
+上限对同一台机器上的所有生成进程共同生效 (例如同时运行 -c animals 和 -c fruits):
+令牌桶状态 (令牌数、当前速率、暂停截止时间) 保存在 .gen_cache/quota/<提供方>.json，
+每次取令牌都在文件锁 (fcntl，Windows 上为 msvcrt) 内读写；并发名额是同目录下的
+N 个槽位锁文件，进程退出时操作系统自动释放。一个进程被限流后，其他进程也一起降速。
+
+上限可用环境变量覆盖，例如:
+    RATE_LIMIT_POLLINATIONS=120,6     # 每分钟 120 次，最多 6 个并发
+    RATE_LIMIT_OPENAI_IMAGES=10       # 只改每分钟请求数
+    CLOUDITEM_SHARED_QUOTA=0          # 只在本进程内限速
+
+用法:
+    limiter = get_limiter("pollinations")
+    with limiter.slot():                     # 线程 / 同步代码
+        response = urllib.request.urlopen(...)
+    async with limiter.async_slot():         # asyncio 代码
+        await communicate.save(path)
+代码块正常结束视为成功，抛出的异常会被解析出状态码和 Retry-After 用于调整速率。
+"""
+
+import asyncio
+import email.utils
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+from gen_cache import STATE_DIR
+from gen_metrics import metrics
+
+QUOTA_DIR = STATE_DIR / "quota"
+SHARED_QUOTA = os.getenv("CLOUDITEM_SHARED_QUOTA", "1") != "0"
+# 等待其他进程释放并发名额时的轮询间隔 (秒)
+SLOT_POLL_INTERVAL = 0.05
+
+# 提供方: (每分钟请求数, 最大并发)
+PROVIDER_LIMITS = {
+    "openai-images": (30, 4),
+    "gemini-images": (60, 4),
+    # 生成一张图要 10-30 秒，吞吐取决于并发数 (generate_images_free.py 的异步引擎)
+    "pollinations": (60, 16),
+    "edge-tts": (300, 8),
+    "openai-tts": (50, 8),
+    "gtts": (60, 2),
+}
+DEFAULT_LIMITS = (60, 4)
+
+# 被限流后速率的下限 (相对配置值)
+MIN_RATE_FACTOR = 0.1
+# 每次成功后恢复的速率 (相对配置值)
+RECOVERY_STEP = 0.05
+# 这些状态码表示服务过载，需要降速
+THROTTLE_STATUSES = (429, 502, 503, 504)
+
+
+def http_status(exc):
+    """尽量从各种 HTTP 库的异常中取出状态码 (requests / urllib / aiohttp / openai)"""
+    for attr in ("status", "status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    if response is not None:
+        for attr in ("status_code", "status"):
+            value = getattr(response, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def response_headers(exc):
+    """异常附带的响应头 (没有时返回 None)"""
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        response = getattr(exc, "response", None)
+        headers = getattr(response, "headers", None)
+    return headers
+
+
+def retry_after_seconds(headers):
+    """解析 Retry-After (秒数或 HTTP 日期)，无法解析时返回 None"""
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _lock(f, blocking=True) -> bool:
+    """对整个文件加排他锁；非阻塞模式下已被占用时返回 False"""
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            return True
+        except BlockingIOError:
+            return False
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.01)
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SharedQuota:
+    """多个进程共享的令牌桶状态和并发槽位"""
+
+    def __init__(self, provider: str, slots: int, directory=None):
+        directory = directory or QUOTA_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        name = provider.replace(":", "_").replace("/", "_")
+        self.path = directory / f"{name}.json"
+        self.slot_paths = [directory / f"{name}.slot{i}" for i in range(slots)]
+
+    @contextmanager
+    def state(self, default):
+        """在文件锁内读出状态，代码块结束后写回"""
+        with open(str(self.path), "a+", encoding="utf-8") as f:
+            _lock(f)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "null") or default
+                except ValueError:
+                    state = default
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                _unlock(f)
+
+    def try_acquire_slot(self):
+        """占用一个空闲槽位，返回持有锁的文件对象；全部被占用时返回 None"""
+        for path in self.slot_paths:
+            f = open(str(path), "a+b")
+            if _lock(f, blocking=False):
+                return f
+            f.close()
+        return None
+
+    @staticmethod
+    def release_slot(f):
+        try:
+            _unlock(f)
+        finally:
+            f.close()
+
+
+def _limits_from_env(provider):
+    rpm, concurrency = PROVIDER_LIMITS.get(provider, DEFAULT_LIMITS)
+    value = os.getenv("RATE_LIMIT_" + provider.upper().replace("-", "_").replace(":", "_"))
+    if value:
+        parts = value.split(",")
+        try:
+            rpm = float(parts[0])
+            if len(parts) > 1:
+                concurrency = int(parts[1])
+        except ValueError:
+            print(f"警告: 无法解析限速配置 {value!r}，使用默认值")
+    return rpm, concurrency
+
+
+class RateLimiter:
+    """令牌桶 + 并发上限，按服务端反馈自适应 (AIMD)；shared 时跨进程共享"""
+
+    def __init__(self, provider: str, requests_per_minute: float, max_concurrency: int, shared: bool = False):
+        self.provider = provider
+        self.max_rate = requests_per_minute / 60.0
+        self.rate = self.max_rate
+        self.max_concurrency = max(1, max_concurrency)
+        # 桶容量等于并发数，允许启动时并发请求同时发出
+        self.capacity = float(self.max_concurrency)
+        self._state = self._initial_state()
+        self._lock = threading.Lock()
+        self._thread_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._async_slots = {}
+        self._shared = None
+        if shared:
+            try:
+                self._shared = SharedQuota(provider, self.max_concurrency)
+            except OSError as e:
+                print(f"警告: 无法创建共享限速目录 ({e})，{provider} 只在本进程内限速")
+
+    def _initial_state(self):
+        return {"tokens": self.capacity, "updated": time.time(), "rate": self.max_rate, "blocked_until": 0.0}
+
+    @contextmanager
+    def _bucket(self):
+        """令牌桶状态: 本进程内存中的副本，或共享文件中的状态 (在文件锁内)"""
+        with self._lock:
+            if self._shared is None:
+                yield self._state
+                return
+            with self._shared.state(self._initial_state()) as state:
+                # 其他进程可能配置了更高的上限，按本进程的配置截断
+                state["rate"] = min(state["rate"], self.max_rate)
+                yield state
+                self.rate = state["rate"]
+
+    def reserve(self) -> float:
+        """预订一个令牌，返回需要等待的秒数"""
+        with self._bucket() as state:
+            now = time.time()
+            tokens = min(self.capacity, state["tokens"] + (now - state["updated"]) * state["rate"]) - 1.0
+            state["tokens"], state["updated"] = tokens, now
+            wait = -tokens / state["rate"] if tokens < 0 else 0.0
+            return max(wait, state["blocked_until"] - now)
+
+    def _reserve_timed(self) -> float:
+        """reserve() 并记录等待时间"""
+        wait = self.reserve()
+        metrics.observe("ratelimit_wait_seconds", wait, provider=self.provider)
+        return wait
+
+    def on_success(self):
+        with self._bucket() as state:
+            state["rate"] = min(self.max_rate, state["rate"] + self.max_rate * RECOVERY_STEP)
+            self.rate = state["rate"]
+
+    def on_throttle(self, retry_after=None):
+        """被限流或服务过载：速率减半，并按 Retry-After 暂停"""
+        with self._bucket() as state:
+            state["rate"] = max(self.max_rate * MIN_RATE_FACTOR, state["rate"] / 2.0)
+            self.rate = state["rate"]
+            pause = retry_after if retry_after is not None else 1.0 / state["rate"]
+            state["blocked_until"] = max(state["blocked_until"], time.time() + pause)
+        metrics.inc("throttled_total", provider=self.provider)
+        print(f"[限速] {self.provider} 被限流，速率降至 {self.rate * 60:.1f}/分钟，暂停 {pause:.1f}s")
+
+    def on_error(self, exc):
+        """根据异常调整速率；非限流类错误不影响速率"""
+        if http_status(exc) in THROTTLE_STATUSES:
+            self.on_throttle(retry_after_seconds(response_headers(exc)))
+
+    def _wait_shared_slot(self):
+        while True:
+            slot = self._shared.try_acquire_slot()
+            if slot is not None:
+                return slot
+            time.sleep(SLOT_POLL_INTERVAL)
+
+    async def _wait_shared_slot_async(self):
+        while True:
+            slot = self._shared.try_acquire_slot()
+            if slot is not None:
+                return slot
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+
+    @contextmanager
+    def slot(self):
+        """同步代码使用：等待令牌并占用一个并发名额"""
+        with self._thread_slots:
+            shared_slot = self._wait_shared_slot() if self._shared else None
+            try:
+                time.sleep(self._reserve_timed())
+                try:
+                    yield self
+                except Exception as e:
+                    self.on_error(e)
+                    raise
+                self.on_success()
+            finally:
+                if shared_slot is not None:
+                    SharedQuota.release_slot(shared_slot)
+
+    def _async_semaphore(self):
+        # asyncio.Semaphore 绑定事件循环，每个循环单独创建
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_slots.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_slots[loop] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def async_slot(self):
+        """asyncio 代码使用：等待令牌并占用一个并发名额"""
+        async with self._async_semaphore():
+            shared_slot = await self._wait_shared_slot_async() if self._shared else None
+            try:
+                await asyncio.sleep(self._reserve_timed())
+                try:
+                    yield self
+                except Exception as e:
+                    self.on_error(e)
+                    raise
+                self.on_success()
+            finally:
+                if shared_slot is not None:
+                    SharedQuota.release_slot(shared_slot)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> RateLimiter:
+    """返回该提供方在本进程内共享的限速器"""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            rpm, concurrency = _limits_from_env(provider)
+            limiter = RateLimiter(provider, rpm, concurrency, shared=SHARED_QUOTA)
+            _limiters[provider] = limiter
+        return limiter
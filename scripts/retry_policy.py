@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 统一的重试策略与按提供方的熔断器。
+
+  - 网络错误、超时、HTTP 408/425/429/5xx 视为临时错误，按指数退避 + 随机抖动重试，
+    服务端给出 Retry-After 时至少等待该时长
+  - 其他 4xx (参数错误、鉴权失败、内容审核等) 重试也不会成功，立即失败
+  - 同一提供方连续出现临时错误达到阈值后熔断，在冷却期内直接抛出 CircuitOpenError，
+    不再让每个任务都等满超时；冷却期过后只放行一个试探请求，成功即恢复，
+    试探结束前其他请求仍直接失败
+
+用法:
+    retry = RetryPolicy("pollinations")
+    data = retry.call(fetch, url)                 # 同步
+    ok = await retry.call_async(save, path)       # asyncio，传入返回协程的函数
+"""
+
+import asyncio
+import random
+import socket
+import threading
+import time
+import urllib.error
+
+from gen_metrics import metrics
+from rate_limiter import http_status, response_headers, retry_after_seconds
+from safe_io import IncompleteDownloadError
+
+# 只有连接失败、超时和下载中断是临时错误；其他 OSError (磁盘满、权限、文件不存在) 重试也不会成功
+_NETWORK_ERRORS = (ConnectionError, socket.timeout, TimeoutError, asyncio.TimeoutError, IncompleteDownloadError)
+try:
+    import aiohttp
+    _NETWORK_ERRORS += (aiohttp.ClientError,)
+except ImportError:
+    pass
+try:
+    import requests
+    _NETWORK_ERRORS += (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+except ImportError:
+    pass
+# urllib 把连接被拒、DNS 解析失败和连接超时包装成 URLError，原始异常在 reason 中
+_URL_ERROR_REASONS = (ConnectionError, socket.timeout, TimeoutError, socket.gaierror)
+
+RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+# 默认: 最多 4 次尝试，退避上限 30 秒
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+# 连续 5 次临时错误后熔断 60 秒
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 60.0
+
+
+class CircuitOpenError(Exception):
+    """提供方处于熔断状态，请求未发出"""
+
+
+def is_retryable(exc) -> bool:
+    """判断异常是否为值得重试的临时错误"""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status = http_status(exc)
+    if status is not None and status >= 400:
+        return status in RETRYABLE_STATUSES
+    if isinstance(exc, urllib.error.URLError) and not isinstance(exc, urllib.error.HTTPError):
+        return isinstance(exc.reason, _URL_ERROR_REASONS)
+    return isinstance(exc, _NETWORK_ERRORS)
+
+
+class CircuitBreaker:
+    """连续失败计数熔断器，线程安全"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, provider: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        # 半开状态下正在进行的试探请求的开始时间；None 表示没有
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """熔断期间抛出 CircuitOpenError；冷却期结束后进入半开状态，只放行一个试探请求"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - now
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"{self.provider} 已熔断，{remaining:.0f}s 后重试")
+                self.state = self.HALF_OPEN
+                self._probe_started = None
+            if self.state == self.HALF_OPEN:
+                # 试探请求超过冷却期仍未结束 (例如调用方被取消)，视为丢失，换一个请求试探
+                if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+                    raise CircuitOpenError(f"{self.provider} 正在试探恢复，请稍后重试")
+                self._probe_started = now
+
+    def release_probe(self):
+        """试探请求以非临时错误结束 (无法判断服务是否恢复)，让下一个请求继续试探"""
+        with self._lock:
+            self._probe_started = None
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_started = None
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_started = None
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    metrics.inc("circuit_open_total", provider=self.provider)
+                    print(f"[熔断] {self.provider} 连续失败 {self._failures} 次，"
+                          f"暂停请求 {self.reset_timeout:.0f}s")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """返回该提供方在本进程内共享的熔断器"""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(provider)
+            _breakers[provider] = breaker
+        return breaker
+
+
+class RetryPolicy:
+    """带抖动的指数退避重试，与提供方的熔断器联动"""
+
+    def __init__(self, provider: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY):
+        self.provider = provider
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = get_breaker(provider)
+
+    def delay(self, attempt: int, exc) -> float:
+        """第 attempt 次失败后的等待时间 (full jitter)，不少于 Retry-After"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = retry_after_seconds(response_headers(exc))
+        if retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_delay))
+        return backoff
+
+    def _on_failure(self, attempt: int, exc):
+        """记录失败；不应重试时重新抛出，否则返回等待秒数"""
+        status = http_status(exc)
+        metrics.inc("request_errors_total", provider=self.provider,
+                    reason=str(status) if status is not None else type(exc).__name__)
+        if not is_retryable(exc):
+            self.breaker.release_probe()
+            raise exc
+        self.breaker.record_failure()
+        if attempt + 1 >= self.max_attempts:
+            raise exc
+        wait = self.delay(attempt, exc)
+        metrics.inc("retries_total", provider=self.provider)
+        print(f"[重试] {self.provider} 第 {attempt + 1} 次失败 ({exc})，{wait:.1f}s 后重试")
+        return wait
+
+    def call(self, func, *args, **kwargs):
+        for attempt in range(self.max_attempts):
+            self.breaker.before_call()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                time.sleep(self._on_failure(attempt, e))
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def call_async(self, func, *args, **kwargs):
+        for attempt in range(self.max_attempts):
+            self.breaker.before_call()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._on_failure(attempt, e))
+                continue
+            self.breaker.record_success()
+            return result
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 原子写入与流式下载。
+
+所有写入 res/ 的文件先写到同目录的隐藏临时文件 (.名称.xxxx.part，aapt 会忽略)，
+写完 fsync 后再原子改名为目标文件；中断或出错时删除临时文件，不会留下半个 .png
+被存在性检查误认为已完成。下载按块写盘，内存占用与文件大小无关，
+并与 Content-Length 核对字节数。
+
+用法:
+    with atomic_output(path) as f:            # 任意写入 (PIL.Image.save 等)
+        image.save(f, "PNG")
+    stream_to_file(resp.iter_content(CHUNK_SIZE), path, content_length(resp.headers))
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# 下载时每次写盘的块大小
+CHUNK_SIZE = 64 * 1024
+
+
+class IncompleteDownloadError(IOError):
+    """收到的字节数与 Content-Length 不一致 (连接中途断开)"""
+
+
+def content_length(headers):
+    """返回响应声明的字节数；压缩传输时解码后长度不同，返回 None"""
+    if not headers:
+        return None
+    encoding = headers.get("Content-Encoding")
+    if encoding and encoding.lower() != "identity":
+        return None
+    value = headers.get("Content-Length")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@contextmanager
+def atomic_output(dest):
+    """打开目标文件的临时文件用于写入，正常结束时 fsync 并原子替换目标文件"""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{dest.name}.", suffix=".part", dir=str(dest.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, str(dest))
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def write_atomic(dest, data: bytes):
+    with atomic_output(dest) as f:
+        f.write(data)
+
+
+def copy_atomic(src, dest):
+    with open(str(src), "rb") as source, atomic_output(dest) as f:
+        shutil.copyfileobj(source, f, CHUNK_SIZE)
+
+
+def link_or_copy(src, dest):
+    """用硬链接把同一份内容安装到另一个路径 (不支持时复制)，同样原子替换"""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.link.part")
+    try:
+        os.link(str(src), str(tmp))
+    except OSError:
+        copy_atomic(src, dest)
+        return
+    try:
+        os.replace(str(tmp), str(dest))
+    except BaseException:
+        os.remove(str(tmp))
+        raise
+
+
+def stream_to_file(chunks, dest, expected_size=None) -> int:
+    """把数据块逐块写入目标文件，返回字节数；长度不符时抛出 IncompleteDownloadError"""
+    written = 0
+    with atomic_output(dest) as f:
+        for chunk in chunks:
+            if chunk:
+                f.write(chunk)
+                written += len(chunk)
+        if expected_size is not None and written != expected_size:
+            raise IncompleteDownloadError(
+                f"{Path(dest).name}: 收到 {written} 字节，应为 {expected_size} 字节")
+    return written
+
+
+def iter_response(response, chunk_size: int = CHUNK_SIZE):
+    """按块读取 urllib 响应 (或任何带 read(n) 的对象)"""
+    return iter(lambda: response.read(chunk_size), b"")
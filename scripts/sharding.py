@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - 把一次生成任务确定性地拆分到多台机器 (--shard i/N)。
+
+每个资源按资源名 (res_name；系统音效按文件名) 的 SHA-1 取模分配到 N 个分片之一，
+与机器、进程、Python 的 hash 随机化都无关: 几台机器各自运行 --shard 1/3、2/3、3/3，
+不需要任何协调就能覆盖全部资源且互不重叠。同一物品的图片和所有语音片段在同一分片。
+各机器完成后用 merge_shards.py 把结果和账本合并回一个工作副本。
+
+用法:
+    from sharding import add_shard_argument, in_shard
+    add_shard_argument(parser)
+    items = [item for item in items if in_shard(item["res_name"], args.shard)]
+"""
+
+import argparse
+import hashlib
+
+
+def parse_shard(value: str):
+    """解析 "i/N" (i 从 1 开始)，返回 (i, N)"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"分片格式应为 i/N，例如 1/3: {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"分片序号应在 1 到 {count} 之间: {value!r}")
+    return index, count
+
+
+def add_shard_argument(parser):
+    parser.add_argument("--shard", type=parse_shard, metavar="i/N",
+                        help="只处理第 i 个分片 (共 N 个，按资源名哈希划分)，用于多台机器并行生成")
+
+
+def shard_of(name: str, count: int) -> int:
+    """资源所在的分片序号 (1..count)"""
+    digest = hashlib.sha1(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def in_shard(name: str, shard) -> bool:
+    """shard 为 None (未分片) 时总是 True"""
+    if shard is None:
+        return True
+    index, count = shard
+    return shard_of(name, count) == index
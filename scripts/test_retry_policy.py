@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+云朵识物乐园 - retry_policy 的单元测试。
+
+运行 (scripts 目录):
+    python -m unittest test_retry_policy
+"""
+
+import errno
+import socket
+import unittest
+import urllib.error
+
+from retry_policy import is_retryable
+
+
+class IsRetryableTest(unittest.TestCase):
+
+    def test_url_error_with_transient_reason(self):
+        for reason in (ConnectionRefusedError(errno.ECONNREFUSED, "Connection refused"),
+                       socket.gaierror(socket.EAI_NONAME, "Name or service not known"),
+                       socket.timeout("timed out"),
+                       TimeoutError("timed out")):
+            with self.subTest(reason=type(reason).__name__):
+                self.assertTrue(is_retryable(urllib.error.URLError(reason)))
+
+    def test_url_error_with_other_reason(self):
+        self.assertFalse(is_retryable(urllib.error.URLError("unknown url type: ftp")))
+        self.assertFalse(is_retryable(urllib.error.URLError(FileNotFoundError(errno.ENOENT, "x"))))
+
+    def test_http_error_uses_status(self):
+        self.assertTrue(is_retryable(urllib.error.HTTPError("http://x", 503, "Unavailable", {}, None)))
+        self.assertFalse(is_retryable(urllib.error.HTTPError("http://x", 404, "Not Found", {}, None)))
+
+    def test_local_os_errors_are_not_retried(self):
+        self.assertFalse(is_retryable(OSError(errno.ENOSPC, "No space left on device")))
+        self.assertTrue(is_retryable(ConnectionResetError()))
+
+
+if __name__ == "__main__":
+    unittest.main()